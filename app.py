@@ -9,93 +9,294 @@ facilitar a manutenção e reutilização do código.
 import streamlit as st
 from common import (
     URL_DADOS,
+    MODO_ARMAZENAMENTO,
+    DIMENSOES_CUBO_PAISES_SQL,
     processar_dados,
+    obter_versao_dados,
+    obter_indice_filtros,
+    obter_cubo,
+    obter_esbocos_quantis,
     filtrar_dataframe,
     criar_barra_lateral_filtros,
+    criar_botao_recarregar_dados,
+    criar_opcao_painel_desempenho,
+    exibir_painel_desempenho,
+    iniciar_medicoes,
+    medir_etapa,
+    finalizar_medicoes,
+    calcular_impressao_filtros,
+    calcular_relatorio_memoria,
+    obter_cache_graficos,
+    obter_estatisticas_cache_lru,
+    criar_abas_sob_demanda,
+    aba_esta_aberta,
+    memorizar_na_sessao,
+    obter_estado_filtros,
     calcular_metricas,
+    medir_erro_quantis,
+    criar_opcao_quantis_aproximados,
+    exibir_erro_quantis,
     exibir_metricas,
     exibir_insights,
     exibir_graficos,
     exibir_tabela_dados,
     gerar_insights,
     validar_dataframe,
-    formatar_moeda
+    obter_banco_sql,
+    obter_cubo_filtros_sql,
+    consultar_agregados_sql,
+    consultar_cubo_sql,
+    listar_opcoes_filtro,
+    calcular_histograma_sql,
+    calcular_metricas_agregadas,
+    montar_estatisticas_descritivas,
+    exibir_tabela_sql,
+    exibir_cabecalho,
+    exibir_estatisticas_descritivas
 )
 
 
-def main() -> None:
+def main_sql(painel_desempenho: bool) -> None:
     """
-    Função principal que orquestra a execução do dashboard.
+    Executa o dashboard no modo SQL (DASHBOARD_MODO_ARMAZENAMENTO=sql).
+    
+    Os dados ficam no banco SQLite: filtros, agregados, histograma e páginas
+    da tabela são consultados nele, e apenas os resultados chegam à sessão.
+    Mediana e percentis vêm dos esboços de quantis (aproximados).
+    
+    Args:
+        painel_desempenho: Se o painel de desempenho deve ser exibido
     """
-    # Configuração da página
-    st.set_page_config(
-        page_title="Análise de Dados de Salários em Tecnologia",
-        layout="wide",
-        page_icon="📊"
-    )
+    criar_botao_recarregar_dados()
+    with medir_etapa("obter_banco_sql"):
+        banco = obter_banco_sql(URL_DADOS)
+        cubo_filtros = obter_cubo_filtros_sql(banco)
+    
+    with medir_etapa("criar_barra_lateral_filtros"):
+        filtros = criar_barra_lateral_filtros(cubo_filtros)
+    
+    with medir_etapa("consultar_agregados_sql"):
+        agregados = consultar_agregados_sql(banco, filtros)
+    cubo_filtrado = agregados['cubo']
+    esboco_filtrado = agregados['esboco']
+    contexto_execucao = {
+        'linhas': int(cubo_filtros['contagem'].sum()),
+        'linhas_filtradas': int(cubo_filtrado['contagem'].sum())
+    }
+    chave_cache_graficos = calcular_impressao_filtros(filtros, banco.name)
+    
+    exibir_cabecalho()
+    
+    if not validar_dataframe(cubo_filtrado):
+        st.warning("⚠️ Nenhum dado encontrado com os filtros selecionados. Por favor, ajuste os filtros.")
+        registro_desempenho = finalizar_medicoes(contexto_execucao)
+        if painel_desempenho:
+            exibir_painel_desempenho(registro_desempenho)
+        return
+    
+    with medir_etapa("calcular_metricas"):
+        metricas = calcular_metricas_agregadas(
+            cubo_filtrado, esboco_filtrado, agregados['minimo'], agregados['maximo']
+        )
+    exibir_metricas(metricas)
+    
+    st.markdown("---")
+    
+    with medir_etapa("gerar_insights"):
+        insights = gerar_insights(cubo_filtrado, metricas, cubo=cubo_filtrado)
+    exibir_insights(insights)
+    
+    tab1, tab2, tab3 = criar_abas_sob_demanda(["📈 Visão Geral", "🔍 Análises Comparativas", "📋 Dados Detalhados"])
+    
+    with tab1:
+        if aba_esta_aberta(tab1):
+            st.header("Visão Geral dos Dados")
+            with medir_etapa("exibir_graficos[Visão Geral]"):
+                opcoes = listar_opcoes_filtro(cubo_filtros)
+                histograma = memorizar_na_sessao(
+                    f"histograma_sql:{chave_cache_graficos}",
+                    lambda: calcular_histograma_sql(
+                        banco, filtros, agregados['minimo'], agregados['maximo'], opcoes
+                    )
+                )
+                cubo_paises = memorizar_na_sessao(
+                    f"cubo_paises_sql:{chave_cache_graficos}",
+                    lambda: consultar_cubo_sql(banco, filtros, opcoes, DIMENSOES_CUBO_PAISES_SQL)
+                )
+                exibir_graficos(
+                    cubo_filtrado, "Visão Geral", cubo_filtrado, esboco_filtrado, chave_cache_graficos,
+                    histograma=histograma,
+                    cubo_paises=cubo_paises
+                )
+    
+    with tab2:
+        if aba_esta_aberta(tab2):
+            st.header("Análises Comparativas e Tendências")
+            with medir_etapa("exibir_graficos[Análises Comparativas]"):
+                exibir_graficos(cubo_filtrado, "Análises Comparativas", cubo_filtrado, esboco_filtrado, chave_cache_graficos)
     
+    with tab3:
+        if aba_esta_aberta(tab3):
+            st.header("Dados Detalhados")
+            with medir_etapa("exibir_tabela_sql"):
+                exibir_tabela_sql(banco, filtros, chave_cache_graficos)
+            exibir_estatisticas_descritivas(montar_estatisticas_descritivas(metricas))
+    
+    contexto_execucao['cache_graficos'] = obter_estatisticas_cache_lru(obter_cache_graficos())
+    registro_desempenho = finalizar_medicoes(contexto_execucao)
+    if painel_desempenho:
+        exibir_painel_desempenho(registro_desempenho)
+
+
+def main_memoria(painel_desempenho: bool) -> None:
+    """
+    Executa o dashboard no modo em memória (padrão), com o DataFrame processado.
+    
+    Args:
+        painel_desempenho: Se o painel de desempenho deve ser exibido
+    """
     # Processamento dos dados
-    df = processar_dados(URL_DADOS)
+    criar_botao_recarregar_dados()
+    with medir_etapa("processar_dados"):
+        df = processar_dados(URL_DADOS)
+    versao = obter_versao_dados(df)
+    with medir_etapa("obter_indice_filtros"):
+        indice = obter_indice_filtros(df, versao)
+    with medir_etapa("obter_cubo"):
+        cubo = obter_cubo(df, versao)
     
     # Criação dos filtros
-    filtros = criar_barra_lateral_filtros(df)
+    with medir_etapa("criar_barra_lateral_filtros"):
+        filtros = criar_barra_lateral_filtros(df)
+    quantis_aproximados = criar_opcao_quantis_aproximados()
     
     # Filtragem dos dados
-    df_filtrado = filtrar_dataframe(
-        df,
-        filtros['anos'],
-        filtros['senioridades'],
-        filtros['contratos'],
-        filtros['tamanhos_empresa'],
-        filtros['cargos']
+    with medir_etapa("filtrar_dataframe"):
+        df_filtrado = filtrar_dataframe(
+            df,
+            filtros['anos'],
+            filtros['senioridades'],
+            filtros['contratos'],
+            filtros['tamanhos_empresa'],
+            filtros['cargos'],
+            indice=indice,
+            estado=obter_estado_filtros()
+        )
+        cubo_filtrado = filtrar_dataframe(
+            cubo,
+            filtros['anos'],
+            filtros['senioridades'],
+            filtros['contratos'],
+            filtros['tamanhos_empresa'],
+            filtros['cargos']
+        )
+        esboco_filtrado = None
+        if quantis_aproximados:
+            esboco_filtrado = filtrar_dataframe(
+                obter_esbocos_quantis(df, versao),
+                filtros['anos'],
+                filtros['senioridades'],
+                filtros['contratos'],
+                filtros['tamanhos_empresa'],
+                filtros['cargos']
+            )
+    contexto_execucao = {'linhas': len(df), 'linhas_filtradas': len(df_filtrado)}
+    
+    # Gráficos da mesma seleção são reaproveitados entre sessões
+    chave_cache_graficos = calcular_impressao_filtros(
+        filtros,
+        versao,
+        quantis_aproximados=quantis_aproximados
     )
     
     # Cabeçalho principal
-    st.title("📊 Dashboard de Análise de Salários na Área de Dados")
-    st.markdown(
-        "Explore os dados salariais na área de dados nos últimos anos. "
-        "Utilize os filtros à esquerda para refinar sua análise."
-    )
+    exibir_cabecalho()
     
     # Verificar se há dados filtrados
     if not validar_dataframe(df_filtrado):
         st.warning("⚠️ Nenhum dado encontrado com os filtros selecionados. Por favor, ajuste os filtros.")
+        registro_desempenho = finalizar_medicoes(contexto_execucao)
+        if painel_desempenho:
+            exibir_painel_desempenho(registro_desempenho)
         return
     
     # Exibição das métricas
-    metricas = calcular_metricas(df_filtrado, df)
+    with medir_etapa("calcular_metricas"):
+        metricas = calcular_metricas(df_filtrado, df, cubo_filtrado, esboco_filtrado)
     exibir_metricas(metricas)
+    if quantis_aproximados:
+        exibir_erro_quantis(medir_erro_quantis(df_filtrado, metricas))
     
     st.markdown("---")
     
     # Exibir insights
-    insights = gerar_insights(df_filtrado, metricas)
+    with medir_etapa("gerar_insights"):
+        insights = gerar_insights(df_filtrado, metricas)
     exibir_insights(insights)
     
-    # Organizar visualizações em tabs
-    tab1, tab2, tab3 = st.tabs(["📈 Visão Geral", "🔍 Análises Comparativas", "📋 Dados Detalhados"])
+    # Organizar visualizações em tabs (apenas a aba selecionada é calculada)
+    tab1, tab2, tab3 = criar_abas_sob_demanda(["📈 Visão Geral", "🔍 Análises Comparativas", "📋 Dados Detalhados"])
     
     with tab1:
-        st.header("Visão Geral dos Dados")
-        exibir_graficos(df_filtrado, "Visão Geral")
+        if aba_esta_aberta(tab1):
+            st.header("Visão Geral dos Dados")
+            with medir_etapa("exibir_graficos[Visão Geral]"):
+                exibir_graficos(df_filtrado, "Visão Geral", cubo_filtrado, esboco_filtrado, chave_cache_graficos)
     
     with tab2:
-        st.header("Análises Comparativas e Tendências")
-        exibir_graficos(df_filtrado, "Análises Comparativas")
+        if aba_esta_aberta(tab2):
+            st.header("Análises Comparativas e Tendências")
+            with medir_etapa("exibir_graficos[Análises Comparativas]"):
+                exibir_graficos(df_filtrado, "Análises Comparativas", cubo_filtrado, esboco_filtrado, chave_cache_graficos)
     
     with tab3:
-        st.header("Dados Detalhados")
-        exibir_tabela_dados(df_filtrado)
-        
-        # Estatísticas descritivas
-        st.subheader("📊 Estatísticas Descritivas")
-        if validar_dataframe(df_filtrado):
-            st.dataframe(
-                df_filtrado['salario_usd'].describe().apply(
-                    lambda x: formatar_moeda(x) if isinstance(x, (int, float)) else x
-                ),
-                use_container_width=True
-            )
+        if aba_esta_aberta(tab3):
+            st.header("Dados Detalhados")
+            with medir_etapa("exibir_tabela_dados"):
+                exibir_tabela_dados(df_filtrado, chave_cache_graficos)
+            
+            # Estatísticas descritivas
+            if validar_dataframe(df_filtrado):
+                exibir_estatisticas_descritivas(memorizar_na_sessao(
+                    f"estatisticas_descritivas:{chave_cache_graficos}",
+                    lambda: df_filtrado['salario_usd'].describe()
+                ))
+    
+    contexto_execucao['cache_graficos'] = obter_estatisticas_cache_lru(obter_cache_graficos())
+    registro_desempenho = finalizar_medicoes(contexto_execucao)
+    if painel_desempenho:
+        exibir_painel_desempenho(
+            registro_desempenho,
+            memorizar_na_sessao(f"memoria:{versao}", lambda: calcular_relatorio_memoria(df))
+        )
+
+
+
+def main() -> None:
+    """
+    Função principal que orquestra a execução do dashboard.
+    """
+    # Configuração da página
+    st.set_page_config(
+        page_title="Análise de Dados de Salários em Tecnologia",
+        layout="wide",
+        page_icon="📊"
+    )
+    
+    # Instrumentação da execução (opcional)
+    painel_desempenho = criar_opcao_painel_desempenho()
+    iniciar_medicoes(rastrear_memoria=painel_desempenho)
+    
+    try:
+        if MODO_ARMAZENAMENTO == 'sql':
+            main_sql(painel_desempenho)
+        else:
+            main_memoria(painel_desempenho)
+    finally:
+        # Execuções interrompidas (st.stop, novo rerun) também precisam
+        # encerrar as medições e liberar o tracemalloc; sem efeito se a
+        # execução já as encerrou
+        finalizar_medicoes({'interrompida': True})
 
 
 if __name__ == "__main__":
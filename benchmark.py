@@ -0,0 +1,577 @@
+"""
+Benchmark das etapas do dashboard sobre dados sintéticos.
+
+Gera arquivos CSV com o mesmo esquema da fonte original (colunas de
+COLUNAS_TRADUZIDAS) e cardinalidades realistas de cargos e países, executa
+cada etapa do pipeline sem interface (processamento, índices, filtragem,
+métricas, insights e todos os gráficos criar_grafico_*) e grava um relatório
+JSON com tempo e pico de memória por etapa, para comparação entre commits.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --linhas 10000 100000 --repeticoes 5 --saida atual.json
+    python benchmark.py --linhas 100000 --comparar referencia.json
+    python benchmark.py --linhas 100000 --backend pyarrow
+    python benchmark.py --linhas 1000000 --compactar
+"""
+
+import argparse
+import functools
+import gc
+import inspect
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import nucleo
+
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+TAMANHOS_PADRAO = [10_000, 100_000, 1_000_000, 10_000_000]
+REPETICOES_PADRAO = 3
+ARQUIVO_RELATORIO_PADRAO = 'benchmark.json'
+TAMANHO_BLOCO_GERACAO = 1_000_000
+VERSAO_RELATORIO = 1
+
+CARGOS_BASE = [
+    'Data Scientist', 'Data Engineer', 'Data Analyst', 'ML Engineer', 'BI Analyst',
+    'AI Engineer', 'Analytics Engineer', 'Data Architect', 'MLOps Engineer',
+    'Research Engineer', 'Data Manager', 'Computer Vision Engineer', 'NLP Engineer',
+    'Data Specialist', 'Data Product Manager', 'Quantitative Researcher',
+    'Decision Scientist', 'Data Operations Analyst', 'Big Data Engineer', 'Data Modeler',
+    'Data Quality Analyst', 'AI Researcher', 'Deep Learning Engineer',
+    'Business Data Analyst', 'Cloud Data Engineer', 'ETL Developer', 'Data Strategist',
+    'Data Science Lead', 'Machine Learning Scientist', 'Prompt Engineer'
+]
+PREFIXOS_CARGO = ['', 'Senior ', 'Lead ', 'Principal ', 'Staff ']
+
+PAISES = (
+    'US GB CA DE IN FR ES BR AU NL PT IT IE PL CH AT BE SE DK NO FI MX AR CO CL PE '
+    'JP SG KR CN HK TW PH VN TH MY ID PK BD LK AE SA IL TR EG NG KE ZA GH MA TN '
+    'RU UA RO HU CZ SK SI HR RS BG GR CY MT EE LV LT LU IS NZ UY PY BO EC VE CR '
+    'PA DO PR GT HN SV JM BS AM GE AZ KZ UZ DZ'
+).split()
+
+ANOS = [2020, 2021, 2022, 2023, 2024, 2025]
+PESOS_ANOS = [0.02, 0.04, 0.10, 0.28, 0.34, 0.22]
+
+SENIORIDADES = ['EN', 'MI', 'SE', 'EX']
+PESOS_SENIORIDADES = [0.12, 0.28, 0.52, 0.08]
+MULTIPLICADORES_SENIORIDADE = [0.6, 0.85, 1.1, 1.5]
+
+CONTRATOS = ['FT', 'PT', 'CT', 'FL']
+PESOS_CONTRATOS = [0.97, 0.01, 0.01, 0.01]
+
+MOEDAS = ['USD', 'EUR', 'GBP', 'CAD', 'INR']
+PESOS_MOEDAS = [0.88, 0.05, 0.04, 0.02, 0.01]
+COTACOES_MOEDAS = [1.0, 0.92, 0.79, 1.36, 83.0]
+
+REMOTAS = [0, 50, 100]
+PESOS_REMOTAS = [0.6, 0.05, 0.35]
+
+TAMANHOS_EMPRESA = ['S', 'M', 'L']
+PESOS_TAMANHOS_EMPRESA = [0.05, 0.85, 0.10]
+
+SELECAO_RESTRITA = {
+    'anos': [2024, 2025],
+    'senioridades': ['Senior'],
+    'contratos': ['Tempo Integral'],
+    'tamanhos_empresa': ['Média', 'Grande'],
+    'cargos': []
+}
+# Seleção restrita com uma dimensão estreitada, como ao desmarcar um valor
+SELECAO_ESTREITADA = {**SELECAO_RESTRITA, 'tamanhos_empresa': ['Grande']}
+
+
+# ============================================================================
+# GERAÇÃO DE DADOS SINTÉTICOS
+# ============================================================================
+
+
+def calcular_pesos_zipf(quantidade: int, expoente: float) -> np.ndarray:
+    """
+    Calcula pesos de uma distribuição de Zipf truncada.
+    
+    Args:
+        quantidade: Número de valores distintos
+        expoente: Expoente da distribuição (maior = mais concentrada)
+        
+    Returns:
+        Array de probabilidades que soma 1
+    """
+    pesos = 1.0 / np.arange(1, quantidade + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+def listar_cargos_sinteticos() -> List[str]:
+    """
+    Lista os cargos sintéticos, começando pelos cargos com tradução conhecida.
+    
+    Returns:
+        Lista de cargos distintos (cerca de 170), em ordem de frequência
+    """
+    cargos = list(nucleo.TRADUCAO_CARGOS)
+    for prefixo in PREFIXOS_CARGO:
+        for cargo in CARGOS_BASE:
+            if prefixo + cargo not in cargos:
+                cargos.append(prefixo + cargo)
+    return cargos
+
+
+def gerar_dados_sinteticos(n_linhas: int, semente: int = 0) -> pd.DataFrame:
+    """
+    Gera dados brutos sintéticos com o mesmo esquema da fonte original.
+    
+    Cargos e países seguem distribuições de Zipf (poucos valores muito
+    frequentes e uma cauda longa), e o salário em USD é log-normal com média
+    dependente da senioridade.
+    
+    Args:
+        n_linhas: Número de linhas
+        semente: Semente do gerador aleatório
+        
+    Returns:
+        DataFrame bruto, com as colunas de COLUNAS_TRADUZIDAS
+    """
+    gerador = np.random.default_rng(semente)
+    cargos = np.array(listar_cargos_sinteticos(), dtype=object)
+    paises = np.array(PAISES, dtype=object)
+    
+    senioridade = gerador.choice(len(SENIORIDADES), n_linhas, p=PESOS_SENIORIDADES)
+    moeda = gerador.choice(len(MOEDAS), n_linhas, p=PESOS_MOEDAS)
+    salario_usd = (
+        gerador.lognormal(11.8, 0.45, n_linhas)
+        * np.asarray(MULTIPLICADORES_SENIORIDADE)[senioridade]
+    ).astype(np.int64)
+    
+    return pd.DataFrame({
+        'work_year': gerador.choice(ANOS, n_linhas, p=PESOS_ANOS),
+        'experience_level': np.array(SENIORIDADES, dtype=object)[senioridade],
+        'employment_type': gerador.choice(np.array(CONTRATOS, dtype=object), n_linhas, p=PESOS_CONTRATOS),
+        'job_title': cargos[gerador.choice(len(cargos), n_linhas, p=calcular_pesos_zipf(len(cargos), 1.1))],
+        'salary': (salario_usd * np.asarray(COTACOES_MOEDAS)[moeda]).astype(np.int64),
+        'salary_currency': np.array(MOEDAS, dtype=object)[moeda],
+        'salary_in_usd': salario_usd,
+        'employee_residence': paises[gerador.choice(len(paises), n_linhas, p=calcular_pesos_zipf(len(paises), 1.6))],
+        'remote_ratio': gerador.choice(REMOTAS, n_linhas, p=PESOS_REMOTAS),
+        'company_location': paises[gerador.choice(len(paises), n_linhas, p=calcular_pesos_zipf(len(paises), 1.7))],
+        'company_size': gerador.choice(np.array(TAMANHOS_EMPRESA, dtype=object), n_linhas, p=PESOS_TAMANHOS_EMPRESA)
+    })
+
+
+def gravar_csv_sintetico(caminho: Path, n_linhas: int, semente: int = 0) -> Path:
+    """
+    Grava um CSV sintético em blocos, sem manter todas as linhas em memória.
+    
+    Args:
+        caminho: Caminho do arquivo CSV
+        n_linhas: Número total de linhas
+        semente: Semente do gerador aleatório
+        
+    Returns:
+        Caminho do arquivo gravado
+    """
+    if caminho.exists():
+        return caminho
+    
+    caminho_temporario = caminho.with_suffix('.tmp')
+    for numero_bloco, inicio in enumerate(range(0, n_linhas, TAMANHO_BLOCO_GERACAO)):
+        bloco = gerar_dados_sinteticos(min(TAMANHO_BLOCO_GERACAO, n_linhas - inicio), semente + numero_bloco)
+        bloco.to_csv(caminho_temporario, mode='a' if numero_bloco else 'w', header=not numero_bloco, index=False)
+    os.replace(caminho_temporario, caminho)
+    return caminho
+
+
+# ============================================================================
+# MEDIÇÃO
+# ============================================================================
+
+
+def obter_pico_rss_mb() -> float:
+    """
+    Retorna o pico de memória residente do processo até o momento.
+    
+    Returns:
+        Pico de RSS em MB
+    """
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB e macOS em bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def medir_etapa(funcao: Callable, repeticoes: int, preparar: Optional[Callable] = None) -> Dict:
+    """
+    Mede o tempo e o pico de memória alocada de uma etapa.
+    
+    O tempo é medido em execuções sem rastreamento de memória; o pico de
+    memória vem de uma execução extra sob tracemalloc, cujo custo não entra
+    no tempo.
+    
+    Args:
+        funcao: Etapa a medir, sem argumentos
+        repeticoes: Número de execuções cronometradas
+        preparar: Função executada antes de cada execução, fora da medição
+        
+    Returns:
+        Dicionário com tempos (mínimo, mediana, máximo), pico de memória e o
+        resultado da última execução
+    """
+    tempos = []
+    resultado = None
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        gc.collect()
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    
+    if preparar is not None:
+        preparar()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'tempo_s': {
+            'minimo': min(tempos),
+            'mediana': float(np.median(tempos)),
+            'maximo': max(tempos)
+        },
+        'repeticoes': repeticoes,
+        'pico_memoria_mb': pico / (1024 * 1024),
+        'resultado': resultado
+    }
+
+
+def aplicar_filtros(dataframe: pd.DataFrame, filtros: Dict, indice: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Aplica uma seleção de filtros no formato de criar_barra_lateral_filtros.
+    
+    Args:
+        dataframe: DataFrame processado (ou cubo/esboços)
+        filtros: Seleção de filtros
+        indice: Índice de filtros (opcional)
+        
+    Returns:
+        DataFrame filtrado
+    """
+    return nucleo.filtrar_dataframe(
+        dataframe,
+        filtros['anos'],
+        filtros['senioridades'],
+        filtros['contratos'],
+        filtros['tamanhos_empresa'],
+        filtros['cargos'],
+        indice=indice
+    )
+
+
+def selecionar_todos(dataframe: pd.DataFrame) -> Dict:
+    """
+    Monta a seleção padrão do dashboard, com todos os valores de cada filtro.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        Seleção de filtros com todas as opções marcadas e nenhum cargo
+    """
+    filtros = {
+        chave: nucleo.obter_opcoes_filtro(dataframe[coluna])
+        for chave, coluna in nucleo.COLUNAS_FILTRO.items()
+    }
+    filtros['cargos'] = []
+    return filtros
+
+
+def listar_graficos() -> Dict[str, Callable]:
+    """
+    Lista todas as funções criar_grafico_* do módulo nucleo.
+    
+    Returns:
+        Dicionário nome -> função
+    """
+    return {
+        nome: funcao
+        for nome, funcao in inspect.getmembers(nucleo, inspect.isfunction)
+        if nome.startswith('criar_grafico_')
+    }
+
+
+def executar_benchmark(caminho_csv: Path, repeticoes: int, tamanho_bloco: int = 0,
+                       compactar_numericos: bool = False) -> Dict:
+    """
+    Executa todas as etapas do pipeline sobre um CSV e mede cada uma.
+    
+    Args:
+        caminho_csv: Caminho do CSV de entrada
+        repeticoes: Número de execuções cronometradas por etapa
+        tamanho_bloco: Linhas por bloco na ingestão (0 usa a ingestão em memória)
+        compactar_numericos: Se as colunas numéricas devem usar o menor tipo sem perda
+        
+    Returns:
+        Dicionário com as medições de cada etapa (etapas) e a memória de
+        cada coluna do DataFrame processado (memoria_colunas)
+    """
+    processar = functools.partial(nucleo.processar_dados, compactar_numericos=compactar_numericos)
+    resultados = []
+    
+    def medir(etapa: str, funcao: Callable, preparar: Optional[Callable] = None,
+              repeticoes_etapa: Optional[int] = None):
+        medicao = medir_etapa(funcao, repeticoes_etapa or repeticoes, preparar)
+        resultado = medicao.pop('resultado')
+        medicao['pico_rss_mb'] = obter_pico_rss_mb()
+        resultados.append({'etapa': etapa, **medicao})
+        print(
+            f"  {etapa:<52} {medicao['tempo_s']['mediana'] * 1000:>10.1f} ms"
+            f" {medicao['pico_memoria_mb']:>9.1f} MB",
+            flush=True
+        )
+        return resultado
+    
+    def limpar_cache_disco():
+        shutil.rmtree(nucleo.DIRETORIO_CACHE, ignore_errors=True)
+    
+    # O processamento completo é caro: uma única execução fria e uma a partir do cache
+    medir(
+        'processar_dados',
+        lambda: processar(str(caminho_csv), tamanho_bloco=tamanho_bloco, incremental=False),
+        preparar=limpar_cache_disco,
+        repeticoes_etapa=1
+    )
+    df = medir(
+        'processar_dados[cache_disco]',
+        lambda: processar(str(caminho_csv), tamanho_bloco=tamanho_bloco)
+    )
+    
+    indice = medir('construir_indice_filtros', lambda: nucleo.construir_indice_filtros(df))
+    cubo = medir('construir_cubo', lambda: nucleo.construir_cubo(df))
+    esbocos = medir('construir_esbocos_quantis', lambda: nucleo.construir_esbocos_quantis(df))
+    
+    filtros = selecionar_todos(df)
+    medir('criar_barra_lateral_filtros[opcoes]', lambda: selecionar_todos(df))
+    medir('filtrar_dataframe[restrito]', lambda: aplicar_filtros(df, SELECAO_RESTRITA, indice))
+    medir('filtrar_dataframe[restrito,sem_indice]', lambda: aplicar_filtros(df, SELECAO_RESTRITA))
+    
+    # Consulta ao índice ao estreitar uma dimensão, do zero e a partir do
+    # estado da sessão com a seleção restrita já consultada
+    estado_filtros = {}
+    
+    def preparar_estreitamento():
+        estado_filtros['estado'] = nucleo.criar_estado_filtros()
+        nucleo.consultar_indice_filtros_incremental(indice, SELECAO_RESTRITA, estado_filtros['estado'])
+    
+    medir(
+        'consultar_indice_filtros[estreitado]',
+        lambda: nucleo.consultar_indice_filtros(indice, SELECAO_ESTREITADA)
+    )
+    medir(
+        'consultar_indice_filtros_incremental[estreitado]',
+        lambda: nucleo.consultar_indice_filtros_incremental(indice, SELECAO_ESTREITADA, estado_filtros['estado']),
+        preparar=preparar_estreitamento
+    )
+    df_filtrado = medir('filtrar_dataframe', lambda: aplicar_filtros(df, filtros, indice))
+    cubo_filtrado = medir('filtrar_dataframe[cubo]', lambda: aplicar_filtros(cubo, filtros))
+    esboco_filtrado = medir('filtrar_dataframe[esbocos]', lambda: aplicar_filtros(esbocos, filtros))
+    
+    metricas = medir('calcular_metricas', lambda: nucleo.calcular_metricas(df_filtrado, df))
+    medir(
+        'calcular_metricas[agregados]',
+        lambda: nucleo.calcular_metricas(df_filtrado, df, cubo_filtrado, esboco_filtrado)
+    )
+    medir('gerar_insights', lambda: nucleo.gerar_insights(df_filtrado, metricas))
+    
+    agregados = {'cubo': cubo_filtrado, 'esboco': esboco_filtrado}
+    for nome, funcao in listar_graficos().items():
+        medir(nome, lambda funcao=funcao: funcao(df_filtrado))
+        
+        parametros = {
+            parametro: agregados[parametro]
+            for parametro in inspect.signature(funcao).parameters
+            if parametro in agregados
+        }
+        if parametros:
+            medir(
+                f"{nome}[{','.join(parametros)}]",
+                lambda funcao=funcao, parametros=parametros: funcao(df_filtrado, **parametros)
+            )
+    
+    relatorio_memoria = nucleo.calcular_relatorio_memoria(df)
+    total = relatorio_memoria.iloc[-1]
+    print(
+        f"  {'memória do DataFrame':<52} {total['memoria_mb']:>10.1f} MB"
+        f" (economia de {total['economia_mb']:.1f} MB, {total['economia_pct']:.0f}%)",
+        flush=True
+    )
+    
+    return {'etapas': resultados, 'memoria_colunas': relatorio_memoria.to_dict(orient='records')}
+
+
+# ============================================================================
+# RELATÓRIO
+# ============================================================================
+
+
+def obter_commit_atual() -> Optional[str]:
+    """
+    Retorna o hash do commit atual do repositório, se disponível.
+    
+    Returns:
+        Hash do commit ou None fora de um repositório git
+    """
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def gerar_metadados(argumentos: argparse.Namespace) -> Dict:
+    """
+    Monta os metadados do ambiente de execução do benchmark.
+    
+    Args:
+        argumentos: Argumentos da linha de comando
+        
+    Returns:
+        Dicionário com commit, versões e configuração
+    """
+    return {
+        'versao_relatorio': VERSAO_RELATORIO,
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': obter_commit_atual(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'processadores': os.cpu_count(),
+        'repeticoes': argumentos.repeticoes,
+        'semente': argumentos.semente,
+        'tamanho_bloco': argumentos.tamanho_bloco,
+        'backend': argumentos.backend,
+        'compactar_numericos': argumentos.compactar
+    }
+
+
+def comparar_relatorios(atual: Dict, referencia: Dict) -> None:
+    """
+    Imprime a razão entre os tempos medianos do relatório atual e de uma referência.
+    
+    Args:
+        atual: Relatório gerado nesta execução
+        referencia: Relatório de uma execução anterior
+    """
+    tempos_referencia = {
+        (execucao['linhas'], medicao['etapa']): medicao['tempo_s']['mediana']
+        for execucao in referencia['execucoes']
+        for medicao in execucao.get('etapas', [])
+    }
+    
+    print(f"\nComparação com {referencia['metadados'].get('commit') or 'referência'}:")
+    for execucao in atual['execucoes']:
+        for medicao in execucao.get('etapas', []):
+            anterior = tempos_referencia.get((execucao['linhas'], medicao['etapa']))
+            if not anterior:
+                continue
+            razao = medicao['tempo_s']['mediana'] / anterior
+            print(f"  {execucao['linhas']:>10} {medicao['etapa']:<52} {razao:>6.2f}x")
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Cria o parser dos argumentos da linha de comando.
+    
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do dashboard com dados sintéticos.")
+    parser.add_argument('--linhas', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Tamanhos dos conjuntos sintéticos (padrão: 10k, 100k, 1M e 10M)")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO,
+                        help="Execuções cronometradas por etapa")
+    parser.add_argument('--semente', type=int, default=0, help="Semente do gerador de dados")
+    parser.add_argument('--tamanho-bloco', type=int, default=0,
+                        help="Linhas por bloco na ingestão (0 usa a ingestão em memória)")
+    parser.add_argument('--diretorio-dados', type=Path, default=None,
+                        help="Diretório onde os CSVs sintéticos são gerados e reaproveitados")
+    parser.add_argument('--saida', type=Path, default=Path(ARQUIVO_RELATORIO_PADRAO),
+                        help="Arquivo JSON do relatório")
+    parser.add_argument('--comparar', type=Path, default=None,
+                        help="Relatório JSON de referência para comparação")
+    parser.add_argument('--backend', choices=list(nucleo.BACKENDS_CALCULO), default=nucleo.BACKEND_CALCULO,
+                        help="Backend do leitor de CSV, do group_by e da máscara nas etapas medidas")
+    parser.add_argument('--compactar', action='store_true',
+                        help="Converte as colunas numéricas para o menor tipo sem perda na ingestão")
+    return parser
+
+
+def main() -> None:
+    """
+    Gera os dados, executa o benchmark para cada tamanho e grava o relatório.
+    """
+    argumentos = criar_parser().parse_args()
+    
+    diretorio_temporario = Path(tempfile.mkdtemp(prefix='benchmark_dashboard_'))
+    diretorio_dados = argumentos.diretorio_dados or diretorio_temporario
+    diretorio_dados.mkdir(parents=True, exist_ok=True)
+    nucleo.DIRETORIO_CACHE = diretorio_temporario / 'cache'
+    nucleo.BACKEND_CALCULO = argumentos.backend
+    
+    relatorio = {'metadados': gerar_metadados(argumentos), 'execucoes': []}
+    try:
+        for n_linhas in argumentos.linhas:
+            print(f"{n_linhas} linhas", flush=True)
+            caminho_csv = gravar_csv_sintetico(
+                diretorio_dados / f"salarios_sinteticos_{n_linhas}_{argumentos.semente}.csv",
+                n_linhas,
+                argumentos.semente
+            )
+            execucao = {
+                'linhas': n_linhas,
+                'tamanho_arquivo_mb': caminho_csv.stat().st_size / (1024 * 1024)
+            }
+            execucao.update(executar_benchmark(
+                caminho_csv, argumentos.repeticoes, argumentos.tamanho_bloco, argumentos.compactar
+            ))
+            relatorio['execucoes'].append(execucao)
+            
+            # Gravar a cada tamanho para não perder medições se um tamanho maior falhar
+            argumentos.saida.write_text(json.dumps(relatorio, indent=2), encoding='utf-8')
+    finally:
+        shutil.rmtree(diretorio_temporario, ignore_errors=True)
+    
+    print(f"\nRelatório gravado em {argumentos.saida}")
+    
+    if argumentos.comparar is not None:
+        referencia = json.loads(argumentos.comparar.read_text(encoding='utf-8'))
+        comparar_relatorios(relatorio, referencia)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,987 +1,1161 @@
-"""
-Módulo comum com constantes e funções auxiliares para o dashboard.
-
-Este módulo contém todas as funções de processamento de dados, visualização,
-cálculo de métricas e interface, organizadas de forma modular para facilitar
-a manutenção e reutilização do código.
-"""
-
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-from typing import Dict, List, Optional
-
-# ============================================================================
-# CONSTANTES
-# ============================================================================
-
-URL_DADOS = "https://raw.githubusercontent.com/guilhermeonrails/data-jobs/refs/heads/main/salaries.csv"
-
-COLUNAS_TRADUZIDAS = {
-    'work_year': 'ano',
-    'experience_level': 'senioridade',
-    'employment_type': 'contrato',
-    'job_title': 'cargo',
-    'salary': 'salario',
-    'salary_currency': 'usd',
-    'salary_in_usd': 'salario_usd',
-    'employee_residence': 'residencia',
-    'remote_ratio': 'remota',
-    'company_location': 'empresa',
-    'company_size': 'tamanho_empresa'
-}
-
-TRADUCAO_SENIORIDADE = {
-    'EN': 'junior',
-    'MI': 'Pleno',
-    'SE': 'Senior',
-    'EX': 'executivo'
-}
-
-TRADUCAO_CONTRATO = {
-    'FT': 'Tempo Integral',
-    'PT': 'Meio Período',
-    'CT': 'Contrato',
-    'FL': 'Freelancer'
-}
-
-TRADUCAO_TAMANHO_EMPRESA = {
-    'S': 'Pequena',
-    'M': 'Média',
-    'L': 'Grande'
-}
-
-TRADUCAO_REMOTA = {
-    0: 'Presencial',
-    50: 'Híbrido',
-    100: 'Remoto'
-}
-
-CARGO_DATA_SCIENTIST = 'Cientista de Dados'
-NUMERO_BINS_HISTOGRAMA = 30
-TOP_CARGOS_LIMITE = 10
-HOLE_PIZZA = 0.5
-
-# ============================================================================
-# FUNÇÕES DE PROCESSAMENTO DE DADOS
-# ============================================================================
-
-
-@st.cache_data
-def carregar_dados(url: str) -> pd.DataFrame:
-    """
-    Carrega os dados do CSV a partir de uma URL.
-    
-    Args:
-        url: URL do arquivo CSV com os dados
-        
-    Returns:
-        DataFrame com os dados carregados
-        
-    Raises:
-        Exception: Se houver erro ao carregar os dados
-    """
-    try:
-        return pd.read_csv(url)
-    except Exception as e:
-        st.error(f"Erro ao carregar dados: {str(e)}")
-        st.stop()
-
-
-def traduzir_colunas(dataframe: pd.DataFrame) -> pd.DataFrame:
-    """
-    Traduz os nomes das colunas do DataFrame para português.
-    
-    Args:
-        dataframe: DataFrame original com colunas em inglês
-        
-    Returns:
-        DataFrame com colunas traduzidas
-    """
-    return dataframe.rename(columns=COLUNAS_TRADUZIDAS)
-
-
-def traduzir_cargos_comuns(cargo: str) -> str:
-    """
-    Traduz os cargos mais comuns para português.
-    
-    Args:
-        cargo: Nome do cargo em inglês
-        
-    Returns:
-        Nome do cargo traduzido ou original se não houver tradução
-    """
-    traducao_cargos = {
-        'Data Scientist': 'Cientista de Dados',
-        'Data Engineer': 'Engenheiro de Dados',
-        'Data Analyst': 'Analista de Dados',
-        'Machine Learning Engineer': 'Engenheiro de Machine Learning',
-        'Research Scientist': 'Cientista de Pesquisa',
-        'Data Science Manager': 'Gerente de Ciência de Dados',
-        'Data Architect': 'Arquiteto de Dados',
-        'Analytics Engineer': 'Engenheiro de Analytics',
-        'Business Intelligence Developer': 'Desenvolvedor de Business Intelligence',
-        'Data Science Consultant': 'Consultor de Ciência de Dados',
-        'Head of Data': 'Diretor de Dados',
-        'Principal Data Scientist': 'Cientista de Dados Principal',
-        'ML Engineer': 'Engenheiro de ML',
-        'Applied Scientist': 'Cientista Aplicado',
-        'Research Team Lead': 'Líder de Equipe de Pesquisa',
-        'Analytics Engineering Manager': 'Gerente de Engenharia de Analytics',
-        'Data Science Tech Lead': 'Líder Técnico de Ciência de Dados',
-        'Applied AI ML Lead': 'Líder de IA e ML Aplicados',
-        'Head of Applied AI': 'Diretor de IA Aplicada',
-        'Head of Machine Learning': 'Diretor de Machine Learning',
-        'Machine Learning Performance Engineer': 'Engenheiro de Performance de ML',
-        'Director of Product Management': 'Diretor de Gestão de Produtos',
-        'Engineering Manager': 'Gerente de Engenharia',
-        'AWS Data Architect': 'Arquiteto de Dados AWS'
-    }
-    
-    return traducao_cargos.get(cargo, cargo)
-
-
-def traduzir_valores(dataframe: pd.DataFrame) -> pd.DataFrame:
-    """
-    Traduz os valores das colunas categóricas para português.
-    
-    Args:
-        dataframe: DataFrame com colunas já traduzidas
-        
-    Returns:
-        DataFrame com valores traduzidos
-    """
-    df_traduzido = dataframe.copy()
-    
-    df_traduzido['senioridade'] = df_traduzido['senioridade'].replace(TRADUCAO_SENIORIDADE)
-    df_traduzido['contrato'] = df_traduzido['contrato'].replace(TRADUCAO_CONTRATO)
-    df_traduzido['tamanho_empresa'] = df_traduzido['tamanho_empresa'].replace(TRADUCAO_TAMANHO_EMPRESA)
-    df_traduzido['remota'] = df_traduzido['remota'].replace(TRADUCAO_REMOTA)
-    df_traduzido['cargo'] = df_traduzido['cargo'].apply(traduzir_cargos_comuns)
-    
-    return df_traduzido
-
-
-def processar_dados(url: str) -> pd.DataFrame:
-    """
-    Processa os dados: carrega, traduz colunas e valores, remove nulos e converte tipos.
-    
-    Args:
-        url: URL do arquivo CSV
-        
-    Returns:
-        DataFrame processado e limpo
-    """
-    df = carregar_dados(url)
-    df = traduzir_colunas(df)
-    df = traduzir_valores(df)
-    df = df.dropna()
-    
-    # Converter ano para inteiro
-    df['ano'] = df['ano'].astype('int64')
-    
-    return df
-
-
-def filtrar_dataframe(
-    dataframe: pd.DataFrame,
-    anos: List,
-    senioridades: List,
-    contratos: List,
-    tamanhos_empresa: List,
-    cargos: List = None
-) -> pd.DataFrame:
-    """
-    Filtra o DataFrame com base nos critérios selecionados.
-    
-    Args:
-        dataframe: DataFrame a ser filtrado
-        anos: Lista de anos selecionados
-        senioridades: Lista de senioridades selecionadas
-        contratos: Lista de tipos de contrato selecionados
-        tamanhos_empresa: Lista de tamanhos de empresa selecionados
-        cargos: Lista de cargos selecionados (opcional)
-        
-    Returns:
-        DataFrame filtrado
-    """
-    filtrado = dataframe[
-        (dataframe['ano'].isin(anos)) &
-        (dataframe['senioridade'].isin(senioridades)) &
-        (dataframe['contrato'].isin(contratos)) &
-        (dataframe['tamanho_empresa'].isin(tamanhos_empresa))
-    ]
-    
-    # Aplicar filtro de cargos se fornecido
-    if cargos and len(cargos) > 0:
-        filtrado = filtrado[filtrado['cargo'].isin(cargos)]
-    
-    return filtrado
-
-
-# ============================================================================
-# FUNÇÕES DE CÁLCULO DE MÉTRICAS
-# ============================================================================
-
-
-def calcular_metricas(dataframe: pd.DataFrame, dataframe_completo: pd.DataFrame) -> Dict:
-    """
-    Calcula as métricas principais do dashboard com análises estatísticas robustas.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        dataframe_completo: DataFrame completo para comparações
-        
-    Returns:
-        Dicionário com as métricas calculadas
-    """
-    if dataframe.empty:
-        return {
-            'salario_medio': 0,
-            'salario_mediano': 0,
-            'salario_minimo': 0,
-            'salario_maximo': 0,
-            'desvio_padrao': 0,
-            'percentil_25': 0,
-            'percentil_75': 0,
-            'total_registros': 0,
-            'cargo_mais_frequente': "",
-            'variacao_ano_anterior': 0,
-            'numero_cargos_unicos': 0
-        }
-    
-    salarios = dataframe['salario_usd']
-    
-    # Calcular variação ano a ano se houver múltiplos anos
-    variacao = 0
-    if len(dataframe['ano'].unique()) > 1:
-        anos_ordenados = sorted(dataframe['ano'].unique())
-        if len(anos_ordenados) >= 2:
-            ano_atual = anos_ordenados[-1]
-            ano_anterior = anos_ordenados[-2]
-            
-            media_atual = dataframe[dataframe['ano'] == ano_atual]['salario_usd'].mean()
-            media_anterior = dataframe[dataframe['ano'] == ano_anterior]['salario_usd'].mean()
-            
-            variacao = calcular_diferenca_percentual(media_atual, media_anterior)
-    
-    return {
-        'salario_medio': salarios.mean(),
-        'salario_mediano': salarios.median(),
-        'salario_minimo': salarios.min(),
-        'salario_maximo': salarios.max(),
-        'desvio_padrao': salarios.std(),
-        'percentil_25': salarios.quantile(0.25),
-        'percentil_75': salarios.quantile(0.75),
-        'total_registros': dataframe.shape[0],
-        'cargo_mais_frequente': dataframe['cargo'].mode()[0] if not dataframe['cargo'].mode().empty else "",
-        'variacao_ano_anterior': variacao,
-        'numero_cargos_unicos': dataframe['cargo'].nunique()
-    }
-
-
-# ============================================================================
-# FUNÇÕES AUXILIARES REUTILIZÁVEIS
-# ============================================================================
-
-
-def validar_dataframe(dataframe: pd.DataFrame) -> bool:
-    """
-    Valida se o DataFrame não está vazio.
-    
-    Args:
-        dataframe: DataFrame a ser validado
-        
-    Returns:
-        True se o DataFrame não estiver vazio, False caso contrário
-    """
-    return not dataframe.empty
-
-
-def aplicar_layout_padrao(grafico, xaxis_title: str = None, yaxis_title: str = None, 
-                          showlegend: bool = True, **kwargs) -> None:
-    """
-    Aplica layout padrão aos gráficos Plotly.
-    
-    Args:
-        grafico: Objeto do gráfico Plotly
-        xaxis_title: Título do eixo X (opcional)
-        yaxis_title: Título do eixo Y (opcional)
-        showlegend: Se deve mostrar a legenda
-        **kwargs: Argumentos adicionais para update_layout
-    """
-    layout_config = {
-        'title_x': 0.1,
-        'showlegend': showlegend
-    }
-    
-    if xaxis_title:
-        layout_config['xaxis_title'] = xaxis_title
-    if yaxis_title:
-        layout_config['yaxis_title'] = yaxis_title
-    
-    layout_config.update(kwargs)
-    grafico.update_layout(**layout_config)
-
-
-def exibir_grafico_com_tratamento(grafico, mensagem_erro: str) -> None:
-    """
-    Exibe um gráfico com tratamento de erro padronizado.
-    
-    Args:
-        grafico: Gráfico Plotly ou None
-        mensagem_erro: Mensagem a exibir se o gráfico for None
-    """
-    if grafico:
-        st.plotly_chart(grafico, use_container_width=True)
-    else:
-        st.warning(mensagem_erro)
-
-
-def formatar_moeda(valor: float) -> str:
-    """
-    Formata um valor numérico como moeda em USD.
-    
-    Args:
-        valor: Valor numérico a ser formatado
-        
-    Returns:
-        String formatada como moeda
-    """
-    return f"${valor:,.0f}"
-
-
-def calcular_diferenca_percentual(valor_atual: float, valor_anterior: float) -> float:
-    """
-    Calcula a diferença percentual entre dois valores.
-    
-    Args:
-        valor_atual: Valor atual
-        valor_anterior: Valor anterior
-        
-    Returns:
-        Diferença percentual (0 se valor_anterior for 0)
-    """
-    if valor_anterior == 0:
-        return 0.0
-    return ((valor_atual - valor_anterior) / valor_anterior) * 100
-
-
-def criar_filtro_multiselect(label: str, opcoes: List, default: List = None) -> List:
-    """
-    Cria um filtro multiselect padronizado na sidebar.
-    
-    Args:
-        label: Label do filtro
-        opcoes: Lista de opções disponíveis
-        default: Valores padrão (se None, usa todas as opções)
-        
-    Returns:
-        Lista de valores selecionados
-    """
-    if default is None:
-        default = opcoes
-    return st.sidebar.multiselect(label, opcoes, default=default)
-
-
-def agrupar_e_calcular_media(dataframe: pd.DataFrame, coluna_agrupamento: str, 
-                            coluna_calculo: str = 'salario_usd') -> pd.DataFrame:
-    """
-    Agrupa dados e calcula média de forma padronizada.
-    
-    Args:
-        dataframe: DataFrame com os dados
-        coluna_agrupamento: Coluna para agrupar
-        coluna_calculo: Coluna para calcular a média
-        
-    Returns:
-        DataFrame agrupado com média calculada
-    """
-    return (
-        dataframe
-        .groupby(coluna_agrupamento)[coluna_calculo]
-        .mean()
-        .reset_index()
-    )
-
-
-# ============================================================================
-# FUNÇÕES DE VISUALIZAÇÃO
-# ============================================================================
-
-
-def criar_grafico_top_cargos(dataframe: pd.DataFrame) -> Optional[px.bar]:
-    """
-    Cria gráfico de barras horizontal com os top 10 cargos por salário médio.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    top_cargos = (
-        dataframe
-        .groupby('cargo')['salario_usd']
-        .mean()
-        .nlargest(TOP_CARGOS_LIMITE)
-        .sort_values(ascending=True)
-        .reset_index()
-    )
-    
-    grafico = px.bar(
-        top_cargos,
-        x='salario_usd',
-        y='cargo',
-        orientation='h',
-        title="Top 10 cargos por salário médio",
-        labels={'salario_usd': 'Média salarial anual (USD)', 'cargo': 'Cargo'}
-    )
-    aplicar_layout_padrao(
-        grafico,
-        xaxis_title='Média salarial anual (USD)',
-        yaxis_title='',
-        yaxis={'categoryorder': 'total ascending'}
-    )
-    
-    return grafico
-
-
-def criar_grafico_distribuicao_salarios(dataframe: pd.DataFrame) -> Optional[px.histogram]:
-    """
-    Cria histograma da distribuição de salários.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    grafico = px.histogram(
-        dataframe,
-        x='salario_usd',
-        nbins=NUMERO_BINS_HISTOGRAMA,
-        title="Distribuição de salários anuais",
-        labels={'salario_usd': 'Faixa salarial (USD)', 'count': 'Frequência'}
-    )
-    aplicar_layout_padrao(
-        grafico,
-        xaxis_title='Faixa salarial (USD)',
-        yaxis_title='Frequência'
-    )
-    
-    return grafico
-
-
-def criar_grafico_tipos_trabalho(dataframe: pd.DataFrame) -> Optional[px.pie]:
-    """
-    Cria gráfico de pizza com a proporção dos tipos de trabalho.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    remoto_contagem = dataframe['remota'].value_counts().reset_index()
-    remoto_contagem.columns = ['tipo_trabalho', 'quantidade']
-    
-    grafico = px.pie(
-        remoto_contagem,
-        names='tipo_trabalho',
-        values='quantidade',
-        title='Proporção dos tipos de trabalho',
-        hole=HOLE_PIZZA
-    )
-    grafico.update_traces(textinfo='percent+label')
-    aplicar_layout_padrao(grafico)
-    
-    return grafico
-
-
-def criar_grafico_salario_por_pais(dataframe: pd.DataFrame) -> Optional[px.choropleth]:
-    """
-    Cria mapa coroplético com salário médio de Data Scientists por país.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio ou não houver dados
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    df_data_scientist = dataframe[dataframe['cargo'] == CARGO_DATA_SCIENTIST]
-    
-    if not validar_dataframe(df_data_scientist):
-        return None
-    
-    media_por_pais = agrupar_e_calcular_media(df_data_scientist, 'residencia')
-    
-    grafico = px.choropleth(
-        media_por_pais,
-        locations='residencia',
-        color='salario_usd',
-        color_continuous_scale='rdylgn',
-        title='Salário médio de Cientista de Dados por país',
-        labels={
-            'salario_usd': 'Salário médio (USD)',
-            'residencia': 'País'
-        }
-    )
-    aplicar_layout_padrao(grafico, coloraxis_colorbar_title='Salário médio (USD)')
-    
-    return grafico
-
-
-def ordenar_por_categoria(dataframe: pd.DataFrame, coluna: str, ordem: List) -> pd.DataFrame:
-    """
-    Ordena DataFrame por categoria em ordem específica.
-    
-    Args:
-        dataframe: DataFrame a ser ordenado
-        coluna: Nome da coluna categórica
-        ordem: Lista com a ordem desejada das categorias
-        
-    Returns:
-        DataFrame ordenado
-    """
-    df_ordenado = dataframe.copy()
-    df_ordenado[coluna] = pd.Categorical(
-        df_ordenado[coluna],
-        categories=ordem,
-        ordered=True
-    )
-    return df_ordenado.sort_values(coluna)
-
-
-def criar_grafico_boxplot_senioridade(dataframe: pd.DataFrame) -> Optional[px.box]:
-    """
-    Cria box plot comparando salários por nível de senioridade.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    # Ordenar senioridade de forma lógica
-    ordem_senioridade = ['junior', 'Pleno', 'Senior', 'executivo']
-    dataframe_ordenado = ordenar_por_categoria(dataframe, 'senioridade', ordem_senioridade)
-    
-    grafico = px.box(
-        dataframe_ordenado,
-        x='senioridade',
-        y='salario_usd',
-        title='Distribuição de Salários por Senioridade',
-        labels={
-            'salario_usd': 'Salário anual (USD)',
-            'senioridade': 'Nível de Senioridade'
-        },
-        color='senioridade',
-        color_discrete_sequence=px.colors.qualitative.Set2
-    )
-    aplicar_layout_padrao(
-        grafico,
-        showlegend=False,
-        xaxis_title='Nível de Senioridade',
-        yaxis_title='Salário anual (USD)'
-    )
-    
-    return grafico
-
-
-def criar_grafico_tendencia_temporal(dataframe: pd.DataFrame) -> Optional[px.line]:
-    """
-    Cria gráfico de linha mostrando a tendência de salários ao longo dos anos.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe) or len(dataframe['ano'].unique()) < 2:
-        return None
-    
-    tendencia = (
-        dataframe
-        .groupby('ano')['salario_usd']
-        .agg(['mean', 'median', 'count'])
-        .reset_index()
-    )
-    tendencia.columns = ['ano', 'media', 'mediana', 'contagem']
-    
-    grafico = px.line(
-        tendencia,
-        x='ano',
-        y=['media', 'mediana'],
-        title='Evolução Temporal dos Salários',
-        labels={
-            'ano': 'Ano',
-            'value': 'Salário anual (USD)',
-            'variable': 'Métrica'
-        },
-        markers=True
-    )
-    aplicar_layout_padrao(
-        grafico,
-        xaxis_title='Ano',
-        yaxis_title='Salário anual (USD)',
-        legend=dict(
-            title='Tipo',
-            yanchor="top",
-            y=0.99,
-            xanchor="left",
-            x=0.01
-        )
-    )
-    grafico.update_traces(
-        line=dict(width=3),
-        marker=dict(size=8)
-    )
-    
-    # Renomear legendas
-    grafico.data[0].name = 'Média'
-    grafico.data[1].name = 'Mediana'
-    
-    return grafico
-
-
-def criar_grafico_salario_por_tipo_trabalho(dataframe: pd.DataFrame) -> Optional[px.bar]:
-    """
-    Cria gráfico de barras comparando salários médios por tipo de trabalho.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        
-    Returns:
-        Gráfico Plotly ou None se o DataFrame estiver vazio
-    """
-    if not validar_dataframe(dataframe):
-        return None
-    
-    salario_por_tipo = agrupar_e_calcular_media(dataframe, 'remota')
-    salario_por_tipo = salario_por_tipo.sort_values('salario_usd', ascending=False)
-    salario_por_tipo.columns = ['tipo_trabalho', 'salario_medio']
-    
-    grafico = px.bar(
-        salario_por_tipo,
-        x='tipo_trabalho',
-        y='salario_medio',
-        title='Salário Médio por Tipo de Trabalho',
-        labels={
-            'salario_medio': 'Salário médio anual (USD)',
-            'tipo_trabalho': 'Tipo de Trabalho'
-        },
-        color='salario_medio',
-        color_continuous_scale='Blues'
-    )
-    aplicar_layout_padrao(
-        grafico,
-        showlegend=False,
-        xaxis_title='Tipo de Trabalho',
-        yaxis_title='Salário médio anual (USD)'
-    )
-    
-    return grafico
-
-
-def gerar_insights(dataframe: pd.DataFrame, metricas: Dict) -> List[str]:
-    """
-    Gera insights automáticos baseados nos dados.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        metricas: Dicionário com métricas calculadas
-        
-    Returns:
-        Lista de insights em formato de texto
-    """
-    insights = []
-    
-    if dataframe.empty:
-        return ["⚠️ Nenhum dado disponível para gerar insights."]
-    
-    # Insight sobre variação temporal
-    if metricas['variacao_ano_anterior'] != 0:
-        if metricas['variacao_ano_anterior'] > 0:
-            insights.append(
-                f"📈 **Crescimento Positivo**: Os salários aumentaram "
-                f"{metricas['variacao_ano_anterior']:.1f}% em relação ao ano anterior."
-            )
-        else:
-            insights.append(
-                f"📉 **Redução**: Os salários diminuíram "
-                f"{abs(metricas['variacao_ano_anterior']):.1f}% em relação ao ano anterior."
-            )
-    
-    # Insight sobre distribuição
-    coeficiente_variacao = (metricas['desvio_padrao'] / metricas['salario_medio']) * 100 if metricas['salario_medio'] > 0 else 0
-    if coeficiente_variacao > 50:
-        insights.append(
-            f"📊 **Alta Variabilidade**: Os salários apresentam alta dispersão "
-            f"(CV: {coeficiente_variacao:.1f}%), indicando grande diferença entre os valores."
-        )
-    
-    # Insight sobre mediana vs média
-    diferenca_mediana_media = abs(metricas['salario_medio'] - metricas['salario_mediano'])
-    if diferenca_mediana_media > metricas['salario_medio'] * 0.1:
-        if metricas['salario_medio'] > metricas['salario_mediano']:
-            insights.append(
-                "💰 **Distribuição Assimétrica**: A média é significativamente maior que a mediana, "
-                "indicando presença de salários muito altos que elevam a média."
-            )
-    
-    # Insight sobre tipo de trabalho
-    if 'remota' in dataframe.columns:
-        salario_remoto = dataframe[dataframe['remota'] == 'Remoto']['salario_usd'].mean()
-        salario_presencial = dataframe[dataframe['remota'] == 'Presencial']['salario_usd'].mean()
-        if salario_remoto > 0 and salario_presencial > 0:
-            diferenca = calcular_diferenca_percentual(salario_remoto, salario_presencial)
-            if abs(diferenca) > 5:
-                if diferenca > 0:
-                    insights.append(
-                        f"🏠 **Trabalho Remoto**: Profissionais remotos ganham em média "
-                        f"{diferenca:.1f}% mais que profissionais presenciais."
-                    )
-                else:
-                    insights.append(
-                        f"🏢 **Trabalho Presencial**: Profissionais presenciais ganham em média "
-                        f"{abs(diferenca):.1f}% mais que profissionais remotos."
-                    )
-    
-    # Insight sobre senioridade
-    if 'senioridade' in dataframe.columns:
-        salario_por_senioridade = dataframe.groupby('senioridade')['salario_usd'].mean().sort_values(ascending=False)
-        if len(salario_por_senioridade) > 1:
-            maior = salario_por_senioridade.index[0]
-            menor = salario_por_senioridade.index[-1]
-            diferenca = calcular_diferenca_percentual(
-                salario_por_senioridade[maior],
-                salario_por_senioridade[menor]
-            )
-            insights.append(
-                f"🎯 **Gap de Senioridade**: Profissionais {maior} ganham em média "
-                f"{diferenca:.1f}% mais que profissionais {menor}."
-            )
-    
-    if not insights:
-        insights.append("💡 Analise os gráficos abaixo para obter mais insights sobre os dados.")
-    
-    return insights
-
-
-# ============================================================================
-# FUNÇÕES DE INTERFACE
-# ============================================================================
-
-
-def criar_barra_lateral_filtros(dataframe: pd.DataFrame) -> Dict:
-    """
-    Cria a barra lateral com os filtros interativos.
-    
-    Args:
-        dataframe: DataFrame com os dados
-        
-    Returns:
-        Dicionário com os valores selecionados nos filtros
-    """
-    st.sidebar.header("🔍 Filtros")
-    
-    anos_selecionados = criar_filtro_multiselect(
-        "Ano",
-        sorted(dataframe['ano'].unique())
-    )
-    
-    senioridades_selecionadas = criar_filtro_multiselect(
-        "Senioridade",
-        sorted(dataframe['senioridade'].unique())
-    )
-    
-    contratos_selecionados = criar_filtro_multiselect(
-        "Tipo de Contrato",
-        sorted(dataframe['contrato'].unique())
-    )
-    
-    tamanhos_selecionados = criar_filtro_multiselect(
-        "Tamanho da Empresa",
-        sorted(dataframe['tamanho_empresa'].unique())
-    )
-    
-    # Filtro opcional por cargo
-    cargos_selecionados = st.sidebar.multiselect(
-        "Cargo (opcional)",
-        sorted(dataframe['cargo'].unique()),
-        default=[]
-    )
-    
-    st.sidebar.markdown("---")
-    st.sidebar.markdown("**💡 Dica:** Use os filtros para refinar sua análise")
-    
-    return {
-        'anos': anos_selecionados,
-        'senioridades': senioridades_selecionadas,
-        'contratos': contratos_selecionados,
-        'tamanhos_empresa': tamanhos_selecionados,
-        'cargos': cargos_selecionados
-    }
-
-
-def exibir_metricas(metricas: Dict) -> None:
-    """
-    Exibe as métricas principais do dashboard com layout melhorado.
-    
-    Args:
-        metricas: Dicionário com as métricas calculadas
-    """
-    st.subheader("📊 Métricas Principais")
-    
-    # Primeira linha - Métricas principais
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        delta_mediana = f"Mediana: {formatar_moeda(metricas['salario_mediano'])}" if metricas['salario_mediano'] > 0 else None
-        st.metric(
-            "Salário Médio",
-            formatar_moeda(metricas['salario_medio']),
-            delta=delta_mediana
-        )
-    
-    with col2:
-        variacao_texto = f"{metricas['variacao_ano_anterior']:+.1f}%"
-        st.metric(
-            "Salário Mediano",
-            formatar_moeda(metricas['salario_mediano']),
-            delta=variacao_texto if metricas['variacao_ano_anterior'] != 0 else None
-        )
-    
-    with col3:
-        faixa = f"{formatar_moeda(metricas['salario_minimo'])} - {formatar_moeda(metricas['salario_maximo'])}"
-        delta_faixa = f"P25-P75: {formatar_moeda(metricas['percentil_25'])} - {formatar_moeda(metricas['percentil_75'])}"
-        st.metric("Faixa Salarial", faixa, delta=delta_faixa)
-    
-    with col4:
-        st.metric(
-            "Total de Registros",
-            f"{metricas['total_registros']:,}",
-            delta=f"{metricas['numero_cargos_unicos']} cargos únicos"
-        )
-    
-    # Segunda linha - Estatísticas adicionais
-    col5, col6, col7, col8 = st.columns(4)
-    
-    with col5:
-        st.metric("Desvio Padrão", formatar_moeda(metricas['desvio_padrao']))
-    
-    with col6:
-        st.metric("Percentil 25", formatar_moeda(metricas['percentil_25']))
-    
-    with col7:
-        st.metric("Percentil 75", formatar_moeda(metricas['percentil_75']))
-    
-    with col8:
-        cargo_freq = metricas['cargo_mais_frequente'][:30] + "..." if len(metricas['cargo_mais_frequente']) > 30 else metricas['cargo_mais_frequente']
-        st.metric("Cargo Mais Frequente", cargo_freq)
-
-
-def exibir_insights(insights: List[str]) -> None:
-    """
-    Exibe os insights gerados automaticamente.
-    
-    Args:
-        insights: Lista de insights em formato de texto
-    """
-    st.subheader("💡 Insights Automáticos")
-    for insight in insights:
-        st.markdown(f"- {insight}")
-    st.markdown("---")
-
-
-def exibir_graficos(dataframe: pd.DataFrame, aba: str = "Visão Geral") -> None:
-    """
-    Exibe todos os gráficos do dashboard organizados por abas.
-    
-    Args:
-        dataframe: DataFrame filtrado
-        aba: Nome da aba atual
-    """
-    if aba == "Visão Geral":
-        # Primeira linha de gráficos
-        col_graf1, col_graf2 = st.columns(2)
-        
-        with col_graf1:
-            exibir_grafico_com_tratamento(
-                criar_grafico_top_cargos(dataframe),
-                "Nenhum dado para exibir no gráfico de cargos."
-            )
-        
-        with col_graf2:
-            exibir_grafico_com_tratamento(
-                criar_grafico_distribuicao_salarios(dataframe),
-                "Nenhum dado para exibir no gráfico de distribuição."
-            )
-        
-        # Segunda linha de gráficos
-        col_graf3, col_graf4 = st.columns(2)
-        
-        with col_graf3:
-            exibir_grafico_com_tratamento(
-                criar_grafico_tipos_trabalho(dataframe),
-                "Nenhum dado para exibir no gráfico dos tipos de trabalho."
-            )
-        
-        with col_graf4:
-            exibir_grafico_com_tratamento(
-                criar_grafico_salario_por_pais(dataframe),
-                "Nenhum dado para exibir no gráfico de países."
-            )
-    
-    elif aba == "Análises Comparativas":
-        # Gráfico de tendência temporal
-        grafico_tendencia = criar_grafico_tendencia_temporal(dataframe)
-        if grafico_tendencia:
-            st.plotly_chart(grafico_tendencia, use_container_width=True)
-        else:
-            st.info("Selecione múltiplos anos nos filtros para visualizar a tendência temporal.")
-        
-        st.markdown("---")
-        
-        # Box plot por senioridade
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            exibir_grafico_com_tratamento(
-                criar_grafico_boxplot_senioridade(dataframe),
-                "Nenhum dado para exibir no gráfico de box plot."
-            )
-        
-        with col2:
-            exibir_grafico_com_tratamento(
-                criar_grafico_salario_por_tipo_trabalho(dataframe),
-                "Nenhum dado para exibir no gráfico de tipo de trabalho."
-            )
-
-
-def exibir_tabela_dados(dataframe: pd.DataFrame) -> None:
-    """
-    Exibe a tabela com os dados detalhados.
-    
-    Args:
-        dataframe: DataFrame filtrado
-    """
-    st.subheader("Dados Detalhados")
-    st.dataframe(dataframe)
+"""
+Módulo comum com constantes e funções auxiliares para o dashboard.
+
+Este módulo contém as funções que dependem do Streamlit: o cache em memória
+dos dados, índices, agregados e gráficos entre reruns e sessões, e as funções
+de interface. Todo o cálculo (processamento, métricas, insights e gráficos)
+fica em nucleo.py, que não importa o Streamlit, e é reexportado aqui para que
+app.py e os demais scripts continuem importando tudo de common.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+import numpy as np
+import pandas as pd
+
+# Reexporta constantes e funções de cálculo do núcleo
+from nucleo import *  # noqa: F401,F403
+import nucleo
+
+# Copy-on-Write: as sessões recebem cópias rasas do DataFrame compartilhado e
+# qualquer alteração em uma delas copia apenas os dados alterados, sem tocar
+# no original (comportamento padrão a partir do pandas 3)
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Cache de gráficos compartilhado entre sessões
+LIMITE_ENTRADAS_CACHE_GRAFICOS = int(os.environ.get('DASHBOARD_CACHE_GRAFICOS_ENTRADAS', '256'))
+LIMITE_MB_CACHE_GRAFICOS = int(os.environ.get('DASHBOARD_CACHE_GRAFICOS_MB', '256'))
+TTL_CACHE_GRAFICOS = int(os.environ.get('DASHBOARD_CACHE_GRAFICOS_TTL', '3600'))
+
+# Construção dos gráficos em paralelo: threads do pool compartilhado e
+# tempo limite de cada gráfico, em segundos, contado a partir do envio
+TRABALHADORES_GRAFICOS = int(os.environ.get('DASHBOARD_TRABALHADORES_GRAFICOS', '4'))
+TEMPO_LIMITE_GRAFICO = float(os.environ.get('DASHBOARD_TEMPO_LIMITE_GRAFICO', '30'))
+
+# Versões dos dados mantidas nos caches de índice, cubo e esboços: a atual
+# e a anterior, base da atualização incremental
+LIMITE_VERSOES_DADOS = 2
+
+# Resultados guardados por sessão para reaproveitar ao voltar a uma aba,
+# limitados em número e em tamanho (as ordenações da tabela crescem com os dados)
+LIMITE_RESULTADOS_SESSAO = 16
+LIMITE_MB_RESULTADOS_SESSAO = int(os.environ.get('DASHBOARD_RESULTADOS_SESSAO_MB', '64'))
+
+# Tabela paginada
+TAMANHOS_PAGINA_TABELA = [25, 50, 100, 500]
+
+# ============================================================================
+# FUNÇÕES DE PROCESSAMENTO DE DADOS
+# ============================================================================
+
+
+@st.cache_resource(show_spinner=False)
+def obter_dados_brutos_compartilhados(url: str) -> pd.DataFrame:
+    """
+    Carrega os dados brutos uma única vez por processo, compartilhados entre sessões.
+    
+    Se a fonte não puder ser lida, o erro é exibido na interface e a
+    execução é interrompida.
+    
+    Args:
+        url: URL ou caminho local do arquivo (CSV, CSV comprimido ou Parquet)
+        
+    Returns:
+        DataFrame compartilhado; deve ser lido apenas por meio de carregar_dados
+    """
+    try:
+        return nucleo.carregar_dados(url)
+    except Exception as e:
+        st.error(f"Erro ao carregar dados: {str(e)}")
+        st.stop()
+
+
+def carregar_dados(url: str) -> pd.DataFrame:
+    """
+    Carrega os dados brutos a partir de uma URL ou caminho local.
+    
+    Versão de nucleo.carregar_dados mantida em memória: retorna uma cópia
+    rasa do DataFrame compartilhado (ver processar_dados).
+    
+    Args:
+        url: URL ou caminho local do arquivo (CSV, CSV comprimido ou Parquet)
+        
+    Returns:
+        DataFrame com os dados carregados
+    """
+    return obter_dados_brutos_compartilhados(url).copy(deep=False)
+
+
+@st.cache_resource(show_spinner="Processando dados...")
+def obter_dados_compartilhados(url: str, usar_cache_disco: bool = True,
+                               usar_categorias: bool = True,
+                               tamanho_bloco: int = TAMANHO_BLOCO_INGESTAO,
+                               incremental: bool = True,
+                               compactar_numericos: bool = COMPACTAR_NUMERICOS) -> pd.DataFrame:
+    """
+    Processa os dados com nucleo.processar_dados uma única vez por processo.
+    
+    O DataFrame resultante é compartilhado, sem cópia, por todas as sessões.
+    Se a fonte não puder ser lida, o erro é exibido na interface e a
+    execução é interrompida.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        usar_cache_disco: Se deve usar o cache em disco do DataFrame processado
+        usar_categorias: Se as colunas de dimensão devem ser categóricas
+        tamanho_bloco: Linhas por bloco na ingestão em streaming (0 desativa)
+        incremental: Se deve processar apenas as linhas acrescentadas à fonte
+        compactar_numericos: Se as colunas numéricas devem usar o menor tipo sem perda
+        
+    Returns:
+        DataFrame compartilhado; deve ser lido apenas por meio de processar_dados
+    """
+    try:
+        return nucleo.processar_dados(
+            url, usar_cache_disco, usar_categorias, tamanho_bloco, incremental, compactar_numericos
+        )
+    except Exception as e:
+        st.error(f"Erro ao carregar dados: {str(e)}")
+        st.stop()
+
+
+def processar_dados(url: str, usar_cache_disco: bool = True,
+                    usar_categorias: bool = True,
+                    tamanho_bloco: int = TAMANHO_BLOCO_INGESTAO,
+                    incremental: bool = True,
+                    compactar_numericos: bool = COMPACTAR_NUMERICOS) -> pd.DataFrame:
+    """
+    Processa os dados com nucleo.processar_dados, mantendo o resultado em memória entre reruns e sessões.
+    
+    Os dados ficam uma única vez na memória do processo
+    (obter_dados_compartilhados) e cada chamada recebe uma cópia rasa, que
+    custa apenas a criação de um novo objeto. Com Copy-on-Write, alterar a
+    cópia copia apenas as colunas alteradas e nunca modifica os dados
+    compartilhados, e os arrays obtidos com to_numpy são somente leitura.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        usar_cache_disco: Se deve usar o cache em disco do DataFrame processado
+        usar_categorias: Se as colunas de dimensão devem ser categóricas
+        tamanho_bloco: Linhas por bloco na ingestão em streaming (0 desativa)
+        incremental: Se deve processar apenas as linhas acrescentadas à fonte
+        compactar_numericos: Se as colunas numéricas devem usar o menor tipo sem perda
+        
+    Returns:
+        DataFrame processado e limpo
+    """
+    return obter_dados_compartilhados(
+        url, usar_cache_disco, usar_categorias, tamanho_bloco, incremental, compactar_numericos
+    ).copy(deep=False)
+
+
+@st.cache_resource(show_spinner=False, max_entries=LIMITE_VERSOES_DADOS)
+def obter_indice_filtros(_dataframe: pd.DataFrame, versao: str) -> Dict:
+    """
+    Retorna o índice de filtros do DataFrame, construído uma única vez por versão dos dados.
+    
+    Se o DataFrame foi anexado de forma incremental por processar_dados, o
+    índice da versão anterior é reaproveitado e apenas as linhas novas são
+    indexadas. Apenas as LIMITE_VERSOES_DADOS versões mais recentes ficam
+    em memória, como em obter_cubo e obter_esbocos_quantis.
+    
+    Args:
+        _dataframe: DataFrame processado (não entra no hash do cache)
+        versao: Versão dos dados, obtida com obter_versao_dados
+        
+    Returns:
+        Índice criado por construir_indice_filtros, com os arrays somente leitura
+    """
+    versao_base = _dataframe.attrs.get('versao_base')
+    if versao_base:
+        base, novas = separar_linhas_base(_dataframe)
+        indice = anexar_indice_filtros(obter_indice_filtros(base, versao_base), novas)
+    else:
+        indice = construir_indice_filtros(_dataframe)
+    
+    # Compartilhado entre sessões: os bitmaps não podem ser alterados
+    return tornar_somente_leitura(indice)
+
+
+@st.cache_resource(show_spinner=False, max_entries=LIMITE_VERSOES_DADOS)
+def obter_cubo(_dataframe: pd.DataFrame, versao: str) -> pd.DataFrame:
+    """
+    Retorna o cubo pré-agregado do DataFrame, construído uma única vez por versão dos dados.
+    
+    Para DataFrames anexados de forma incremental, o cubo da versão anterior
+    é somado ao cubo das linhas novas.
+    
+    Args:
+        _dataframe: DataFrame processado (não entra no hash do cache)
+        versao: Versão dos dados, obtida com obter_versao_dados
+        
+    Returns:
+        Cubo criado por construir_cubo (ou gravado pela ingestão em blocos)
+    """
+    cubo = carregar_cache_processado(versao, PREFIXO_CACHE_CUBO)
+    if cubo is not None:
+        return cubo
+    
+    versao_base = _dataframe.attrs.get('versao_base')
+    if versao_base:
+        base, novas = separar_linhas_base(_dataframe)
+        partes = [obter_cubo(base, versao_base), construir_cubo(novas)]
+        return converter_para_categorias(consolidar_agregados(partes, DIMENSOES_CUBO))
+    return construir_cubo(_dataframe)
+
+
+@st.cache_resource(show_spinner=False, max_entries=LIMITE_VERSOES_DADOS)
+def obter_esbocos_quantis(_dataframe: pd.DataFrame, versao: str) -> pd.DataFrame:
+    """
+    Retorna os esboços de quantis do DataFrame, construídos uma única vez por versão dos dados.
+    
+    Para DataFrames anexados de forma incremental, os esboços da versão
+    anterior são somados aos esboços das linhas novas.
+    
+    Args:
+        _dataframe: DataFrame processado (não entra no hash do cache)
+        versao: Versão dos dados, obtida com obter_versao_dados
+        
+    Returns:
+        Esboços criados por construir_esbocos_quantis (ou gravados pela ingestão em blocos)
+    """
+    esbocos = carregar_cache_processado(versao, PREFIXO_CACHE_ESBOCOS)
+    if esbocos is not None:
+        return esbocos
+    
+    versao_base = _dataframe.attrs.get('versao_base')
+    if versao_base:
+        base, novas = separar_linhas_base(_dataframe)
+        partes = [obter_esbocos_quantis(base, versao_base), construir_esbocos_quantis(novas)]
+        return converter_para_categorias(consolidar_agregados(partes, DIMENSOES_CUBO + ['balde']))
+    return construir_esbocos_quantis(_dataframe)
+
+
+@st.cache_data(show_spinner="Preparando o banco de dados...")
+def obter_banco_sql(url: str, tamanho_bloco: int = TAMANHO_BLOCO_INGESTAO) -> Path:
+    """
+    Retorna o banco SQLite da fonte (modo SQL), criado por nucleo.obter_banco_sql.
+    
+    Se a fonte não puder ser lida, o erro é exibido na interface e a
+    execução é interrompida.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        tamanho_bloco: Linhas por bloco na carga (0 usa TAMANHO_BLOCO_SQL)
+        
+    Returns:
+        Caminho do banco SQLite
+    """
+    try:
+        return nucleo.obter_banco_sql(url, tamanho_bloco)
+    except Exception as e:
+        st.error(f"Erro ao carregar dados: {str(e)}")
+        st.stop()
+
+
+@st.cache_resource(show_spinner=False, max_entries=LIMITE_VERSOES_DADOS)
+def obter_cubo_filtros_sql(caminho: Path) -> pd.DataFrame:
+    """
+    Retorna o cubo completo do banco sobre as colunas de filtro, consultado uma única vez.
+    
+    Fornece as opções da barra lateral e de compilar_filtros_sql.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        
+    Returns:
+        Cubo com as colunas de COLUNAS_FILTRO
+    """
+    return consultar_cubo_sql(caminho, colunas=list(COLUNAS_FILTRO.values()))
+
+
+@st.cache_data(show_spinner=False, max_entries=LIMITE_ENTRADAS_CACHE_GRAFICOS, ttl=TTL_CACHE_GRAFICOS)
+def consultar_agregados_sql(caminho: Path, filtros: Dict) -> Dict:
+    """
+    Consulta no banco o cubo, os esboços e os extremos de uma seleção de filtros.
+    
+    Os resultados são pequenos e ficam em memória, compartilhados entre sessões.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+        
+    Returns:
+        Dicionário com cubo, esboco, minimo e maximo
+    """
+    opcoes = listar_opcoes_filtro(obter_cubo_filtros_sql(caminho))
+    esboco = consultar_esbocos_sql(caminho, filtros, opcoes)
+    minimo, maximo = consultar_extremos_sql(caminho, filtros, esboco, opcoes)
+    return {
+        'cubo': consultar_cubo_sql(caminho, filtros, opcoes),
+        'esboco': esboco,
+        'minimo': minimo,
+        'maximo': maximo
+    }
+
+
+# ============================================================================
+# FUNÇÕES AUXILIARES REUTILIZÁVEIS
+# ============================================================================
+
+
+def exibir_grafico_com_tratamento(grafico, mensagem_erro: str) -> None:
+    """
+    Exibe um gráfico com tratamento de erro padronizado.
+    
+    Args:
+        grafico: Gráfico Plotly ou None
+        mensagem_erro: Mensagem a exibir se o gráfico for None
+    """
+    if grafico:
+        st.plotly_chart(grafico, use_container_width=True)
+    else:
+        st.warning(mensagem_erro)
+
+
+def criar_filtro_multiselect(label: str, opcoes: List, default: List = None) -> List:
+    """
+    Cria um filtro multiselect padronizado na sidebar.
+    
+    Args:
+        label: Label do filtro
+        opcoes: Lista de opções disponíveis
+        default: Valores padrão (se None, usa todas as opções)
+        
+    Returns:
+        Lista de valores selecionados
+    """
+    if default is None:
+        default = opcoes
+    return st.sidebar.multiselect(label, opcoes, default=default)
+
+
+# ============================================================================
+# FUNÇÕES DE CACHE DE GRÁFICOS
+# ============================================================================
+
+
+@st.cache_resource(show_spinner=False)
+def obter_cache_graficos() -> Dict:
+    """
+    Retorna o cache de gráficos, único no processo e compartilhado entre sessões.
+    
+    Returns:
+        Cache criado por criar_cache_lru
+    """
+    return criar_cache_lru(
+        LIMITE_ENTRADAS_CACHE_GRAFICOS,
+        LIMITE_MB_CACHE_GRAFICOS * 1024 * 1024,
+        TTL_CACHE_GRAFICOS
+    )
+
+
+def consultar_grafico_em_cache(chave_cache: Optional[str], funcao):
+    """
+    Retorna o gráfico do cache compartilhado, se existir.
+    
+    Args:
+        chave_cache: Impressão de calcular_impressao_filtros (None não usa o cache)
+        funcao: Função criar_grafico_* que constrói o gráfico
+        
+    Returns:
+        Gráfico Plotly ou None se não estiver no cache
+    """
+    if chave_cache is None:
+        return None
+    
+    grafico = consultar_cache_lru(obter_cache_graficos(), f"{funcao.__name__}:{chave_cache}")
+    if grafico is not None:
+        with medir_etapa(f"{funcao.__name__}[cache]"):
+            return grafico
+    return None
+
+
+def guardar_grafico_em_cache(chave_cache: Optional[str], funcao, grafico) -> None:
+    """
+    Armazena um gráfico construído no cache compartilhado.
+    
+    Pode ser chamada de qualquer thread: o cache tem sua própria trava.
+    
+    Args:
+        chave_cache: Impressão de calcular_impressao_filtros (None não usa o cache)
+        funcao: Função criar_grafico_* que construiu o gráfico
+        grafico: Gráfico Plotly ou None (não armazenado)
+    """
+    if chave_cache is None or grafico is None:
+        return
+    inserir_cache_lru(
+        obter_cache_graficos(),
+        f"{funcao.__name__}:{chave_cache}",
+        grafico,
+        estimar_tamanho_grafico(grafico)
+    )
+
+
+def obter_grafico(chave_cache: Optional[str], funcao, *args):
+    """
+    Retorna o gráfico do cache compartilhado ou o constrói e armazena.
+    
+    Args:
+        chave_cache: Impressão de calcular_impressao_filtros (None não usa o cache)
+        funcao: Função criar_grafico_* que constrói o gráfico
+        *args: Argumentos da função
+        
+    Returns:
+        Gráfico Plotly ou None
+    """
+    grafico = consultar_grafico_em_cache(chave_cache, funcao)
+    if grafico is None:
+        grafico = executar_medindo(funcao, *args)
+        guardar_grafico_em_cache(chave_cache, funcao, grafico)
+    return grafico
+
+
+# ============================================================================
+# FUNÇÕES DE CONSTRUÇÃO PARALELA DE GRÁFICOS
+# ============================================================================
+
+
+@st.cache_resource(show_spinner=False)
+def obter_executor_graficos() -> ThreadPoolExecutor:
+    """
+    Retorna o pool de threads dos gráficos, único no processo e compartilhado entre sessões.
+    
+    O pool limita o número de gráficos construídos ao mesmo tempo, somadas
+    todas as sessões.
+    
+    Returns:
+        ThreadPoolExecutor com TRABALHADORES_GRAFICOS threads
+    """
+    return ThreadPoolExecutor(max_workers=max(1, TRABALHADORES_GRAFICOS), thread_name_prefix='graficos')
+
+
+def criar_pedido_grafico(espaco, funcao, args: Tuple, mensagem_vazio: str,
+                         exibir_vazio=None) -> Dict:
+    """
+    Monta o pedido de um gráfico para construir_graficos_em_paralelo.
+    
+    Args:
+        espaco: Contêiner do Streamlit já criado onde o gráfico será exibido
+        funcao: Função criar_grafico_* que constrói o gráfico
+        args: Argumentos da função
+        mensagem_vazio: Mensagem a exibir se o gráfico for None
+        exibir_vazio: Função do Streamlit que exibe a mensagem (padrão: st.warning)
+        
+    Returns:
+        Dicionário do pedido
+    """
+    espaco_grafico = espaco.empty()
+    espaco_grafico.caption("⏳ Construindo gráfico...")
+    return {
+        'espaco': espaco_grafico,
+        'funcao': funcao,
+        'args': args,
+        'mensagem_vazio': mensagem_vazio,
+        'exibir_vazio': exibir_vazio or st.warning
+    }
+
+
+def exibir_pedido_grafico(pedido: Dict, grafico) -> None:
+    """
+    Exibe o gráfico de um pedido no seu contêiner, substituindo o aviso de construção.
+    
+    Args:
+        pedido: Pedido criado por criar_pedido_grafico
+        grafico: Gráfico Plotly ou None
+    """
+    with pedido['espaco'].container():
+        if grafico:
+            st.plotly_chart(grafico, use_container_width=True)
+        else:
+            pedido['exibir_vazio'](pedido['mensagem_vazio'])
+
+
+def guardar_resultado_em_cache(chave_cache: Optional[str], funcao, futuro) -> None:
+    """
+    Guarda no cache o gráfico de uma construção concluída sem erro.
+    
+    Usada como callback do futuro, roda na thread que concluiu a construção.
+    
+    Args:
+        chave_cache: Impressão de calcular_impressao_filtros (None não usa o cache)
+        funcao: Função criar_grafico_* que construiu o gráfico
+        futuro: Futuro concluído da construção
+    """
+    if not futuro.cancelled() and futuro.exception() is None:
+        guardar_grafico_em_cache(chave_cache, funcao, futuro.result())
+
+
+def construir_graficos_em_paralelo(pedidos: List[Dict], chave_cache: Optional[str] = None) -> None:
+    """
+    Constrói os gráficos no pool de threads e exibe cada um assim que fica pronto.
+    
+    Os gráficos do cache são exibidos na hora; os demais são construídos em
+    paralelo e exibidos na ordem em que terminam. Um erro ou o estouro de
+    TEMPO_LIMITE_GRAFICO afetam apenas o gráfico correspondente, que recebe
+    uma mensagem no lugar do gráfico. Um gráfico que termine depois do tempo
+    limite ainda é guardado no cache para o próximo rerun.
+    
+    Args:
+        pedidos: Pedidos criados por criar_pedido_grafico
+        chave_cache: Impressão dos filtros para o cache de gráficos entre sessões (opcional)
+    """
+    executor = obter_executor_graficos()
+    pendentes = {}
+    for pedido in pedidos:
+        grafico = consultar_grafico_em_cache(chave_cache, pedido['funcao'])
+        if grafico is not None:
+            exibir_pedido_grafico(pedido, grafico)
+            continue
+        
+        futuro = executor.submit(
+            copiar_contexto_medicoes().run, executar_medindo, pedido['funcao'], *pedido['args']
+        )
+        futuro.add_done_callback(partial(guardar_resultado_em_cache, chave_cache, pedido['funcao']))
+        pendentes[futuro] = pedido
+    
+    limite = time.monotonic() + TEMPO_LIMITE_GRAFICO
+    while pendentes:
+        restante = limite - time.monotonic()
+        if restante <= 0:
+            break
+        concluidos, _ = wait(pendentes, timeout=restante, return_when=FIRST_COMPLETED)
+        for futuro in concluidos:
+            pedido = pendentes.pop(futuro)
+            erro = futuro.exception()
+            if erro is None:
+                exibir_pedido_grafico(pedido, futuro.result())
+            else:
+                pedido['espaco'].error(f"Erro ao construir o gráfico: {erro}")
+    
+    for futuro, pedido in pendentes.items():
+        futuro.cancel()
+        pedido['espaco'].warning(
+            f"⏱️ O gráfico não ficou pronto em {TEMPO_LIMITE_GRAFICO:.0f} s. "
+            "Atualize a página para tentar novamente."
+        )
+
+
+# ============================================================================
+# FUNÇÕES DE INTERFACE
+# ============================================================================
+
+
+def criar_barra_lateral_filtros(dataframe: pd.DataFrame) -> Dict:
+    """
+    Cria a barra lateral com os filtros interativos.
+    
+    Args:
+        dataframe: DataFrame com os dados
+        
+    Returns:
+        Dicionário com os valores selecionados nos filtros
+    """
+    st.sidebar.header("🔍 Filtros")
+    
+    anos_selecionados = criar_filtro_multiselect(
+        "Ano",
+        obter_opcoes_filtro(dataframe['ano'])
+    )
+    
+    senioridades_selecionadas = criar_filtro_multiselect(
+        "Senioridade",
+        obter_opcoes_filtro(dataframe['senioridade'])
+    )
+    
+    contratos_selecionados = criar_filtro_multiselect(
+        "Tipo de Contrato",
+        obter_opcoes_filtro(dataframe['contrato'])
+    )
+    
+    tamanhos_selecionados = criar_filtro_multiselect(
+        "Tamanho da Empresa",
+        obter_opcoes_filtro(dataframe['tamanho_empresa'])
+    )
+    
+    # Filtro opcional por cargo
+    cargos_selecionados = st.sidebar.multiselect(
+        "Cargo (opcional)",
+        obter_opcoes_filtro(dataframe['cargo']),
+        default=[]
+    )
+    
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("**💡 Dica:** Use os filtros para refinar sua análise")
+    
+    return {
+        'anos': anos_selecionados,
+        'senioridades': senioridades_selecionadas,
+        'contratos': contratos_selecionados,
+        'tamanhos_empresa': tamanhos_selecionados,
+        'cargos': cargos_selecionados
+    }
+
+
+def criar_botao_recarregar_dados() -> None:
+    """
+    Cria na barra lateral o botão que descarta os dados em memória e relê a fonte.
+    
+    Como processar_dados é incremental, linhas acrescentadas à fonte desde a
+    última leitura são processadas sem repetir o restante do arquivo.
+    """
+    if st.sidebar.button("🔄 Recarregar dados", help="Lê novamente a fonte de dados, processando apenas as linhas novas"):
+        obter_dados_compartilhados.clear()
+        obter_banco_sql.clear()
+
+
+def criar_abas_sob_demanda(rotulos: List[str], chave: str = 'aba_ativa') -> List:
+    """
+    Cria abas em que apenas o conteúdo da aba selecionada precisa ser executado.
+    
+    A troca de aba dispara um rerun e o atributo open de cada aba indica se
+    ela está selecionada. Em versões do Streamlit sem estado de abas, todas
+    as abas são criadas como antes e consideradas abertas.
+    
+    Args:
+        rotulos: Rótulos das abas
+        chave: Chave da aba selecionada em st.session_state
+        
+    Returns:
+        Lista de abas, como em st.tabs
+    """
+    try:
+        return st.tabs(rotulos, key=chave, on_change="rerun")
+    except TypeError:
+        return st.tabs(rotulos)
+
+
+def aba_esta_aberta(aba) -> bool:
+    """
+    Verifica se o conteúdo de uma aba criada por criar_abas_sob_demanda deve ser executado.
+    
+    Args:
+        aba: Aba retornada por criar_abas_sob_demanda
+        
+    Returns:
+        False apenas se a aba comprovadamente não estiver selecionada
+    """
+    return getattr(aba, 'open', None) is not False
+
+
+def obter_estado_filtros() -> Dict:
+    """
+    Retorna o estado de filtros da sessão usado por filtrar_dataframe.
+    
+    Guarda a máscara de cada dimensão e as posições da última filtragem,
+    para que um rerun reavalie apenas as dimensões cuja seleção mudou.
+    
+    Returns:
+        Estado criado por criar_estado_filtros
+    """
+    return st.session_state.setdefault('estado_filtros', criar_estado_filtros())
+
+
+def memorizar_na_sessao(chave: str, funcao):
+    """
+    Retorna um resultado guardado na sessão ou o calcula e guarda.
+    
+    Usado para que o conteúdo de uma aba não seja recalculado quando o
+    usuário volta a ela sem alterar os filtros. Os resultados ficam em um
+    cache LRU da sessão (criar_cache_lru), limitado a
+    LIMITE_RESULTADOS_SESSAO entradas e LIMITE_MB_RESULTADOS_SESSAO MB
+    (estimar_tamanho_resultado); resultados maiores que o limite são
+    calculados a cada execução, sem serem guardados.
+    
+    Args:
+        chave: Chave do resultado, incluindo a impressão dos filtros
+        funcao: Função sem argumentos que calcula o resultado
+        
+    Returns:
+        O resultado guardado ou recém-calculado
+    """
+    resultados = st.session_state.get('resultados_sessao')
+    if resultados is None:
+        resultados = criar_cache_lru(LIMITE_RESULTADOS_SESSAO, LIMITE_MB_RESULTADOS_SESSAO * 1024 * 1024, 0)
+        st.session_state['resultados_sessao'] = resultados
+    
+    resultado = consultar_cache_lru(resultados, chave)
+    if resultado is None:
+        resultado = funcao()
+        inserir_cache_lru(resultados, chave, resultado, estimar_tamanho_resultado(resultado))
+    return resultado
+
+
+def criar_opcao_painel_desempenho() -> bool:
+    """
+    Cria na barra lateral a opção de exibir o painel de desempenho da execução.
+    
+    Returns:
+        True se o painel estiver ativado
+    """
+    return st.sidebar.toggle(
+        "Painel de desempenho",
+        value=False,
+        help=(
+            "Mostra o tempo e o pico de memória de cada etapa desta execução. "
+            "O pico é do processo e inclui outras sessões ativas no mesmo intervalo. "
+            "A medição de memória deixa o dashboard um pouco mais lento."
+        )
+    )
+
+
+def exibir_painel_desempenho(registro: Optional[Dict],
+                             relatorio_memoria: Optional[pd.DataFrame] = None) -> None:
+    """
+    Exibe na barra lateral o tempo e o pico de memória de cada etapa da execução.
+    
+    Args:
+        registro: Medições retornadas por finalizar_medicoes (com as
+            estatísticas do cache de gráficos em cache_graficos, se houver)
+        relatorio_memoria: Memória das colunas do DataFrame, retornada por
+            calcular_relatorio_memoria (opcional)
+    """
+    if not registro:
+        return
+    
+    with st.sidebar.expander("⏱️ Desempenho da execução", expanded=True):
+        st.caption(f"Tempo total: {registro['total_ms']:.0f} ms")
+        st.dataframe(
+            pd.DataFrame({
+                'Etapa': ['\u2003' * etapa['nivel'] + etapa['etapa'] for etapa in registro['etapas']],
+                'Tempo (ms)': [round(etapa['tempo_ms'], 1) for etapa in registro['etapas']],
+                'Pico de memória do processo (MB)': [
+                    None if etapa['pico_memoria_mb'] is None else round(etapa['pico_memoria_mb'], 1)
+                    for etapa in registro['etapas']
+                ]
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+        cache = registro.get('cache_graficos')
+        if cache:
+            consultas = cache['acertos'] + cache['falhas']
+            taxa_acerto = cache['acertos'] / consultas if consultas else 0
+            st.caption(
+                f"Cache de gráficos: {cache['entradas']} entradas ({cache['tamanho_mb']:.1f} MB), "
+                f"{cache['acertos']} acertos e {cache['falhas']} falhas ({taxa_acerto:.0%}), "
+                f"{cache['removidos']} removidas e {cache['expirados']} expiradas"
+            )
+        if ARQUIVO_LOG_DESEMPENHO:
+            st.caption(f"Medições gravadas em {ARQUIVO_LOG_DESEMPENHO}")
+    
+    if relatorio_memoria is not None:
+        exibir_relatorio_memoria(relatorio_memoria)
+
+
+def exibir_relatorio_memoria(relatorio: pd.DataFrame) -> None:
+    """
+    Exibe na barra lateral a memória de cada coluna do DataFrame e a economia dos tipos compactos.
+    
+    Args:
+        relatorio: DataFrame retornado por calcular_relatorio_memoria
+    """
+    total = relatorio.iloc[-1]
+    with st.sidebar.expander("🧮 Memória dos dados", expanded=False):
+        st.caption(
+            f"{total['memoria_mb']:.1f} MB por processo "
+            f"({total['economia_mb']:.1f} MB, {total['economia_pct']:.0f}% a menos que com tipos de 64 bits)"
+            if COMPACTAR_NUMERICOS else
+            f"{total['memoria_mb']:.1f} MB por processo. "
+            "Com DASHBOARD_COMPACTAR_NUMERICOS=1, as colunas numéricas usam o menor tipo sem perda."
+        )
+        st.dataframe(
+            pd.DataFrame({
+                'Coluna': relatorio['coluna'],
+                'Tipo': relatorio['tipo'],
+                'Memória (MB)': relatorio['memoria_mb'].round(2),
+                'Economia (MB)': relatorio['economia_mb'].round(2),
+                'Economia (%)': relatorio['economia_pct'].round(0)
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
+
+
+def criar_opcao_quantis_aproximados() -> bool:
+    """
+    Cria na barra lateral a opção de usar quantis aproximados pelos esboços.
+    
+    Returns:
+        True se os quantis aproximados estiverem ativados
+    """
+    return st.sidebar.toggle(
+        "Percentis aproximados",
+        value=False,
+        help=(
+            f"Calcula mediana, percentis e box plot a partir de esboços pré-agregados "
+            f"(erro relativo máximo de {ERRO_RELATIVO_ESBOCO:.0%}), sem ordenar os salários filtrados."
+        )
+    )
+
+
+def exibir_erro_quantis(erros: Dict) -> None:
+    """
+    Exibe o erro medido dos quantis aproximados em relação aos valores exatos.
+    
+    Args:
+        erros: Dicionário retornado por medir_erro_quantis
+    """
+    st.caption(
+        f"Percentis aproximados (erro máximo {ERRO_RELATIVO_ESBOCO:.0%}) — erro medido: "
+        f"mediana {erros['salario_mediano']:.2f}%, "
+        f"P25 {erros['percentil_25']:.2f}%, "
+        f"P75 {erros['percentil_75']:.2f}%"
+    )
+
+
+def exibir_cabecalho() -> None:
+    """
+    Exibe o título e a descrição do dashboard.
+    """
+    st.title("📊 Dashboard de Análise de Salários na Área de Dados")
+    st.markdown(
+        "Explore os dados salariais na área de dados nos últimos anos. "
+        "Utilize os filtros à esquerda para refinar sua análise."
+    )
+
+
+def exibir_estatisticas_descritivas(estatisticas) -> None:
+    """
+    Exibe as estatísticas descritivas dos salários, formatadas como moeda.
+    
+    Args:
+        estatisticas: Series no formato de Series.describe
+    """
+    st.subheader("📊 Estatísticas Descritivas")
+    st.dataframe(
+        estatisticas.apply(lambda x: formatar_moeda(x) if isinstance(x, (int, float)) else x),
+        use_container_width=True
+    )
+
+
+def exibir_metricas(metricas: Dict) -> None:
+    """
+    Exibe as métricas principais do dashboard com layout melhorado.
+    
+    Args:
+        metricas: Dicionário com as métricas calculadas
+    """
+    st.subheader("📊 Métricas Principais")
+    
+    # Primeira linha - Métricas principais
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        delta_mediana = f"Mediana: {formatar_moeda(metricas['salario_mediano'])}" if metricas['salario_mediano'] > 0 else None
+        st.metric(
+            "Salário Médio",
+            formatar_moeda(metricas['salario_medio']),
+            delta=delta_mediana
+        )
+    
+    with col2:
+        variacao_texto = f"{metricas['variacao_ano_anterior']:+.1f}%"
+        st.metric(
+            "Salário Mediano",
+            formatar_moeda(metricas['salario_mediano']),
+            delta=variacao_texto if metricas['variacao_ano_anterior'] != 0 else None
+        )
+    
+    with col3:
+        faixa = f"{formatar_moeda(metricas['salario_minimo'])} - {formatar_moeda(metricas['salario_maximo'])}"
+        delta_faixa = f"P25-P75: {formatar_moeda(metricas['percentil_25'])} - {formatar_moeda(metricas['percentil_75'])}"
+        st.metric("Faixa Salarial", faixa, delta=delta_faixa)
+    
+    with col4:
+        st.metric(
+            "Total de Registros",
+            f"{metricas['total_registros']:,}",
+            delta=f"{metricas['numero_cargos_unicos']} cargos únicos"
+        )
+    
+    # Segunda linha - Estatísticas adicionais
+    col5, col6, col7, col8 = st.columns(4)
+    
+    with col5:
+        st.metric("Desvio Padrão", formatar_moeda(metricas['desvio_padrao']))
+    
+    with col6:
+        st.metric("Percentil 25", formatar_moeda(metricas['percentil_25']))
+    
+    with col7:
+        st.metric("Percentil 75", formatar_moeda(metricas['percentil_75']))
+    
+    with col8:
+        cargo_freq = metricas['cargo_mais_frequente'][:30] + "..." if len(metricas['cargo_mais_frequente']) > 30 else metricas['cargo_mais_frequente']
+        st.metric("Cargo Mais Frequente", cargo_freq)
+
+
+def exibir_insights(insights: List[str]) -> None:
+    """
+    Exibe os insights gerados automaticamente.
+    
+    Args:
+        insights: Lista de insights em formato de texto
+    """
+    st.subheader("💡 Insights Automáticos")
+    for insight in insights:
+        st.markdown(f"- {insight}")
+    st.markdown("---")
+
+
+def exibir_graficos(dataframe: pd.DataFrame, aba: str = "Visão Geral",
+                    cubo: Optional[pd.DataFrame] = None,
+                    esboco: Optional[pd.DataFrame] = None,
+                    chave_cache: Optional[str] = None,
+                    histograma: Optional[pd.DataFrame] = None,
+                    cubo_paises: Optional[pd.DataFrame] = None) -> None:
+    """
+    Exibe todos os gráficos do dashboard organizados por abas.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        aba: Nome da aba atual
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        esboco: Esboços de quantis já filtrados, para quantis aproximados (opcional)
+        chave_cache: Impressão dos filtros para o cache de gráficos entre sessões (opcional)
+        histograma: Histograma de salários já calculado (opcional)
+        cubo_paises: Cubo com cargo e residência para o mapa, se o cubo não
+            tiver a residência (opcional)
+    """
+    # Todos os contêineres são criados antes da construção, para que cada
+    # gráfico ocupe sua posição na página na ordem em que ficar pronto
+    if aba == "Visão Geral":
+        col_graf1, col_graf2 = st.columns(2)
+        col_graf3, col_graf4 = st.columns(2)
+        pedidos = [
+            criar_pedido_grafico(
+                col_graf1, criar_grafico_top_cargos, (dataframe, cubo),
+                "Nenhum dado para exibir no gráfico de cargos."
+            ),
+            criar_pedido_grafico(
+                col_graf2, criar_grafico_distribuicao_salarios, (dataframe, histograma),
+                "Nenhum dado para exibir no gráfico de distribuição."
+            ),
+            criar_pedido_grafico(
+                col_graf3, criar_grafico_tipos_trabalho, (dataframe, cubo),
+                "Nenhum dado para exibir no gráfico dos tipos de trabalho."
+            ),
+            criar_pedido_grafico(
+                col_graf4, criar_grafico_salario_por_pais,
+                (dataframe, cubo if cubo_paises is None else cubo_paises),
+                "Nenhum dado para exibir no gráfico de países."
+            )
+        ]
+    
+    elif aba == "Análises Comparativas":
+        # Tendência temporal em largura total, seguida dos gráficos lado a lado
+        espaco_tendencia = st.container()
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+        pedidos = [
+            criar_pedido_grafico(
+                espaco_tendencia, criar_grafico_tendencia_temporal, (dataframe, cubo, esboco),
+                "Selecione múltiplos anos nos filtros para visualizar a tendência temporal.",
+                exibir_vazio=st.info
+            ),
+            criar_pedido_grafico(
+                col1, criar_grafico_boxplot_senioridade, (dataframe, esboco),
+                "Nenhum dado para exibir no gráfico de box plot."
+            ),
+            criar_pedido_grafico(
+                col2, criar_grafico_salario_por_tipo_trabalho, (dataframe, cubo),
+                "Nenhum dado para exibir no gráfico de tipo de trabalho."
+            )
+        ]
+    
+    else:
+        return
+    
+    construir_graficos_em_paralelo(pedidos, chave_cache)
+
+
+def criar_controles_tabela(todas_colunas: List[str]) -> Dict:
+    """
+    Cria os controles da tabela detalhada: colunas, ordenação, busca e tamanho da página.
+    
+    Args:
+        todas_colunas: Colunas disponíveis
+        
+    Returns:
+        Dicionário com colunas, coluna_ordenacao, decrescente, busca,
+        tamanho_pagina e a coluna da interface reservada ao número da página
+    """
+    col_colunas, col_ordenacao, col_direcao = st.columns([3, 2, 1])
+    with col_colunas:
+        colunas = st.multiselect("Colunas", todas_colunas, default=todas_colunas, key='tabela_colunas')
+    with col_ordenacao:
+        coluna_ordenacao = st.selectbox(
+            "Ordenar por",
+            [None] + todas_colunas,
+            format_func=lambda coluna: "Ordem original" if coluna is None else coluna,
+            key='tabela_ordenacao'
+        )
+    with col_direcao:
+        decrescente = st.toggle("Decrescente", key='tabela_decrescente')
+    
+    col_busca, col_tamanho, col_pagina = st.columns([3, 1, 1])
+    with col_busca:
+        busca = st.text_input("Buscar cargo", key='tabela_busca').strip()
+    with col_tamanho:
+        tamanho_pagina = st.selectbox("Linhas por página", TAMANHOS_PAGINA_TABELA, key='tabela_tamanho_pagina')
+    
+    return {
+        'colunas': colunas,
+        'coluna_ordenacao': coluna_ordenacao,
+        'decrescente': decrescente,
+        'busca': busca,
+        'tamanho_pagina': tamanho_pagina,
+        'coluna_pagina': col_pagina
+    }
+
+
+def criar_seletor_pagina(controles: Dict, total_linhas: int) -> Tuple[int, int]:
+    """
+    Cria o seletor do número da página, limitado ao total de páginas.
+    
+    Args:
+        controles: Controles retornados por criar_controles_tabela
+        total_linhas: Número de linhas da tabela
+        
+    Returns:
+        Tupla (página selecionada, total de páginas)
+    """
+    total_paginas = max(1, -(-total_linhas // controles['tamanho_pagina']))
+    # Filtros ou busca mais restritivos podem deixar a página atual fora do intervalo
+    if st.session_state.get('tabela_pagina', 1) > total_paginas:
+        st.session_state['tabela_pagina'] = total_paginas
+    with controles['coluna_pagina']:
+        pagina = st.number_input("Página", min_value=1, max_value=total_paginas, step=1, key='tabela_pagina')
+    return pagina, total_paginas
+
+
+def exibir_pagina_tabela(pagina_dados: pd.DataFrame, controles: Dict, pagina: int,
+                         total_paginas: int, total_linhas: int) -> None:
+    """
+    Exibe a página da tabela e a legenda com o intervalo de linhas.
+    
+    Args:
+        pagina_dados: Linhas da página, apenas com as colunas escolhidas
+        controles: Controles retornados por criar_controles_tabela
+        pagina: Número da página
+        total_paginas: Total de páginas
+        total_linhas: Número de linhas da tabela
+    """
+    st.dataframe(pagina_dados, use_container_width=True)
+    tamanho_pagina = controles['tamanho_pagina']
+    inicio = (pagina - 1) * tamanho_pagina
+    st.caption(
+        f"Linhas {inicio + 1:,} a {min(inicio + tamanho_pagina, total_linhas):,} "
+        f"de {total_linhas:,} · página {pagina} de {total_paginas}"
+    )
+
+
+def exibir_tabela_dados(dataframe: pd.DataFrame, chave_cache: Optional[str] = None) -> None:
+    """
+    Exibe a tabela com os dados detalhados, paginada no servidor.
+    
+    Apenas a página visível, com as colunas escolhidas, é enviada ao
+    navegador. A ordenação de cada coluna é calculada uma vez por seleção de
+    filtros e guardada na sessão; a busca por cargo é aplicada sobre ela.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        chave_cache: Impressão dos filtros, para guardar as ordenações na sessão (opcional)
+    """
+    st.subheader("Dados Detalhados")
+    controles = criar_controles_tabela(list(dataframe.columns))
+    coluna_ordenacao = controles['coluna_ordenacao']
+    decrescente = controles['decrescente']
+    
+    if coluna_ordenacao is None:
+        posicoes = np.arange(len(dataframe))
+    else:
+        def ordenar():
+            return calcular_permutacao_ordenacao(dataframe, coluna_ordenacao, decrescente)
+        
+        if chave_cache is None:
+            posicoes = ordenar()
+        else:
+            posicoes = memorizar_na_sessao(
+                f"ordenacao_tabela:{coluna_ordenacao}:{decrescente}:{chave_cache}",
+                ordenar
+            )
+    if controles['busca']:
+        posicoes = posicoes[buscar_cargo(dataframe, controles['busca'])[posicoes]]
+    
+    total_linhas = len(posicoes)
+    pagina, total_paginas = criar_seletor_pagina(controles, total_linhas)
+    
+    if not controles['colunas']:
+        st.info("Selecione ao menos uma coluna para exibir a tabela.")
+        return
+    if total_linhas == 0:
+        st.info("Nenhum cargo encontrado com o texto buscado.")
+        return
+    
+    exibir_pagina_tabela(
+        selecionar_pagina(dataframe, posicoes, pagina, controles['tamanho_pagina'], controles['colunas']),
+        controles,
+        pagina,
+        total_paginas,
+        total_linhas
+    )
+
+
+def exibir_tabela_sql(caminho: Path, filtros: Dict, chave_cache: Optional[str] = None) -> None:
+    """
+    Exibe a tabela com os dados detalhados no modo SQL, paginada no banco.
+    
+    A contagem de linhas e cada página são consultadas no banco com os
+    filtros, a busca e a ordenação escolhidos; apenas a página visível chega
+    ao Python.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+        chave_cache: Impressão dos filtros, para guardar as contagens na sessão (opcional)
+    """
+    st.subheader("Dados Detalhados")
+    controles = criar_controles_tabela(listar_colunas_sql(caminho))
+    opcoes = listar_opcoes_filtro(obter_cubo_filtros_sql(caminho))
+    
+    def contar():
+        return contar_linhas_sql(caminho, filtros, controles['busca'], opcoes)
+    
+    if chave_cache is None:
+        total_linhas = contar()
+    else:
+        total_linhas = memorizar_na_sessao(f"contagem_tabela:{controles['busca']}:{chave_cache}", contar)
+    pagina, total_paginas = criar_seletor_pagina(controles, total_linhas)
+    
+    if not controles['colunas']:
+        st.info("Selecione ao menos uma coluna para exibir a tabela.")
+        return
+    if total_linhas == 0:
+        st.info("Nenhum cargo encontrado com o texto buscado.")
+        return
+    
+    pagina_dados = consultar_pagina_sql(
+        caminho,
+        filtros,
+        controles['colunas'],
+        pagina,
+        controles['tamanho_pagina'],
+        controles['coluna_ordenacao'],
+        controles['decrescente'],
+        controles['busca'],
+        opcoes
+    )
+    exibir_pagina_tabela(pagina_dados, controles, pagina, total_paginas, total_linhas)
@@ -0,0 +1,4395 @@
+"""
+Núcleo de cálculo do dashboard, sem dependência do Streamlit.
+
+Este módulo contém as constantes e as funções de processamento de dados,
+índices e agregados, cálculo de métricas, insights e construção de gráficos.
+Importa apenas pandas e NumPy (e o pyarrow, se instalado); o Plotly é
+carregado apenas na primeira construção de um gráfico. Pode ser usado por
+scripts em lote, testes e processos de trabalho sem o custo de importar a
+interface, que fica em common.py.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import gzip
+import functools
+import hashlib
+import importlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import tracemalloc
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from collections import OrderedDict
+from contextlib import closing, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pc = feather = pq = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if TYPE_CHECKING:
+    import plotly.express as px
+    import plotly.graph_objects as go
+    from plotly.graph_objects import Figure
+else:
+    # Módulos do Plotly, importados por carregar_plotly na primeira construção de gráfico
+    px = go = None
+    # Sem importar o Plotly, as anotações de figura se resolvem para Any em
+    # typing.get_type_hints; o verificador de tipos usa a classe do Plotly
+    Figure = Any
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+URL_DADOS = os.environ.get(
+    'DASHBOARD_URL_DADOS',
+    "https://raw.githubusercontent.com/guilhermeonrails/data-jobs/refs/heads/main/salaries.csv"
+)
+
+COLUNAS_TRADUZIDAS = {
+    'work_year': 'ano',
+    'experience_level': 'senioridade',
+    'employment_type': 'contrato',
+    'job_title': 'cargo',
+    'salary': 'salario',
+    'salary_currency': 'usd',
+    'salary_in_usd': 'salario_usd',
+    'employee_residence': 'residencia',
+    'remote_ratio': 'remota',
+    'company_location': 'empresa',
+    'company_size': 'tamanho_empresa'
+}
+
+TRADUCAO_SENIORIDADE = {
+    'EN': 'junior',
+    'MI': 'Pleno',
+    'SE': 'Senior',
+    'EX': 'executivo'
+}
+
+TRADUCAO_CONTRATO = {
+    'FT': 'Tempo Integral',
+    'PT': 'Meio Período',
+    'CT': 'Contrato',
+    'FL': 'Freelancer'
+}
+
+TRADUCAO_TAMANHO_EMPRESA = {
+    'S': 'Pequena',
+    'M': 'Média',
+    'L': 'Grande'
+}
+
+TRADUCAO_REMOTA = {
+    0: 'Presencial',
+    50: 'Híbrido',
+    100: 'Remoto'
+}
+
+TRADUCAO_CARGOS = {
+    'Data Scientist': 'Cientista de Dados',
+    'Data Engineer': 'Engenheiro de Dados',
+    'Data Analyst': 'Analista de Dados',
+    'Machine Learning Engineer': 'Engenheiro de Machine Learning',
+    'Research Scientist': 'Cientista de Pesquisa',
+    'Data Science Manager': 'Gerente de Ciência de Dados',
+    'Data Architect': 'Arquiteto de Dados',
+    'Analytics Engineer': 'Engenheiro de Analytics',
+    'Business Intelligence Developer': 'Desenvolvedor de Business Intelligence',
+    'Data Science Consultant': 'Consultor de Ciência de Dados',
+    'Head of Data': 'Diretor de Dados',
+    'Principal Data Scientist': 'Cientista de Dados Principal',
+    'Applied Scientist': 'Cientista Aplicado',
+    'Research Team Lead': 'Líder de Equipe de Pesquisa',
+    'Analytics Engineering Manager': 'Gerente de Engenharia de Analytics',
+    'Data Science Tech Lead': 'Líder Técnico de Ciência de Dados',
+    'Applied AI ML Lead': 'Líder de IA e ML Aplicados',
+    'Head of Applied AI': 'Diretor de IA Aplicada',
+    'Head of Machine Learning': 'Diretor de Machine Learning',
+    'Machine Learning Performance Engineer': 'Engenheiro de Performance de ML',
+    'Director of Product Management': 'Diretor de Gestão de Produtos',
+    'Engineering Manager': 'Gerente de Engenharia',
+    'AWS Data Architect': 'Arquiteto de Dados AWS'
+}
+
+# Tabela CSV opcional (colunas cargo e traducao) que complementa ou substitui
+# entradas de TRADUCAO_CARGOS sem alterar o código
+ARQUIVO_MAPA_CARGOS = os.environ.get('DASHBOARD_MAPA_CARGOS') or None
+
+# Abreviações expandidas na comparação de cargos ("ML Engineer" equivale a
+# "Machine Learning Engineer")
+ABREVIACOES_CARGOS = {
+    'ml': 'machine learning',
+    'ai': 'artificial intelligence',
+    'bi': 'business intelligence',
+    'sr': 'senior',
+    'jr': 'junior',
+    'mgr': 'manager',
+    'eng': 'engineer',
+    'dev': 'developer'
+}
+
+# Grafia dos termos usada ao padronizar cargos sem tradução
+GRAFIA_TERMOS_CARGOS = {
+    'ai': 'AI',
+    'ml': 'ML',
+    'bi': 'BI',
+    'nlp': 'NLP',
+    'etl': 'ETL',
+    'aws': 'AWS',
+    'mlops': 'MLOps',
+    '3d': '3D'
+}
+CONECTIVOS_CARGOS = {'of', 'and', 'in', 'for', 'de', 'da', 'do', 'e'}
+
+# Ordem lógica das categorias usada na ingestão categórica.
+# None indica ordem alfabética dos valores observados.
+ORDEM_SENIORIDADE = ['junior', 'Pleno', 'Senior', 'executivo']
+
+ORDEM_CATEGORIAS = {
+    'senioridade': ORDEM_SENIORIDADE,
+    'contrato': list(TRADUCAO_CONTRATO.values()),
+    'tamanho_empresa': list(TRADUCAO_TAMANHO_EMPRESA.values()),
+    'remota': list(TRADUCAO_REMOTA.values()),
+    'cargo': None,
+    'residencia': None,
+    'empresa': None
+}
+
+# Colunas indexadas para os filtros, por chave do dicionário de filtros
+COLUNAS_FILTRO = {
+    'anos': 'ano',
+    'senioridades': 'senioridade',
+    'contratos': 'contrato',
+    'tamanhos_empresa': 'tamanho_empresa',
+    'cargos': 'cargo'
+}
+
+# Fração máxima das linhas, multiplicada pelo número de dimensões alteradas,
+# no resultado anterior para refiná-lo ao estreitar a seleção; acima dela,
+# descompactar a máscara combinada do zero é mais rápido. Em 10 milhões de
+# linhas o refinamento empata com a combinação completa perto de 75% das
+# linhas com uma dimensão alterada e de 25% com duas
+FRACAO_MAXIMA_REFINAMENTO = 0.5
+
+# Fração máxima de posições em relação aos bits da máscara para testar o bit
+# de cada posição diretamente em selecionar_posicoes_bitset; acima dela,
+# descompactar a máscara inteira é mais rápido
+FRACAO_MAXIMA_TESTE_DIRETO = 0.05
+
+# Dimensões do cubo pré-agregado de salários
+DIMENSOES_CUBO = ['ano', 'senioridade', 'contrato', 'tamanho_empresa', 'cargo', 'remota', 'residencia']
+
+# Esboços de quantis por célula do cubo (baldes logarítmicos combináveis)
+ERRO_RELATIVO_ESBOCO = 0.01
+BALDE_ZERO = np.iinfo(np.int32).min
+
+# Cache em disco do DataFrame já processado (formato Arrow IPC, mapeável em memória)
+DIRETORIO_CACHE = Path(os.environ.get('DASHBOARD_DIRETORIO_CACHE', '.cache_dados'))
+PREFIXO_ARQUIVO_CACHE = 'dados_processados_'
+PREFIXO_CACHE_CUBO = 'cubo_'
+PREFIXO_CACHE_ESBOCOS = 'esbocos_'
+PREFIXO_ARMAZENAMENTO = 'armazenamento_'
+PREFIXO_FONTE_HTTP = 'fonte_'
+PREFIXO_ESTADO_INCREMENTAL = 'incremental_'
+# Linhas por bloco na ingestão em streaming (0 desativa e lê o arquivo inteiro)
+TAMANHO_BLOCO_INGESTAO = int(os.environ.get('DASHBOARD_TAMANHO_BLOCO', '0'))
+
+# Converte as colunas numéricas para o menor tipo sem perda (ano em int16,
+# salários em int32/float32) ao processar os dados
+COMPACTAR_NUMERICOS = os.environ.get('DASHBOARD_COMPACTAR_NUMERICOS', '0') == '1'
+# Tipos candidatos da compactação, do menor para o maior
+TIPOS_INTEIROS_COMPACTOS = [np.int8, np.int16, np.int32]
+TIPOS_REAIS_COMPACTOS = [np.float32]
+
+# Backend do leitor de CSV, do group_by das agregações e da máscara sem índice
+# ('pandas', 'pyarrow' ou 'polars'; sem o pacote, usa pandas)
+BACKEND_CALCULO = os.environ.get('DASHBOARD_BACKEND_CALCULO', 'pandas')
+# Armazenamento consultado pelo dashboard: 'memoria' (DataFrame do pandas) ou
+# 'sql' (banco SQLite em disco, com filtros e agregações executados em SQL)
+MODO_ARMAZENAMENTO = os.environ.get('DASHBOARD_MODO_ARMAZENAMENTO', 'memoria')
+PREFIXO_BANCO_SQL = 'banco_'
+# Tabelas do banco: linhas processadas e o cubo e os esboços calculados na carga
+TABELA_SQL = 'salarios'
+TABELA_CUBO_SQL = 'cubo'
+TABELA_ESBOCOS_SQL = 'esbocos'
+TAMANHO_BLOCO_SQL = 500_000
+# Chaves primárias (ordem física) das tabelas agregadas: consultas agrupadas
+# por um prefixo da chave são lidas em ordem, sem ordenação temporária
+CHAVE_CUBO_SQL = ['ano', 'senioridade', 'cargo', 'remota', 'residencia', 'contrato', 'tamanho_empresa']
+CHAVE_ESBOCOS_SQL = ['ano', 'senioridade', 'balde', 'contrato', 'tamanho_empresa', 'cargo']
+# Dimensões consultadas no modo SQL: cubo das métricas, insights e gráficos
+# (o mapa usa cargo e residência) e esboços das métricas, tendência e box plot
+DIMENSOES_CUBO_SQL = ['ano', 'senioridade', 'cargo', 'remota']
+DIMENSOES_CUBO_PAISES_SQL = ['cargo', 'residencia']
+DIMENSOES_ESBOCO_SQL = ['ano', 'senioridade']
+# Colunas indexadas na tabela de dados: o cargo, seletivo nos filtros, e o
+# balde, usado para achar os salários extremos (ver consultar_extremos_sql)
+COLUNAS_INDICE_SQL = ['cargo', 'balde']
+TAMANHO_LEITURA_HASH = 1024 * 1024
+TEMPO_LIMITE_DOWNLOAD = 60
+
+ASSINATURAS_FORMATO = {
+    b'\x1f\x8b': 'gzip',
+    b'\x28\xb5\x2f\xfd': 'zstd',
+    b'PAR1': 'parquet'
+}
+# Incrementar sempre que o pipeline de processar_dados mudar de comportamento
+VERSAO_PROCESSAMENTO = 3
+
+# Arquivo JSON Lines com as medições de cada execução (None desativa o log)
+ARQUIVO_LOG_DESEMPENHO = os.environ.get('DASHBOARD_LOG_DESEMPENHO') or None
+
+CARGO_DATA_SCIENTIST = 'Cientista de Dados'
+NUMERO_BINS_HISTOGRAMA = 30
+LIMITE_OUTLIERS_BOXPLOT = 200
+TOP_CARGOS_LIMITE = 10
+HOLE_PIZZA = 0.5
+
+# Métricas exibidas quando nenhum registro atende aos filtros
+METRICAS_VAZIAS = {
+    'salario_medio': 0,
+    'salario_mediano': 0,
+    'salario_minimo': 0,
+    'salario_maximo': 0,
+    'desvio_padrao': 0,
+    'percentil_25': 0,
+    'percentil_75': 0,
+    'total_registros': 0,
+    'cargo_mais_frequente': "",
+    'variacao_ano_anterior': 0,
+    'numero_cargos_unicos': 0
+}
+
+# ============================================================================
+# FUNÇÕES DE BACKEND DE CÁLCULO
+# ============================================================================
+# O DataFrame de trabalho é sempre do pandas. Um backend troca apenas três
+# operações: o leitor de CSV, o group_by de contagem/soma/m2 (cubo e médias
+# dos gráficos) e a máscara da filtragem sem índice, e devolve os resultados
+# como DataFrames do pandas. Transformação, índices e métricas rodam no pandas.
+
+
+def restaurar_tipos_grupos(agregado: pd.DataFrame, dataframe: pd.DataFrame,
+                           colunas: List[str]) -> pd.DataFrame:
+    """
+    Devolve às colunas de grupo de um agregado os tipos do DataFrame de origem.
+    
+    Args:
+        agregado: Resultado da agregação, com as colunas de grupo
+        dataframe: DataFrame agregado
+        colunas: Colunas de grupo
+        
+    Returns:
+        Agregado com as colunas de grupo no tipo original (inclusive categorias)
+    """
+    for coluna in colunas:
+        if agregado[coluna].dtype != dataframe[coluna].dtype:
+            agregado[coluna] = agregado[coluna].astype(dataframe[coluna].dtype)
+    return agregado
+
+
+def ler_csv_pandas(arquivo) -> pd.DataFrame:
+    """
+    Lê um CSV com o leitor padrão do pandas.
+    
+    Args:
+        arquivo: Caminho ou objeto de arquivo binário
+        
+    Returns:
+        DataFrame com os dados brutos
+    """
+    return pd.read_csv(arquivo)
+
+
+def agregar_grupos_pandas(dataframe: pd.DataFrame, colunas: List[str], coluna_valor: str) -> pd.DataFrame:
+    """
+    Calcula contagem, soma e m2 de uma coluna por grupo, com groupby do pandas.
+    
+    Args:
+        dataframe: DataFrame com os dados
+        colunas: Colunas de grupo
+        coluna_valor: Coluna numérica agregada
+        
+    Returns:
+        DataFrame com as colunas de grupo e contagem, soma e m2 (soma dos
+        quadrados dos desvios em relação à média do grupo)
+    """
+    agregado = (
+        dataframe
+        .groupby(colunas, observed=True, sort=False)[coluna_valor]
+        .agg(contagem='count', soma='sum', variancia='var')
+        .reset_index()
+    )
+    agregado['m2'] = (agregado.pop('variancia') * (agregado['contagem'] - 1)).fillna(0.0)
+    return agregado
+
+
+def filtrar_mascara_pandas(dataframe: pd.DataFrame, selecao: Dict[str, List]) -> np.ndarray:
+    """
+    Calcula a máscara das linhas cujos valores estão na seleção de cada coluna, com isin do pandas.
+    
+    Args:
+        dataframe: DataFrame a ser filtrado
+        selecao: Dicionário coluna -> valores aceitos
+        
+    Returns:
+        Máscara booleana com uma posição por linha
+    """
+    mascara = np.ones(len(dataframe), dtype=bool)
+    for coluna, valores in selecao.items():
+        mascara &= dataframe[coluna].isin(valores).to_numpy()
+    return mascara
+
+
+def ler_csv_pyarrow(arquivo) -> pd.DataFrame:
+    """
+    Lê um CSV com o leitor multi-thread do pyarrow, com os mesmos tipos do leitor padrão.
+    
+    Args:
+        arquivo: Caminho ou objeto de arquivo binário
+        
+    Returns:
+        DataFrame com os dados brutos
+    """
+    return pd.read_csv(arquivo, engine='pyarrow')
+
+
+def agregar_grupos_pyarrow(dataframe: pd.DataFrame, colunas: List[str], coluna_valor: str) -> pd.DataFrame:
+    """
+    Calcula contagem, soma e m2 por grupo com o group_by multi-thread do pyarrow.
+    
+    Colunas categóricas viram colunas de dicionário do Arrow sem decodificar
+    os valores, e voltam como categorias no resultado.
+    
+    Args:
+        dataframe: DataFrame com os dados
+        colunas: Colunas de grupo
+        coluna_valor: Coluna numérica agregada
+        
+    Returns:
+        DataFrame com as colunas de grupo e contagem, soma e m2 (soma dos
+        quadrados dos desvios em relação à média do grupo)
+    """
+    tabela = pa.Table.from_pandas(dataframe[colunas + [coluna_valor]], preserve_index=False)
+    
+    agregado = (
+        tabela
+        .group_by(colunas, use_threads=True)
+        .aggregate([
+            (coluna_valor, 'count'),
+            (coluna_valor, 'sum'),
+            (coluna_valor, 'variance', pc.VarianceOptions(ddof=0))
+        ])
+        .to_pandas()
+        .rename(columns={
+            f'{coluna_valor}_count': 'contagem',
+            f'{coluna_valor}_sum': 'soma'
+        })
+    )
+    agregado['m2'] = (agregado.pop(f'{coluna_valor}_variance') * agregado['contagem']).fillna(0.0)
+    # Como no groupby do pandas, grupos com chave ausente são descartados
+    agregado = agregado.dropna(subset=colunas)[colunas + ['contagem', 'soma', 'm2']]
+    return restaurar_tipos_grupos(agregado.reset_index(drop=True), dataframe, colunas)
+
+
+def ler_csv_polars(arquivo) -> pd.DataFrame:
+    """
+    Lê um CSV com o leitor multi-thread do Polars.
+    
+    A conversão passa pelo Arrow, para que as colunas de texto tenham o
+    mesmo tipo do leitor padrão do pandas.
+    
+    Args:
+        arquivo: Caminho ou objeto de arquivo binário
+        
+    Returns:
+        DataFrame com os dados brutos
+    """
+    return pl.read_csv(arquivo).to_arrow().to_pandas()
+
+
+def agregar_grupos_polars(dataframe: pd.DataFrame, colunas: List[str], coluna_valor: str) -> pd.DataFrame:
+    """
+    Calcula contagem, soma e m2 por grupo com o group_by multi-thread do Polars.
+    
+    Args:
+        dataframe: DataFrame com os dados
+        colunas: Colunas de grupo
+        coluna_valor: Coluna numérica agregada
+        
+    Returns:
+        DataFrame com as colunas de grupo e contagem, soma e m2 (soma dos
+        quadrados dos desvios em relação à média do grupo)
+    """
+    agregado = (
+        pl.from_pandas(dataframe[colunas + [coluna_valor]])
+        .group_by(colunas)
+        .agg(
+            pl.col(coluna_valor).count().alias('contagem'),
+            pl.col(coluna_valor).sum().alias('soma'),
+            (pl.col(coluna_valor).var(ddof=0) * pl.col(coluna_valor).count()).fill_null(0.0).alias('m2')
+        )
+        .drop_nulls(colunas)
+        .to_pandas()
+    )
+    agregado['contagem'] = agregado['contagem'].astype('int64')
+    return restaurar_tipos_grupos(agregado, dataframe, colunas)
+
+
+def filtrar_mascara_polars(dataframe: pd.DataFrame, selecao: Dict[str, List]) -> np.ndarray:
+    """
+    Calcula a máscara das linhas cujos valores estão na seleção de cada coluna, com is_in do Polars.
+    
+    Args:
+        dataframe: DataFrame a ser filtrado
+        selecao: Dicionário coluna -> valores aceitos
+        
+    Returns:
+        Máscara booleana com uma posição por linha
+    """
+    if not selecao:
+        return np.ones(len(dataframe), dtype=bool)
+    
+    return (
+        pl.from_pandas(dataframe[list(selecao)])
+        .select(pl.all_horizontal([pl.col(coluna).is_in(list(valores)) for coluna, valores in selecao.items()]))
+        .to_series()
+        .fill_null(False)
+        .to_numpy()
+    )
+
+
+# Operações de cada backend; 'modulo' é None quando o pacote não está instalado.
+# O pyarrow usa a máscara do pandas: converter as colunas para o Arrow a cada
+# filtragem custa mais que o isin do pandas sobre os códigos das categorias.
+BACKENDS_CALCULO = {
+    'pandas': {
+        'modulo': pd,
+        'ler_csv': ler_csv_pandas,
+        'agregar_grupos': agregar_grupos_pandas,
+        'filtrar_mascara': filtrar_mascara_pandas
+    },
+    'pyarrow': {
+        'modulo': pc,
+        'ler_csv': ler_csv_pyarrow,
+        'agregar_grupos': agregar_grupos_pyarrow,
+        'filtrar_mascara': filtrar_mascara_pandas
+    },
+    'polars': {
+        'modulo': pl,
+        'ler_csv': ler_csv_polars,
+        'agregar_grupos': agregar_grupos_polars,
+        'filtrar_mascara': filtrar_mascara_polars
+    }
+}
+
+
+def listar_backends_disponiveis() -> List[str]:
+    """
+    Lista os backends de cálculo cujos pacotes estão instalados.
+    
+    Returns:
+        Nomes dos backends disponíveis, começando pelo pandas
+    """
+    return [nome for nome, backend in BACKENDS_CALCULO.items() if backend['modulo'] is not None]
+
+
+def obter_backend(nome: Optional[str] = None) -> Dict:
+    """
+    Retorna as operações do backend de cálculo configurado.
+    
+    Se o pacote do backend não estiver instalado, as operações do pandas são
+    usadas, como nas demais dependências opcionais.
+    
+    Args:
+        nome: Nome do backend (se None, usa BACKEND_CALCULO)
+        
+    Returns:
+        Dicionário com as operações ler_csv, agregar_grupos e filtrar_mascara
+        
+    Raises:
+        ValueError: Se o backend não existir
+    """
+    nome = nome or BACKEND_CALCULO
+    if nome not in BACKENDS_CALCULO:
+        raise ValueError(f"Backend de cálculo desconhecido: {nome} (opções: {', '.join(BACKENDS_CALCULO)})")
+    backend = BACKENDS_CALCULO[nome]
+    return backend if backend['modulo'] is not None else BACKENDS_CALCULO['pandas']
+
+
+# ============================================================================
+# FUNÇÕES DE PROCESSAMENTO DE DADOS
+# ============================================================================
+
+
+def carregar_dados(url: str) -> pd.DataFrame:
+    """
+    Carrega os dados brutos a partir de uma URL ou caminho local.
+    
+    Args:
+        url: URL ou caminho local do arquivo (CSV, CSV comprimido ou Parquet)
+        
+    Returns:
+        DataFrame com os dados carregados
+        
+    Raises:
+        Exception: Se houver erro ao carregar os dados
+    """
+    return ler_fonte(resolver_fonte(url))
+
+
+def traduzir_colunas(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Traduz os nomes das colunas do DataFrame para português.
+    
+    Args:
+        dataframe: DataFrame original com colunas em inglês
+        
+    Returns:
+        DataFrame com colunas traduzidas
+    """
+    return dataframe.rename(columns=COLUNAS_TRADUZIDAS)
+
+
+def carregar_mapa_cargos(caminho: Optional[str] = ARQUIVO_MAPA_CARGOS) -> Dict[str, str]:
+    """
+    Monta a tabela de tradução de cargos, incluindo a tabela externa se houver.
+    
+    Args:
+        caminho: Arquivo CSV com as colunas cargo e traducao (opcional); suas
+            entradas prevalecem sobre TRADUCAO_CARGOS
+            
+    Returns:
+        Dicionário cargo original -> cargo traduzido
+    """
+    mapa = dict(TRADUCAO_CARGOS)
+    if caminho:
+        tabela = pd.read_csv(caminho, usecols=['cargo', 'traducao'], dtype=str).dropna()
+        mapa.update(zip(tabela['cargo'], tabela['traducao']))
+    return mapa
+
+
+def normalizar_cargo(cargo: str) -> str:
+    """
+    Calcula a forma de comparação de um cargo.
+    
+    Ignora maiúsculas, pontuação e espaços repetidos e expande as abreviações
+    de ABREVIACOES_CARGOS, de modo que variantes do mesmo cargo tenham a
+    mesma forma.
+    
+    Args:
+        cargo: Nome do cargo
+        
+    Returns:
+        Cargo normalizado, em minúsculas
+    """
+    termos = re.sub(r'[^\w+#]+', ' ', cargo.lower()).split()
+    return ' '.join(ABREVIACOES_CARGOS.get(termo, termo) for termo in termos)
+
+
+def padronizar_grafia_cargo(cargo: str) -> str:
+    """
+    Padroniza espaços e maiúsculas de um cargo sem tradução.
+    
+    Termos em minúsculas recebem inicial maiúscula (exceto conectivos) e
+    siglas conhecidas seguem GRAFIA_TERMOS_CARGOS; termos com maiúsculas e
+    minúsculas misturadas são mantidos. Cargos inteiramente em maiúsculas são
+    tratados como se estivessem em minúsculas.
+    
+    Args:
+        cargo: Nome do cargo
+        
+    Returns:
+        Cargo com grafia padronizada
+    """
+    if cargo.isupper():
+        cargo = cargo.lower()
+    
+    termos = []
+    for posicao, termo in enumerate(cargo.split()):
+        minusculo = termo.lower()
+        if minusculo in GRAFIA_TERMOS_CARGOS:
+            termos.append(GRAFIA_TERMOS_CARGOS[minusculo])
+        elif not termo.islower():
+            termos.append(termo)
+        elif posicao > 0 and termo in CONECTIVOS_CARGOS:
+            termos.append(termo)
+        else:
+            termos.append(termo.capitalize())
+    return ' '.join(termos)
+
+
+def construir_mapa_cargos_normalizado(mapa: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Indexa a tabela de tradução de cargos pela forma normalizada.
+    
+    Args:
+        mapa: Dicionário cargo original -> cargo traduzido (se None, usa
+            carregar_mapa_cargos)
+            
+    Returns:
+        Dicionário cargo normalizado -> cargo traduzido
+    """
+    if mapa is None:
+        mapa = carregar_mapa_cargos()
+    return {normalizar_cargo(cargo): traducao for cargo, traducao in mapa.items()}
+
+
+def traduzir_cargos_comuns(cargo: str, mapa_normalizado: Optional[Dict[str, str]] = None) -> str:
+    """
+    Traduz os cargos mais comuns para português.
+    
+    Variantes de maiúsculas, espaços e abreviações de um cargo conhecido
+    recebem a mesma tradução; os demais cargos têm apenas a grafia padronizada.
+    
+    Args:
+        cargo: Nome do cargo em inglês
+        mapa_normalizado: Resultado de construir_mapa_cargos_normalizado (opcional)
+        
+    Returns:
+        Nome do cargo traduzido ou com grafia padronizada se não houver tradução
+    """
+    if mapa_normalizado is None:
+        mapa_normalizado = construir_mapa_cargos_normalizado()
+    return mapa_normalizado.get(normalizar_cargo(cargo)) or padronizar_grafia_cargo(cargo)
+
+
+def traduzir_cargos(serie: pd.Series) -> pd.Series:
+    """
+    Traduz uma coluna de cargos processando apenas os valores distintos.
+    
+    Cada cargo distinto é traduzido uma única vez e o resultado é propagado
+    para as linhas pelos códigos de pd.factorize (ou pelos códigos das
+    categorias, se a coluna já for categórica, como em fontes Parquet). O
+    resultado usa o tipo dos valores, nunca o categórico de origem, cujas
+    categorias não contêm as traduções.
+    
+    Args:
+        serie: Coluna de cargos em inglês
+        
+    Returns:
+        Coluna de cargos traduzidos, com o mesmo índice
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos, cargos = serie.cat.codes.to_numpy(), serie.cat.categories
+    else:
+        codigos, cargos = pd.factorize(serie)
+    mapa_normalizado = construir_mapa_cargos_normalizado()
+    traduzidos = [traduzir_cargos_comuns(str(cargo), mapa_normalizado) for cargo in cargos]
+    
+    # Com allow_fill, o código -1 (valor ausente) vira valor ausente
+    valores = pd.array(traduzidos, dtype=cargos.dtype).take(codigos, allow_fill=True)
+    return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def decodificar_categorias(serie: pd.Series) -> pd.Series:
+    """
+    Converte uma coluna categórica para o tipo dos seus valores.
+    
+    Colunas lidas de Parquet podem chegar categóricas, e substituir valores
+    por traduções fora das categorias falharia. Outras colunas são
+    devolvidas sem alteração.
+    
+    Args:
+        serie: Coluna da fonte
+        
+    Returns:
+        Coluna com os mesmos valores, sem o tipo categórico
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    valores = serie.cat.categories.array.take(serie.cat.codes.to_numpy(), allow_fill=True)
+    return pd.Series(valores, index=serie.index, name=serie.name)
+
+
+def traduzir_valores(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Traduz os valores das colunas categóricas para português.
+    
+    Args:
+        dataframe: DataFrame com colunas já traduzidas
+        
+    Returns:
+        DataFrame com valores traduzidos
+    """
+    df_traduzido = dataframe.copy()
+    
+    df_traduzido['senioridade'] = decodificar_categorias(df_traduzido['senioridade']).replace(TRADUCAO_SENIORIDADE)
+    df_traduzido['contrato'] = decodificar_categorias(df_traduzido['contrato']).replace(TRADUCAO_CONTRATO)
+    df_traduzido['tamanho_empresa'] = decodificar_categorias(df_traduzido['tamanho_empresa']).replace(TRADUCAO_TAMANHO_EMPRESA)
+    df_traduzido['remota'] = decodificar_categorias(df_traduzido['remota']).replace(TRADUCAO_REMOTA)
+    df_traduzido['cargo'] = traduzir_cargos(df_traduzido['cargo'])
+    
+    return df_traduzido
+
+
+def converter_para_categorias(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte as colunas de dimensão para o tipo categórico do pandas.
+    
+    As categorias seguem a ordem definida em ORDEM_CATEGORIAS (valores fora
+    dessa ordem são acrescentados ao final em ordem alfabética), de forma que
+    filtros e agrupamentos operem sobre códigos inteiros em vez de strings.
+    
+    Args:
+        dataframe: DataFrame com valores já traduzidos
+        
+    Returns:
+        DataFrame com as colunas de dimensão categóricas
+    """
+    df_categorico = dataframe.copy(deep=False)
+    
+    for coluna, ordem in ORDEM_CATEGORIAS.items():
+        if coluna not in df_categorico.columns:
+            continue
+        
+        # Fatorar uma única vez e traduzir apenas os valores distintos para códigos
+        codigos, valores = pd.factorize(df_categorico[coluna])
+        ordem = list(ordem or [])
+        conhecidos = set(ordem)
+        extras = sorted((valor for valor in valores if valor not in conhecidos), key=str)
+        categorias = pd.Index(ordem + extras)
+        
+        mapa_codigos = np.append(categorias.get_indexer(valores), -1)
+        df_categorico[coluna] = pd.Categorical.from_codes(
+            mapa_codigos[codigos],
+            categories=categorias,
+            ordered=bool(ordem)
+        )
+    
+    return df_categorico
+
+
+def escolher_tipo_compacto(serie: pd.Series) -> Optional[np.dtype]:
+    """
+    Escolhe o menor tipo numérico que representa a coluna sem perda.
+    
+    Inteiros usam o menor inteiro cujo intervalo contém os valores. Reais
+    com apenas valores inteiros podem virar inteiros; os demais usam float32
+    se todos os valores sobreviverem à ida e volta. Cada candidato é
+    validado convertendo e comparando com os valores originais, o que
+    descarta estouro de intervalo e perda de precisão.
+    
+    Args:
+        serie: Coluna numérica (inteira ou real, sem valores ausentes)
+        
+    Returns:
+        Tipo compacto ou None se nenhum tipo menor for seguro
+    """
+    valores = serie.to_numpy()
+    if len(valores) == 0:
+        return None
+    
+    if np.issubdtype(valores.dtype, np.integer):
+        candidatos = TIPOS_INTEIROS_COMPACTOS
+    elif np.issubdtype(valores.dtype, np.floating):
+        if not np.isfinite(valores).all():
+            return None
+        candidatos = TIPOS_INTEIROS_COMPACTOS + TIPOS_REAIS_COMPACTOS
+    else:
+        return None
+    
+    minimo, maximo = valores.min(), valores.max()
+    for tipo in candidatos:
+        tipo = np.dtype(tipo)
+        if tipo.itemsize >= valores.dtype.itemsize:
+            break
+        # Fora do intervalo a conversão de reais para inteiros não é definida
+        limites = np.iinfo(tipo) if tipo.kind == 'i' else np.finfo(tipo)
+        if minimo < limites.min or maximo > limites.max:
+            continue
+        if np.array_equal(valores.astype(tipo).astype(valores.dtype), valores):
+            return tipo
+    return None
+
+
+def compactar_tipos_numericos(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converte cada coluna numérica para o menor tipo sem perda (ver escolher_tipo_compacto).
+    
+    Colunas booleanas e categóricas não são alteradas. Os valores continuam
+    idênticos; métricas e agregações são calculadas sobre os mesmos números.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        DataFrame com as colunas numéricas compactadas
+    """
+    df_compacto = dataframe.copy(deep=False)
+    for coluna in df_compacto.columns:
+        serie = df_compacto[coluna]
+        if isinstance(serie.dtype, np.dtype) and serie.dtype.kind in 'iuf':
+            tipo = escolher_tipo_compacto(serie)
+            if tipo is not None:
+                df_compacto[coluna] = serie.astype(tipo)
+    return df_compacto
+
+
+def calcular_relatorio_memoria(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calcula a memória de cada coluna e a economia em relação a tipos de 64 bits.
+    
+    A referência de cada coluna numérica é o tipo de 64 bits do mesmo tipo
+    (int64 ou float64), em que o pandas carrega os dados sem compactação; as
+    demais colunas têm a própria memória como referência.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        DataFrame com coluna, tipo, memoria_mb, memoria_64_bits_mb,
+        economia_mb e economia_pct, uma linha por coluna e uma linha de total
+    """
+    memoria = dataframe.memory_usage(index=False, deep=True)
+    linhas = []
+    for coluna in dataframe.columns:
+        tipo = dataframe[coluna].dtype
+        bytes_atuais = int(memoria[coluna])
+        if isinstance(tipo, np.dtype) and tipo.kind in 'iuf':
+            bytes_64_bits = len(dataframe) * 8
+        else:
+            bytes_64_bits = bytes_atuais
+        linhas.append({
+            'coluna': coluna,
+            'tipo': str(tipo),
+            'memoria_mb': bytes_atuais / (1024 * 1024),
+            'memoria_64_bits_mb': bytes_64_bits / (1024 * 1024)
+        })
+    
+    relatorio = pd.DataFrame(linhas, columns=['coluna', 'tipo', 'memoria_mb', 'memoria_64_bits_mb'])
+    total = relatorio[['memoria_mb', 'memoria_64_bits_mb']].sum()
+    relatorio.loc[len(relatorio)] = {'coluna': 'total', 'tipo': '', **total}
+    relatorio['economia_mb'] = relatorio['memoria_64_bits_mb'] - relatorio['memoria_mb']
+    relatorio['economia_pct'] = (
+        relatorio['economia_mb'] / relatorio['memoria_64_bits_mb'].where(relatorio['memoria_64_bits_mb'] > 0) * 100
+    ).fillna(0.0)
+    return relatorio
+
+
+def obter_opcoes_filtro(serie: pd.Series) -> List:
+    """
+    Retorna os valores distintos de uma coluna, na ordem usada pelos filtros.
+    
+    Para colunas categóricas a ordem das categorias é preservada e apenas os
+    códigos presentes são considerados; para as demais, os valores são ordenados.
+    
+    Args:
+        serie: Coluna do DataFrame
+        
+    Returns:
+        Lista com os valores distintos
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = np.unique(serie.cat.codes.to_numpy())
+        codigos = codigos[codigos >= 0]
+        return serie.cat.categories[codigos].tolist()
+    return sorted(serie.unique())
+
+
+def abrir_fonte(url: str):
+    """
+    Abre a fonte de dados (URL ou caminho local) como um arquivo binário.
+    
+    Os bytes são devolvidos como estão, sem descompressão, o que basta para
+    calcular o hash da fonte.
+    
+    Args:
+        url: URL ou caminho local do arquivo
+        
+    Returns:
+        Objeto de arquivo binário, para uso com with
+    """
+    if os.path.exists(url):
+        return open(url, 'rb')
+    return urllib.request.urlopen(url, timeout=TEMPO_LIMITE_DOWNLOAD)
+
+
+def eh_fonte_http(url: str) -> bool:
+    """
+    Verifica se a fonte de dados é uma URL HTTP(S).
+    
+    Args:
+        url: URL ou caminho local do arquivo
+        
+    Returns:
+        True se a fonte deve ser baixada via HTTP
+    """
+    return str(url).lower().startswith(('http://', 'https://'))
+
+
+def obter_caminho_fonte_http(url: str) -> Path:
+    """
+    Retorna o caminho da cópia local de uma fonte HTTP.
+    
+    O nome preserva a extensão da URL (por exemplo .csv.gz) para facilitar a
+    inspeção do diretório de cache.
+    
+    Args:
+        url: URL da fonte de dados
+        
+    Returns:
+        Caminho do arquivo baixado no diretório de cache
+    """
+    hash_url = hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]
+    caminho_url = urllib.parse.urlparse(url).path
+    extensao = ''.join(Path(caminho_url).suffixes[-2:])
+    return DIRETORIO_CACHE / f"{PREFIXO_FONTE_HTTP}{hash_url}{extensao}"
+
+
+def baixar_fonte_http(url: str, tempo_limite: int = TEMPO_LIMITE_DOWNLOAD) -> Path:
+    """
+    Baixa uma fonte HTTP para o diretório de cache com revalidação condicional.
+    
+    O ETag e o Last-Modified da última resposta ficam em um arquivo .json ao
+    lado da cópia local e são enviados como If-None-Match e If-Modified-Since.
+    Se o servidor responder 304, a cópia local é reaproveitada sem nova
+    transferência. Se a revalidação falhar (servidor fora do ar, sem rede ou
+    qualquer outro código de erro HTTP), a cópia local também é usada,
+    quando existir.
+    
+    Args:
+        url: URL da fonte de dados
+        tempo_limite: Tempo limite da requisição em segundos
+        
+    Returns:
+        Caminho da cópia local atualizada
+        
+    Raises:
+        urllib.error.URLError: Se a requisição falhar e não houver cópia local
+    """
+    caminho = obter_caminho_fonte_http(url)
+    caminho_metadados = caminho.with_name(caminho.name + '.json')
+    caminho_temporario = caminho.with_name(caminho.name + '.tmp')
+    
+    metadados = {}
+    if caminho.exists() and caminho_metadados.exists():
+        try:
+            metadados = json.loads(caminho_metadados.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            metadados = {}
+    
+    cabecalhos = {}
+    if metadados.get('url') == url:
+        if metadados.get('etag'):
+            cabecalhos['If-None-Match'] = metadados['etag']
+        if metadados.get('last_modified'):
+            cabecalhos['If-Modified-Since'] = metadados['last_modified']
+    
+    requisicao = urllib.request.Request(url, headers=cabecalhos)
+    try:
+        resposta = urllib.request.urlopen(requisicao, timeout=tempo_limite)
+    except urllib.error.HTTPError as e:
+        # 304: cópia atual; demais códigos (404, 500, 503...): cópia anterior, se houver
+        if (e.code == 304 and cabecalhos) or caminho.exists():
+            return caminho
+        raise
+    except (urllib.error.URLError, OSError):
+        if caminho.exists():
+            return caminho
+        raise
+    
+    try:
+        DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+        with resposta, open(caminho_temporario, 'wb') as arquivo:
+            for parte in iter(lambda: resposta.read(TAMANHO_LEITURA_HASH), b''):
+                arquivo.write(parte)
+        os.replace(caminho_temporario, caminho)
+    finally:
+        caminho_temporario.unlink(missing_ok=True)
+    
+    metadados = {
+        'url': url,
+        'etag': resposta.headers.get('ETag'),
+        'last_modified': resposta.headers.get('Last-Modified')
+    }
+    try:
+        caminho_metadados.write_text(json.dumps(metadados), encoding='utf-8')
+    except OSError:
+        # Sem metadados a próxima requisição apenas deixa de ser condicional
+        pass
+    return caminho
+
+
+def resolver_fonte(url: str) -> str:
+    """
+    Resolve a fonte de dados para um caminho local legível.
+    
+    Caminhos locais são usados diretamente; URLs HTTP(S) são baixadas (ou
+    revalidadas) por baixar_fonte_http.
+    
+    Args:
+        url: URL ou caminho local do arquivo
+        
+    Returns:
+        Caminho local do arquivo de origem
+        
+    Raises:
+        FileNotFoundError: Se o caminho local não existir
+    """
+    if not eh_fonte_http(url):
+        if not os.path.exists(url):
+            raise FileNotFoundError(f"arquivo não encontrado: {url}")
+        return str(url)
+    
+    return str(baixar_fonte_http(url))
+
+
+def detectar_formato_fonte(caminho: str) -> str:
+    """
+    Detecta o formato de um arquivo local pelos primeiros bytes.
+    
+    Args:
+        caminho: Caminho local do arquivo
+        
+    Returns:
+        'gzip', 'zstd', 'parquet' ou 'csv'
+    """
+    with open(caminho, 'rb') as arquivo:
+        cabecalho = arquivo.read(4)
+    for assinatura, formato in ASSINATURAS_FORMATO.items():
+        if cabecalho.startswith(assinatura):
+            return formato
+    return 'csv'
+
+
+def abrir_csv_fonte(caminho: str):
+    """
+    Abre um CSV local, descomprimindo gzip ou zstd de forma transparente.
+    
+    Args:
+        caminho: Caminho local do arquivo CSV (comprimido ou não)
+        
+    Returns:
+        Objeto de arquivo binário com o CSV descomprimido, para uso com with
+        
+    Raises:
+        ImportError: Se o arquivo for zstd e o pacote zstandard não estiver instalado
+    """
+    formato = detectar_formato_fonte(caminho)
+    if formato == 'gzip':
+        return gzip.open(caminho, 'rb')
+    if formato == 'zstd':
+        if zstandard is None:
+            raise ImportError("O pacote zstandard é necessário para ler arquivos .zst")
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(caminho, 'rb'), read_across_frames=True, closefd=True
+        )
+    return open(caminho, 'rb')
+
+
+def ler_fonte(caminho: str) -> pd.DataFrame:
+    """
+    Lê um arquivo local de origem (CSV, CSV comprimido ou Parquet).
+    
+    Args:
+        caminho: Caminho local do arquivo
+        
+    Returns:
+        DataFrame com os dados brutos
+    """
+    if detectar_formato_fonte(caminho) == 'parquet':
+        return pd.read_parquet(caminho)
+    with abrir_csv_fonte(caminho) as arquivo:
+        return obter_backend()['ler_csv'](arquivo)
+
+
+def ler_fonte_em_blocos(caminho: str, tamanho_bloco: int):
+    """
+    Lê um arquivo local de origem em blocos de linhas.
+    
+    Args:
+        caminho: Caminho local do arquivo (CSV, CSV comprimido ou Parquet)
+        tamanho_bloco: Número de linhas por bloco
+        
+    Yields:
+        DataFrames com até tamanho_bloco linhas
+    """
+    if detectar_formato_fonte(caminho) == 'parquet':
+        arquivo_parquet = pq.ParquetFile(caminho)
+        for lote in arquivo_parquet.iter_batches(batch_size=tamanho_bloco):
+            yield lote.to_pandas()
+        return
+    
+    with abrir_csv_fonte(caminho) as arquivo:
+        yield from pd.read_csv(arquivo, chunksize=tamanho_bloco)
+
+
+def calcular_hash_fonte(url: str) -> str:
+    """
+    Calcula o hash SHA-256 da fonte de dados lendo-a em partes, sem carregá-la inteira.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        
+    Returns:
+        Hash SHA-256 em hexadecimal
+    """
+    hash_fonte = hashlib.sha256()
+    with abrir_fonte(url) as arquivo:
+        for parte in iter(lambda: arquivo.read(TAMANHO_LEITURA_HASH), b''):
+            hash_fonte.update(parte)
+    return hash_fonte.hexdigest()
+
+
+def calcular_chave_cache(hash_fonte: str, opcoes: Optional[Dict] = None) -> str:
+    """
+    Calcula a chave do cache em disco a partir do hash da fonte e das tabelas de tradução.
+    
+    Qualquer alteração no arquivo de origem, nas traduções, nas opções de
+    ingestão ou na versão do pipeline gera uma chave diferente e invalida o
+    cache anterior.
+    
+    Args:
+        hash_fonte: Hash SHA-256 (hexadecimal) dos bytes do arquivo de origem
+        opcoes: Opções de ingestão que alteram o resultado (opcional)
+        
+    Returns:
+        Hash SHA-256 em hexadecimal
+    """
+    tabelas_traducao = {
+        'versao': VERSAO_PROCESSAMENTO,
+        'colunas': COLUNAS_TRADUZIDAS,
+        'senioridade': TRADUCAO_SENIORIDADE,
+        'contrato': TRADUCAO_CONTRATO,
+        'tamanho_empresa': TRADUCAO_TAMANHO_EMPRESA,
+        'remota': TRADUCAO_REMOTA,
+        'cargos': carregar_mapa_cargos(),
+        'abreviacoes_cargos': ABREVIACOES_CARGOS,
+        'grafia_cargos': GRAFIA_TERMOS_CARGOS,
+        'ordem_categorias': ORDEM_CATEGORIAS,
+        'opcoes': opcoes or {}
+    }
+    
+    hash_cache = hashlib.sha256(hash_fonte.encode('ascii'))
+    hash_cache.update(json.dumps(tabelas_traducao, sort_keys=True, ensure_ascii=False).encode('utf-8'))
+    return hash_cache.hexdigest()
+
+
+def obter_caminho_cache(chave: str, prefixo: str = PREFIXO_ARQUIVO_CACHE) -> Path:
+    """
+    Retorna o caminho do arquivo de cache correspondente a uma chave.
+    
+    Args:
+        chave: Chave calculada por calcular_chave_cache
+        prefixo: Prefixo do tipo de arquivo (dados, cubo, esboços)
+        
+    Returns:
+        Caminho do arquivo Arrow no diretório de cache
+    """
+    return DIRETORIO_CACHE / f"{prefixo}{chave}.arrow"
+
+
+def carregar_cache_processado(chave: str, prefixo: str = PREFIXO_ARQUIVO_CACHE) -> Optional[pd.DataFrame]:
+    """
+    Carrega o DataFrame processado do cache em disco, mapeando o arquivo em memória.
+    
+    Args:
+        chave: Chave calculada por calcular_chave_cache
+        prefixo: Prefixo do tipo de arquivo (dados, cubo, esboços)
+        
+    Returns:
+        DataFrame processado ou None se não houver cache válido
+    """
+    caminho = obter_caminho_cache(chave, prefixo)
+    if feather is None or not caminho.exists():
+        return None
+    
+    try:
+        tabela = feather.read_table(caminho, memory_map=True)
+        return tabela.to_pandas(split_blocks=True)
+    except (OSError, ValueError):
+        # Arquivo corrompido ou incompatível: será regenerado
+        return None
+
+
+def salvar_cache_processado(dataframe: pd.DataFrame, chave: str,
+                            prefixo: str = PREFIXO_ARQUIVO_CACHE) -> None:
+    """
+    Grava o DataFrame processado no cache em disco e remove versões antigas.
+    
+    O arquivo é gravado sem compressão para permitir o mapeamento em memória
+    na leitura, e a escrita é atômica (arquivo temporário + rename).
+    
+    Args:
+        dataframe: DataFrame já processado
+        chave: Chave calculada por calcular_chave_cache
+        prefixo: Prefixo do tipo de arquivo (dados, cubo, esboços)
+    """
+    if feather is None:
+        return
+    
+    caminho = obter_caminho_cache(chave, prefixo)
+    caminho_temporario = caminho.with_suffix('.tmp')
+    
+    try:
+        DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(
+            dataframe,
+            caminho_temporario,
+            compression='uncompressed'
+        )
+        os.replace(caminho_temporario, caminho)
+        
+        for arquivo_antigo in DIRETORIO_CACHE.glob(f"{prefixo}*.arrow"):
+            if arquivo_antigo != caminho:
+                arquivo_antigo.unlink(missing_ok=True)
+    except OSError:
+        # Falha no cache não deve impedir o funcionamento do dashboard
+        caminho_temporario.unlink(missing_ok=True)
+
+
+def transformar_dados(dataframe: pd.DataFrame, usar_categorias: bool = True) -> pd.DataFrame:
+    """
+    Aplica a limpeza e a tradução sobre os dados brutos.
+    
+    Args:
+        dataframe: DataFrame bruto, com colunas em inglês
+        usar_categorias: Se deve converter as colunas de dimensão para categóricas
+        
+    Returns:
+        DataFrame processado e limpo
+    """
+    df = traduzir_colunas(dataframe)
+    df = traduzir_valores(df)
+    df = df.dropna()
+    
+    # Converter ano para inteiro
+    df['ano'] = df['ano'].astype('int64')
+    
+    if usar_categorias:
+        df = converter_para_categorias(df)
+    
+    return df
+
+
+def consolidar_agregados(partes: List[pd.DataFrame], colunas: List[str]) -> pd.DataFrame:
+    """
+    Soma agregados parciais (cubos ou esboços) com as mesmas colunas-chave.
+    
+    Args:
+        partes: Lista de agregados parciais
+        colunas: Colunas-chave do agregado; as demais colunas são somadas,
+            exceto m2, combinado por combinar_momentos
+            
+    Returns:
+        Agregado com todas as partes combinadas
+    """
+    if len(partes) == 1:
+        return partes[0]
+    
+    return combinar_momentos(pd.concat(partes, ignore_index=True), colunas)
+
+
+def codificar_dimensoes(dataframe: pd.DataFrame, dicionarios: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Substitui as dimensões do cubo por códigos inteiros de dicionários globais.
+    
+    Os dicionários crescem a cada bloco com os valores novos, de modo que o
+    mesmo valor recebe sempre o mesmo código em todos os blocos. Apenas os
+    valores distintos de cada bloco são consultados.
+    
+    Args:
+        dataframe: Bloco já processado
+        dicionarios: Dicionários valor -> código por coluna (atualizados no lugar)
+        
+    Returns:
+        DataFrame com as dimensões codificadas e a coluna salario_usd
+    """
+    codificado = {}
+    for coluna in DIMENSOES_CUBO:
+        codigos, valores = pd.factorize(dataframe[coluna])
+        dicionario = dicionarios.setdefault(coluna, {})
+        mapa = np.array([dicionario.setdefault(valor, len(dicionario)) for valor in valores], dtype=np.int32)
+        codificado[coluna] = mapa[codigos]
+    
+    codificado['salario_usd'] = dataframe['salario_usd'].to_numpy()
+    return pd.DataFrame(codificado)
+
+
+def decodificar_dimensoes(agregado: pd.DataFrame, dicionarios: Dict[str, Dict]) -> pd.DataFrame:
+    """
+    Converte as dimensões codificadas por codificar_dimensoes de volta para valores.
+    
+    Args:
+        agregado: Cubo ou esboço com as dimensões codificadas
+        dicionarios: Dicionários valor -> código por coluna
+        
+    Returns:
+        Agregado com as dimensões categóricas
+    """
+    decodificado = agregado.copy(deep=False)
+    for coluna in DIMENSOES_CUBO:
+        valores = list(dicionarios[coluna])
+        if coluna == 'ano':
+            decodificado[coluna] = np.asarray(valores, dtype=np.int64)[agregado[coluna].to_numpy()]
+        else:
+            decodificado[coluna] = pd.Categorical.from_codes(agregado[coluna].to_numpy(), categories=valores)
+    return converter_para_categorias(decodificado)
+
+
+def obter_caminho_armazenamento(chave: str) -> Path:
+    """
+    Retorna o caminho do armazenamento Parquet gerado pela ingestão em blocos.
+    
+    Args:
+        chave: Chave calculada por calcular_chave_cache
+        
+    Returns:
+        Caminho do arquivo Parquet no diretório de cache
+    """
+    return DIRETORIO_CACHE / f"{PREFIXO_ARMAZENAMENTO}{chave}.parquet"
+
+
+def criar_acumulador_agregados(tamanho_bloco: int) -> Dict:
+    """
+    Cria o estado do cubo e dos esboços de quantis acumulados bloco a bloco.
+    
+    Args:
+        tamanho_bloco: Número de linhas por bloco, usado como limite mínimo
+            de linhas pendentes antes de cada consolidação
+            
+    Returns:
+        Dicionário com as partes, as chaves e os dicionários de códigos
+    """
+    return {
+        'tamanho_bloco': tamanho_bloco,
+        'partes': {'cubo': [], 'esbocos': []},
+        'chaves': {'cubo': DIMENSOES_CUBO, 'esbocos': DIMENSOES_CUBO + ['balde']},
+        'linhas_consolidadas': {'cubo': 0, 'esbocos': 0},
+        'linhas_pendentes': {'cubo': 0, 'esbocos': 0},
+        'dicionarios': {}
+    }
+
+
+def acumular_agregados(acumulador: Dict, bloco: pd.DataFrame) -> None:
+    """
+    Soma um bloco ao cubo e aos esboços acumulados.
+    
+    As dimensões são mantidas como códigos inteiros até finalizar_agregados.
+    
+    Args:
+        acumulador: Estado criado por criar_acumulador_agregados (atualizado no lugar)
+        bloco: Bloco já processado, sem colunas categóricas
+    """
+    codificado = codificar_dimensoes(bloco, acumulador['dicionarios'])
+    parciais = {
+        'cubo': construir_cubo(codificado),
+        'esbocos': construir_esbocos_quantis(codificado)
+    }
+    partes = acumulador['partes']
+    linhas_consolidadas = acumulador['linhas_consolidadas']
+    linhas_pendentes = acumulador['linhas_pendentes']
+    for nome, parcial in parciais.items():
+        partes[nome].append(parcial)
+        linhas_pendentes[nome] += len(parcial)
+        
+        # Consolidar quando as partes pendentes superam o já consolidado,
+        # mantendo a memória proporcional ao tamanho do agregado
+        if linhas_pendentes[nome] > max(linhas_consolidadas[nome], acumulador['tamanho_bloco']):
+            partes[nome] = [consolidar_agregados(partes[nome], acumulador['chaves'][nome])]
+            linhas_consolidadas[nome] = len(partes[nome][0])
+            linhas_pendentes[nome] = 0
+
+
+def finalizar_agregados(acumulador: Dict) -> Dict:
+    """
+    Consolida o cubo e os esboços acumulados e decodifica as dimensões.
+    
+    Args:
+        acumulador: Estado criado por criar_acumulador_agregados
+        
+    Returns:
+        Dicionário com cubo e esbocos (None se nenhum bloco foi acumulado)
+    """
+    return {
+        nome: decodificar_dimensoes(
+            consolidar_agregados(partes, acumulador['chaves'][nome]),
+            acumulador['dicionarios']
+        ) if partes else None
+        for nome, partes in acumulador['partes'].items()
+    }
+
+
+def escolher_tipo_salario(serie: pd.Series) -> str:
+    """
+    Escolhe o tipo de salario_usd de um bloco lido da fonte.
+    
+    Salários lidos como inteiros ficam em int64, como no carregamento
+    completo do mesmo arquivo; os demais ficam em float64.
+    
+    Args:
+        serie: Coluna salario_usd do bloco, já limpa
+        
+    Returns:
+        'int64' ou 'float64'
+    """
+    return 'int64' if pd.api.types.is_integer_dtype(serie.dtype) else 'float64'
+
+
+def processar_dados_em_blocos(url: str, caminho_destino: Path,
+                              tamanho_bloco: int = 500_000,
+                              tipo_salario: Optional[str] = None) -> Dict:
+    """
+    Processa a fonte em blocos, gravando o resultado em Parquet e agregando incrementalmente.
+    
+    Cada bloco é lido, traduzido e limpo isoladamente, anexado ao arquivo
+    Parquet como um novo grupo de linhas e somado ao cubo e aos esboços de
+    quantis acumulados, cujas dimensões são mantidas como códigos inteiros
+    até o final. O pico de memória depende do tamanho do bloco e do número de
+    células do cubo, não do tamanho do arquivo.
+    
+    O esquema do Parquet segue o primeiro bloco: salario_usd é gravado em
+    int64 quando os salários são inteiros (ver escolher_tipo_salario). Se um
+    bloco posterior tiver salários reais, o arquivo é refeito em float64,
+    o tipo que a leitura completa do arquivo produziria.
+    
+    Args:
+        url: Caminho local do arquivo de origem (ver resolver_fonte)
+        caminho_destino: Caminho do arquivo Parquet a ser gravado
+        tamanho_bloco: Número de linhas lidas por bloco
+        tipo_salario: Tipo de salario_usd (None escolhe pelo primeiro bloco)
+        
+    Returns:
+        Dicionário com total_linhas, cubo e esbocos
+    """
+    caminho_destino = Path(caminho_destino)
+    caminho_destino.parent.mkdir(parents=True, exist_ok=True)
+    caminho_temporario = caminho_destino.with_suffix('.tmp')
+    
+    escritor = None
+    acumulador = criar_acumulador_agregados(tamanho_bloco)
+    total_linhas = 0
+    
+    try:
+        for bloco in ler_fonte_em_blocos(url, tamanho_bloco):
+            bloco = transformar_dados(bloco, usar_categorias=False)
+            tipo_bloco = escolher_tipo_salario(bloco['salario_usd'])
+            if tipo_salario is None:
+                tipo_salario = tipo_bloco
+            elif tipo_bloco == 'float64' and tipo_salario == 'int64':
+                break
+            bloco['salario_usd'] = bloco['salario_usd'].astype(tipo_salario)
+            
+            tabela = pa.Table.from_pandas(
+                bloco,
+                schema=escritor.schema if escritor else None,
+                preserve_index=False
+            )
+            if escritor is None:
+                escritor = pq.ParquetWriter(caminho_temporario, tabela.schema)
+            escritor.write_table(tabela)
+            
+            acumular_agregados(acumulador, bloco)
+            total_linhas += len(bloco)
+        else:
+            if escritor is not None:
+                escritor.close()
+                escritor = None
+                os.replace(caminho_temporario, caminho_destino)
+            return {'total_linhas': total_linhas, **finalizar_agregados(acumulador)}
+    finally:
+        if escritor is not None:
+            escritor.close()
+        caminho_temporario.unlink(missing_ok=True)
+    
+    # Um bloco com salários reais após o esquema inteiro: refaz em float64
+    return processar_dados_em_blocos(url, caminho_destino, tamanho_bloco, tipo_salario='float64')
+
+
+def carregar_armazenamento(caminho: Path, usar_categorias: bool = True) -> pd.DataFrame:
+    """
+    Carrega o armazenamento Parquet gerado por processar_dados_em_blocos.
+    
+    As colunas de dimensão são lidas já codificadas como dicionário, o que
+    evita materializar uma string por linha.
+    
+    Args:
+        caminho: Caminho do arquivo Parquet
+        usar_categorias: Se as colunas de dimensão devem ser categóricas
+        
+    Returns:
+        DataFrame processado
+    """
+    colunas_dimensao = list(ORDEM_CATEGORIAS) if usar_categorias else None
+    df = pq.read_table(caminho, memory_map=True, read_dictionary=colunas_dimensao).to_pandas()
+    if usar_categorias:
+        df = converter_para_categorias(df)
+    return df
+
+
+def obter_caminho_estado_incremental(caminho_fonte: str, opcoes: Dict) -> Path:
+    """
+    Retorna o caminho do estado da ingestão incremental de uma fonte.
+    
+    Args:
+        caminho_fonte: Caminho local do arquivo de origem
+        opcoes: Opções de ingestão que alteram o resultado
+        
+    Returns:
+        Caminho do arquivo JSON no diretório de cache
+    """
+    identificador = json.dumps([os.path.abspath(caminho_fonte), opcoes], sort_keys=True)
+    hash_estado = hashlib.sha256(identificador.encode('utf-8')).hexdigest()[:16]
+    return DIRETORIO_CACHE / f"{PREFIXO_ESTADO_INCREMENTAL}{hash_estado}.json"
+
+
+def salvar_estado_incremental(caminho_fonte: str, opcoes: Dict, hash_fonte: str,
+                              chave: str, linhas_brutas: int) -> None:
+    """
+    Registra o tamanho e o hash da fonte já processada para a próxima ingestão incremental.
+    
+    Args:
+        caminho_fonte: Caminho local do arquivo de origem
+        opcoes: Opções de ingestão que alteram o resultado
+        hash_fonte: Hash SHA-256 dos bytes processados
+        chave: Chave do cache em disco do DataFrame processado
+        linhas_brutas: Número de linhas de dados do arquivo, antes da limpeza
+    """
+    estado = {
+        'tamanho_bytes': os.path.getsize(caminho_fonte),
+        'hash_fonte': hash_fonte,
+        'chave': chave,
+        'linhas_brutas': linhas_brutas
+    }
+    try:
+        DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+        obter_caminho_estado_incremental(caminho_fonte, opcoes).write_text(
+            json.dumps(estado), encoding='utf-8'
+        )
+    except OSError:
+        # Sem estado a próxima atualização apenas reprocessa o arquivo inteiro
+        pass
+
+
+def anexar_linhas_novas(caminho_fonte: str, opcoes: Dict) -> Optional[Tuple[pd.DataFrame, Dict]]:
+    """
+    Processa apenas as linhas acrescentadas ao final da fonte desde a última ingestão.
+    
+    O trecho já processado é identificado pelo tamanho em bytes gravado por
+    salvar_estado_incremental e validado pelo hash SHA-256 desse prefixo. Se
+    o prefixo mudou (edição, truncamento, reordenação), se a fonte não é um
+    CSV sem compressão, se o DataFrame anterior não está mais no cache ou se
+    ele foi processado com outras traduções ou outra versão do pipeline (a
+    chave gravada difere de calcular_chave_cache para o prefixo), nada é
+    feito e o chamador reprocessa o arquivo inteiro.
+    
+    Args:
+        caminho_fonte: Caminho local do arquivo de origem
+        opcoes: Opções de ingestão que alteram o resultado
+        
+    Returns:
+        Tupla (DataFrame completo, informações da anexação) ou None se for
+        necessário reprocessar tudo
+    """
+    caminho_estado = obter_caminho_estado_incremental(caminho_fonte, opcoes)
+    try:
+        estado = json.loads(caminho_estado.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    
+    tamanho_prefixo = estado['tamanho_bytes']
+    if tamanho_prefixo <= 0 or os.path.getsize(caminho_fonte) <= tamanho_prefixo:
+        return None
+    if detectar_formato_fonte(caminho_fonte) != 'csv':
+        return None
+    
+    with open(caminho_fonte, 'rb') as arquivo:
+        hash_prefixo = hashlib.sha256()
+        restante = tamanho_prefixo
+        ultimo_byte = b''
+        while restante:
+            parte = arquivo.read(min(restante, TAMANHO_LEITURA_HASH))
+            if not parte:
+                return None
+            hash_prefixo.update(parte)
+            ultimo_byte = parte[-1:]
+            restante -= len(parte)
+        
+        # O prefixo precisa terminar em uma linha completa e não ter mudado
+        if ultimo_byte != b'\n' or hash_prefixo.hexdigest() != estado['hash_fonte']:
+            return None
+        
+        # As linhas novas seriam traduzidas com as tabelas atuais: o trecho
+        # anterior precisa ter sido processado com as mesmas
+        if estado['chave'] != calcular_chave_cache(estado['hash_fonte'], opcoes):
+            return None
+        
+        df_anterior = carregar_cache_processado(estado['chave'])
+        if df_anterior is None:
+            return None
+        
+        colunas = pd.read_csv(caminho_fonte, nrows=0).columns
+        brutos = pd.read_csv(arquivo, header=None, names=colunas)
+    
+    # Continuar a numeração de linhas do arquivo, como em uma leitura completa
+    brutos.index += estado['linhas_brutas']
+    df_novo = transformar_dados(brutos, opcoes.get('usar_categorias', True))
+    
+    df = pd.concat([df_anterior, df_novo])
+    if opcoes.get('usar_categorias', True):
+        df = converter_para_categorias(df)
+    
+    anexacao = {
+        'versao_base': estado['chave'],
+        'linhas_base': len(df_anterior),
+        'linhas_brutas': estado['linhas_brutas'] + len(brutos)
+    }
+    return df, anexacao
+
+
+def processar_dados(url: str, usar_cache_disco: bool = True,
+                    usar_categorias: bool = True,
+                    tamanho_bloco: int = TAMANHO_BLOCO_INGESTAO,
+                    incremental: bool = True,
+                    compactar_numericos: bool = COMPACTAR_NUMERICOS) -> pd.DataFrame:
+    """
+    Processa os dados: carrega, traduz colunas e valores, remove nulos e converte tipos.
+    
+    A fonte pode ser um caminho local ou uma URL, em CSV (opcionalmente
+    comprimido com gzip ou zstd) ou Parquet; URLs são revalidadas com
+    requisições condicionais por resolver_fonte. Se usar_cache_disco for
+    True, o resultado é mantido em disco, para que uma reinicialização do
+    servidor não precise repetir o processamento (no dashboard, a versão de
+    common.py também o mantém em memória entre reruns e sessões). Com tamanho_bloco > 0 a
+    fonte é processada em streaming por processar_dados_em_blocos, e o cubo e
+    os esboços de quantis calculados durante a ingestão ficam em disco.
+    
+    Com incremental=True, se a fonte apenas recebeu linhas novas no final
+    desde o último processamento, só essas linhas são lidas e traduzidas
+    (ver anexar_linhas_novas). O DataFrame resultante guarda em attrs a
+    versão anterior e o número de linhas herdadas, para que o índice de
+    filtros, o cubo e os esboços também sejam atualizados apenas com o delta.
+    
+    Com compactar_numericos=True, as colunas numéricas são convertidas para o
+    menor tipo sem perda por compactar_tipos_numericos; no cache em disco o
+    DataFrame já é gravado compactado.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        usar_cache_disco: Se deve usar o cache em disco do DataFrame processado
+        usar_categorias: Se as colunas de dimensão devem ser categóricas
+        tamanho_bloco: Linhas por bloco na ingestão em streaming (0 desativa)
+        incremental: Se deve processar apenas as linhas acrescentadas à fonte
+        compactar_numericos: Se as colunas numéricas devem usar o menor tipo sem perda
+        
+    Returns:
+        DataFrame processado e limpo
+    """
+    if not usar_cache_disco:
+        df = transformar_dados(carregar_dados(url), usar_categorias)
+        return compactar_tipos_numericos(df) if compactar_numericos else df
+    
+    caminho_fonte = resolver_fonte(url)
+    hash_fonte = calcular_hash_fonte(caminho_fonte)
+    
+    if tamanho_bloco and pq is not None:
+        chave = calcular_chave_cache(hash_fonte, {'armazenamento': 'parquet'})
+        caminho = obter_caminho_armazenamento(chave)
+        if not caminho.exists():
+            resultado = processar_dados_em_blocos(caminho_fonte, caminho, tamanho_bloco)
+            salvar_cache_processado(resultado['cubo'], chave, PREFIXO_CACHE_CUBO)
+            salvar_cache_processado(resultado['esbocos'], chave, PREFIXO_CACHE_ESBOCOS)
+            
+            for arquivo_antigo in DIRETORIO_CACHE.glob(f"{PREFIXO_ARMAZENAMENTO}*.parquet"):
+                if arquivo_antigo != caminho:
+                    arquivo_antigo.unlink(missing_ok=True)
+        
+        df = carregar_armazenamento(caminho, usar_categorias)
+        if compactar_numericos:
+            df = compactar_tipos_numericos(df)
+        df.attrs['versao_dados'] = chave
+        return df
+    
+    opcoes = {'usar_categorias': usar_categorias}
+    if compactar_numericos:
+        opcoes['compactar_numericos'] = True
+    chave = calcular_chave_cache(hash_fonte, opcoes)
+    anexacao = {}
+    
+    df = carregar_cache_processado(chave)
+    if df is None:
+        resultado = anexar_linhas_novas(caminho_fonte, opcoes) if incremental else None
+        if resultado is not None:
+            df, anexacao = resultado
+            linhas_brutas = anexacao.pop('linhas_brutas')
+        else:
+            brutos = ler_fonte(caminho_fonte)
+            linhas_brutas = len(brutos)
+            df = transformar_dados(brutos, usar_categorias)
+            del brutos
+        
+        if compactar_numericos:
+            df = compactar_tipos_numericos(df)
+        salvar_cache_processado(df, chave)
+        salvar_estado_incremental(caminho_fonte, opcoes, hash_fonte, chave, linhas_brutas)
+    
+    df.attrs = {'versao_dados': chave, **anexacao}
+    return df
+
+
+def obter_versao_dados(dataframe: pd.DataFrame) -> str:
+    """
+    Retorna um identificador estável do conteúdo do DataFrame processado.
+    
+    Usa a chave gravada por processar_dados e, na ausência dela, calcula um
+    hash do conteúdo do DataFrame.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        Identificador da versão dos dados
+    """
+    versao = dataframe.attrs.get('versao_dados')
+    if versao is None:
+        versao = str(pd.util.hash_pandas_object(dataframe, index=False).sum())
+    return versao
+
+
+def separar_linhas_base(dataframe: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Separa um DataFrame anexado por processar_dados nas linhas herdadas e nas novas.
+    
+    A parte herdada não leva os attrs do DataFrame completo, de modo que ela
+    é tratada como um DataFrame comum da versão anterior.
+    
+    Args:
+        dataframe: DataFrame com versao_base e linhas_base em attrs
+        
+    Returns:
+        Tupla (linhas da versão anterior, linhas novas)
+    """
+    linhas_base = dataframe.attrs['linhas_base']
+    base = dataframe.iloc[:linhas_base]
+    base.attrs = {}
+    novas = dataframe.iloc[linhas_base:]
+    novas.attrs = {}
+    return base, novas
+
+
+def construir_indice_filtros(dataframe: pd.DataFrame) -> Dict:
+    """
+    Constrói o índice de bitmaps usado por filtrar_dataframe.
+    
+    Para cada valor distinto de cada coluna de COLUNAS_FILTRO é guardado um
+    bitset (array booleano compactado com np.packbits) com as linhas que
+    possuem aquele valor.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        Dicionário com o total de linhas e os bitmaps por coluna e valor
+    """
+    total_linhas = len(dataframe)
+    bitmaps = {}
+    colunas_com_nulos = set()
+    
+    for coluna in COLUNAS_FILTRO.values():
+        codigos, valores = pd.factorize(dataframe[coluna])
+        
+        # Uma única ordenação agrupa as posições de cada valor
+        ordem = np.argsort(codigos, kind='stable')
+        limites = np.concatenate(([0], np.cumsum(np.bincount(codigos[codigos >= 0], minlength=len(valores)))))
+        inicio = np.count_nonzero(codigos < 0)
+        if inicio:
+            colunas_com_nulos.add(coluna)
+        
+        bitmaps[coluna] = {}
+        for codigo, valor in enumerate(valores):
+            linhas = np.zeros(total_linhas, dtype=bool)
+            linhas[ordem[inicio + limites[codigo]:inicio + limites[codigo + 1]]] = True
+            bitmaps[coluna][valor] = np.packbits(linhas)
+    
+    return {
+        'total_linhas': total_linhas,
+        'bitmaps': bitmaps,
+        'colunas_com_nulos': colunas_com_nulos
+    }
+
+
+def concatenar_bitsets(anterior: Optional[np.ndarray], linhas_anteriores: int,
+                       novas: np.ndarray) -> np.ndarray:
+    """
+    Acrescenta linhas ao final de um bitset compactado com np.packbits.
+    
+    Apenas o último byte do bitset anterior, possivelmente incompleto, é
+    descompactado; os demais bytes são copiados como estão.
+    
+    Args:
+        anterior: Bitset existente (None se o valor ainda não ocorria)
+        linhas_anteriores: Número de linhas representadas pelo bitset anterior
+        novas: Array booleano com as linhas novas
+        
+    Returns:
+        Bitset com linhas_anteriores + len(novas) linhas
+    """
+    bytes_completos, resto = divmod(linhas_anteriores, 8)
+    if anterior is None:
+        anterior = np.zeros((linhas_anteriores + 7) // 8, dtype=np.uint8)
+    
+    bits_finais = np.unpackbits(anterior[bytes_completos:], count=resto).astype(bool)
+    cauda = np.packbits(np.concatenate((bits_finais, novas)))
+    return np.concatenate((anterior[:bytes_completos], cauda))
+
+
+def anexar_indice_filtros(indice: Dict, dataframe_novo: pd.DataFrame) -> Dict:
+    """
+    Atualiza o índice de filtros com linhas acrescentadas ao final do DataFrame.
+    
+    Args:
+        indice: Índice criado por construir_indice_filtros
+        dataframe_novo: Linhas novas, na mesma ordem em que foram anexadas
+        
+    Returns:
+        Novo índice cobrindo as linhas anteriores e as novas
+    """
+    linhas_anteriores = indice['total_linhas']
+    bitmaps = {}
+    colunas_com_nulos = set(indice['colunas_com_nulos'])
+    
+    for coluna in COLUNAS_FILTRO.values():
+        codigos, valores = pd.factorize(dataframe_novo[coluna])
+        if (codigos < 0).any():
+            colunas_com_nulos.add(coluna)
+        
+        novas_por_valor = {valor: codigos == codigo for codigo, valor in enumerate(valores)}
+        sem_linhas = np.zeros(len(dataframe_novo), dtype=bool)
+        
+        bitmaps_anteriores = indice['bitmaps'][coluna]
+        bitmaps[coluna] = {}
+        for valor in list(bitmaps_anteriores) + [v for v in novas_por_valor if v not in bitmaps_anteriores]:
+            bitmaps[coluna][valor] = concatenar_bitsets(
+                bitmaps_anteriores.get(valor),
+                linhas_anteriores,
+                novas_por_valor.get(valor, sem_linhas)
+            )
+    
+    return {
+        'total_linhas': linhas_anteriores + len(dataframe_novo),
+        'bitmaps': bitmaps,
+        'colunas_com_nulos': colunas_com_nulos
+    }
+
+
+def normalizar_selecao_filtro(chave: str, selecionados: Optional[List]) -> Optional[frozenset]:
+    """
+    Normaliza a seleção de uma dimensão para comparação entre execuções.
+    
+    Args:
+        chave: Chave do filtro em COLUNAS_FILTRO
+        selecionados: Valores selecionados
+        
+    Returns:
+        Conjunto dos valores selecionados, ou None se a dimensão não restringe
+        as linhas (filtro de cargos vazio)
+    """
+    if chave == 'cargos' and not selecionados:
+        return None
+    return frozenset(selecionados or [])
+
+
+def calcular_mascara_dimensao(indice: Dict, coluna: str, selecionados: Optional[frozenset]) -> Optional[np.ndarray]:
+    """
+    Combina com OU os bitmaps dos valores selecionados de uma dimensão.
+    
+    Args:
+        indice: Índice criado por construir_indice_filtros
+        coluna: Coluna da dimensão
+        selecionados: Seleção normalizada por normalizar_selecao_filtro
+        
+    Returns:
+        Bitset compactado das linhas aceitas, ou None se a dimensão aceita
+        todas as linhas (sem filtro ou com todos os valores selecionados)
+    """
+    if selecionados is None:
+        return None
+    
+    bitmaps_coluna = indice['bitmaps'][coluna]
+    if coluna not in indice['colunas_com_nulos'] and selecionados.issuperset(bitmaps_coluna):
+        return None
+    
+    mascara = np.zeros((indice['total_linhas'] + 7) // 8, dtype=np.uint8)
+    for valor in selecionados:
+        bitmap = bitmaps_coluna.get(valor)
+        if bitmap is not None:
+            np.bitwise_or(mascara, bitmap, out=mascara)
+    return mascara
+
+
+def consultar_indice_filtros(indice: Dict, filtros: Dict) -> np.ndarray:
+    """
+    Resolve uma seleção de filtros usando apenas operações sobre bitsets.
+    
+    Os bitmaps dos valores selecionados são combinados com OU dentro de cada
+    dimensão e com E entre dimensões. Dimensões com todos os valores
+    selecionados são ignoradas, e o filtro de cargos só é aplicado se houver
+    algum cargo selecionado.
+    
+    Args:
+        indice: Índice criado por construir_indice_filtros
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+        
+    Returns:
+        Array com as posições das linhas selecionadas
+    """
+    total_linhas = indice['total_linhas']
+    resultado = None
+    
+    for chave, coluna in COLUNAS_FILTRO.items():
+        mascara = calcular_mascara_dimensao(
+            indice, coluna, normalizar_selecao_filtro(chave, filtros.get(chave))
+        )
+        if mascara is None:
+            continue
+        
+        if resultado is None:
+            resultado = mascara
+        else:
+            np.bitwise_and(resultado, mascara, out=resultado)
+    
+    if resultado is None:
+        return np.arange(total_linhas)
+    return np.flatnonzero(np.unpackbits(resultado, count=total_linhas))
+
+
+def criar_estado_filtros() -> Dict:
+    """
+    Cria o estado de consultar_indice_filtros_incremental, guardado por sessão.
+    
+    Returns:
+        Dicionário com o índice consultado, a seleção e a máscara de cada
+        dimensão e as posições resultantes da última consulta
+    """
+    return {'indice': None, 'dimensoes': {}, 'posicoes': None}
+
+
+def selecionar_posicoes_bitset(posicoes: np.ndarray, mascara: np.ndarray) -> np.ndarray:
+    """
+    Mantém apenas as posições cujo bit está ligado em um bitset compactado.
+    
+    Com poucas posições (até FRACAO_MAXIMA_TESTE_DIRETO dos bits), o bit de
+    cada posição é lido diretamente no byte da máscara, com custo
+    proporcional ao número de posições. Acima disso, descompactar a máscara
+    inteira (custo proporcional ao total de linhas) e indexá-la é mais
+    rápido que os deslocamentos por posição.
+    
+    Args:
+        posicoes: Posições de linhas, em ordem crescente
+        mascara: Bitset compactado com np.packbits
+        
+    Returns:
+        Subconjunto de posições aceitas pela máscara
+    """
+    if len(posicoes) > len(mascara) * 8 * FRACAO_MAXIMA_TESTE_DIRETO:
+        return posicoes[np.unpackbits(mascara).view(bool)[posicoes]]
+    
+    # O bit da posição p é o bit 7 - (p % 8) do byte p // 8 (ordem de np.packbits)
+    bytes_posicoes = mascara[posicoes >> 3]
+    bytes_posicoes <<= (posicoes & 7).astype(np.uint8)
+    return posicoes[bytes_posicoes >= 0x80]
+
+
+def consultar_indice_filtros_incremental(indice: Dict, filtros: Dict, estado: Dict) -> np.ndarray:
+    """
+    Resolve uma seleção de filtros reaproveitando a consulta anterior da sessão.
+    
+    A máscara de cada dimensão é guardada no estado com a seleção que a
+    gerou, de modo que apenas as dimensões cuja seleção mudou são
+    recalculadas. Se todas as mudanças apenas estreitam a seleção (valores
+    desmarcados, ou cargos escolhidos quando não havia filtro de cargos) e o
+    resultado anterior, multiplicado pelo número de dimensões alteradas,
+    tem até FRACAO_MAXIMA_REFINAMENTO das linhas, ele é refinado com as
+    máscaras das dimensões alteradas (selecionar_posicoes_bitset), sem
+    combinar e descompactar as máscaras de todas as dimensões; com
+    resultados pequenos o custo é proporcional às linhas já selecionadas.
+    Sem mudança na seleção, o resultado anterior é devolvido diretamente.
+    Nos demais casos, as máscaras de todas as dimensões são combinadas como
+    em consultar_indice_filtros.
+    
+    Args:
+        indice: Índice criado por construir_indice_filtros
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+        estado: Estado criado por criar_estado_filtros, atualizado na chamada
+        
+    Returns:
+        Array somente leitura com as posições das linhas selecionadas
+    """
+    if estado['indice'] is not indice:
+        estado.update(criar_estado_filtros(), indice=indice)
+    
+    dimensoes = {}
+    alteradas = []
+    estreitamento = estado['posicoes'] is not None
+    for chave, coluna in COLUNAS_FILTRO.items():
+        selecionados = normalizar_selecao_filtro(chave, filtros.get(chave))
+        anterior = estado['dimensoes'].get(coluna)
+        if anterior is not None and anterior['selecionados'] == selecionados:
+            dimensoes[coluna] = anterior
+            continue
+        
+        mascara = calcular_mascara_dimensao(indice, coluna, selecionados)
+        dimensoes[coluna] = {'selecionados': selecionados, 'mascara': tornar_somente_leitura(mascara)}
+        if anterior is None or (mascara is None and anterior['mascara'] is None):
+            # Sem consulta anterior, ou a dimensão continua sem restringir as linhas
+            estreitamento = estreitamento and anterior is not None
+            continue
+        
+        alteradas.append(mascara)
+        if mascara is None or not (
+            anterior['mascara'] is None or selecionados.issubset(anterior['selecionados'])
+        ):
+            estreitamento = False
+    
+    if estreitamento and (
+        len(estado['posicoes']) * len(alteradas) <= indice['total_linhas'] * FRACAO_MAXIMA_REFINAMENTO
+    ):
+        posicoes = estado['posicoes']
+        for mascara in alteradas:
+            posicoes = selecionar_posicoes_bitset(posicoes, mascara)
+    else:
+        resultado = None
+        for dimensao in dimensoes.values():
+            if dimensao['mascara'] is None:
+                continue
+            if resultado is None:
+                resultado = dimensao['mascara'].copy()
+            else:
+                np.bitwise_and(resultado, dimensao['mascara'], out=resultado)
+        if resultado is None:
+            posicoes = np.arange(indice['total_linhas'])
+        else:
+            posicoes = np.flatnonzero(np.unpackbits(resultado, count=indice['total_linhas']))
+    
+    estado['dimensoes'] = dimensoes
+    estado['posicoes'] = tornar_somente_leitura(posicoes)
+    return posicoes
+
+
+def filtrar_dataframe(
+    dataframe: pd.DataFrame,
+    anos: List,
+    senioridades: List,
+    contratos: List,
+    tamanhos_empresa: List,
+    cargos: List = None,
+    indice: Optional[Dict] = None,
+    retornar_posicoes: bool = False,
+    estado: Optional[Dict] = None
+):
+    """
+    Filtra o DataFrame com base nos critérios selecionados.
+    
+    Com o índice e o estado de filtros da sessão, apenas as dimensões cuja
+    seleção mudou desde a chamada anterior são reavaliadas (ver
+    consultar_indice_filtros_incremental).
+    
+    Args:
+        dataframe: DataFrame a ser filtrado
+        anos: Lista de anos selecionados
+        senioridades: Lista de senioridades selecionadas
+        contratos: Lista de tipos de contrato selecionados
+        tamanhos_empresa: Lista de tamanhos de empresa selecionados
+        cargos: Lista de cargos selecionados (opcional)
+        indice: Índice de bitmaps do mesmo DataFrame (opcional)
+        retornar_posicoes: Se True, retorna as posições das linhas em vez de um DataFrame
+        estado: Estado de filtros da sessão, criado por criar_estado_filtros (opcional, requer o índice)
+        
+    Returns:
+        DataFrame filtrado ou array com as posições das linhas selecionadas
+    """
+    if indice is not None:
+        filtros = {
+            'anos': anos,
+            'senioridades': senioridades,
+            'contratos': contratos,
+            'tamanhos_empresa': tamanhos_empresa,
+            'cargos': cargos
+        }
+        if estado is not None:
+            posicoes = consultar_indice_filtros_incremental(indice, filtros, estado)
+        else:
+            posicoes = consultar_indice_filtros(indice, filtros)
+        return posicoes if retornar_posicoes else dataframe.iloc[posicoes]
+    
+    selecao = {
+        'ano': anos,
+        'senioridade': senioridades,
+        'contrato': contratos,
+        'tamanho_empresa': tamanhos_empresa
+    }
+    
+    # Aplicar filtro de cargos se fornecido
+    if cargos and len(cargos) > 0:
+        selecao['cargo'] = cargos
+    
+    mascara = obter_backend()['filtrar_mascara'](dataframe, selecao)
+    if retornar_posicoes:
+        return np.flatnonzero(mascara)
+    return dataframe[mascara]
+
+
+# ============================================================================
+# FUNÇÕES DE PRÉ-AGREGAÇÃO (CUBO E ESBOÇOS DE QUANTIS)
+# ============================================================================
+
+
+def construir_cubo(dataframe: pd.DataFrame) -> pd.DataFrame:
+    """
+    Constrói o cubo pré-agregado de salários sobre as dimensões do dashboard.
+    
+    Cada linha do cubo é uma combinação ocupada de DIMENSOES_CUBO, com a
+    contagem, a soma e o m2 (soma dos quadrados dos desvios em relação à
+    média da célula) de salario_usd. Como o cubo possui as mesmas colunas
+    de dimensão do DataFrame, ele pode ser filtrado com filtrar_dataframe. A agregação roda no backend de cálculo configurado.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        DataFrame com uma linha por célula ocupada do cubo
+    """
+    return obter_backend()['agregar_grupos'](dataframe, DIMENSOES_CUBO, 'salario_usd')
+
+
+def combinar_momentos(celulas: pd.DataFrame, colunas: List[str], ordenar: bool = False) -> pd.DataFrame:
+    """
+    Combina células de um agregado pelas colunas informadas.
+    
+    Contagens e somas são somadas. O m2 de cada grupo é combinado pela
+    fórmula paralela de Chan: a soma dos m2 das células mais, para cada
+    célula, contagem * (média da célula - média do grupo)^2. Os desvios são
+    calculados em relação à média, sem a diferença entre somas de quadrados
+    grandes, o que mantém o desvio padrão exato mesmo para valores altos com
+    pouca variação.
+    
+    Args:
+        celulas: Agregado com as colunas-chave e as colunas somáveis (com
+            contagem, soma e m2, se houver m2)
+        colunas: Colunas-chave do resultado
+        ordenar: Se os grupos devem sair ordenados pelas colunas-chave
+        
+    Returns:
+        Agregado com uma linha por grupo
+    """
+    if 'm2' in celulas.columns:
+        media_grupo = (
+            celulas.groupby(colunas, observed=True, sort=False)['soma'].transform('sum')
+            / celulas.groupby(colunas, observed=True, sort=False)['contagem'].transform('sum')
+        )
+        desvio = (celulas['soma'] / celulas['contagem'] - media_grupo).fillna(0.0)
+        celulas = celulas.assign(m2=celulas['m2'] + celulas['contagem'] * desvio * desvio)
+    
+    return (
+        celulas
+        .groupby(colunas, observed=True, sort=ordenar)
+        .sum()
+        .reset_index()
+    )
+
+
+def agregar_cubo(cubo: pd.DataFrame, colunas: List[str]) -> pd.DataFrame:
+    """
+    Consolida as células do cubo nas colunas informadas (roll-up).
+    
+    Args:
+        cubo: Cubo (possivelmente filtrado) criado por construir_cubo
+        colunas: Dimensões que devem permanecer no resultado
+        
+    Returns:
+        DataFrame com contagem, soma, m2 e média por grupo
+    """
+    agregado = combinar_momentos(cubo[colunas + ['contagem', 'soma', 'm2']], colunas, ordenar=True)
+    agregado['media'] = agregado['soma'] / agregado['contagem']
+    return agregado
+
+
+def calcular_estatisticas_cubo(cubo: pd.DataFrame) -> Dict:
+    """
+    Calcula contagem, média, desvio padrão e variação anual a partir do cubo.
+    
+    Args:
+        cubo: Cubo já filtrado com os critérios selecionados
+        
+    Returns:
+        Dicionário com total_registros, salario_medio, desvio_padrao e variacao_ano_anterior
+    """
+    contagem = cubo['contagem'].sum()
+    soma = cubo['soma'].sum()
+    
+    media = soma / contagem
+    if contagem > 1:
+        # Combinação de todas as células, como em combinar_momentos
+        desvio = (cubo['soma'] / cubo['contagem'] - media).fillna(0.0)
+        m2 = cubo['m2'].sum() + (cubo['contagem'] * desvio * desvio).sum()
+        desvio_padrao = np.sqrt(m2 / (contagem - 1))
+    else:
+        desvio_padrao = np.nan
+    
+    por_ano = agregar_cubo(cubo, ['ano'])
+    variacao = 0
+    if len(por_ano) >= 2:
+        variacao = calcular_diferenca_percentual(
+            por_ano['media'].iloc[-1],
+            por_ano['media'].iloc[-2]
+        )
+    
+    return {
+        'total_registros': int(contagem),
+        'salario_medio': media,
+        'desvio_padrao': desvio_padrao,
+        'variacao_ano_anterior': variacao
+    }
+
+
+def calcular_baldes_esboco(valores: np.ndarray, erro_relativo: float = ERRO_RELATIVO_ESBOCO) -> np.ndarray:
+    """
+    Calcula o balde logarítmico de cada valor no esboço de quantis.
+    
+    O balde i cobre o intervalo (gama^(i-1), gama^i], com
+    gama = (1 + erro) / (1 - erro). Valores não positivos vão para BALDE_ZERO.
+    
+    Args:
+        valores: Array de valores numéricos
+        erro_relativo: Erro relativo máximo dos quantis estimados
+        
+    Returns:
+        Array de inteiros com o balde de cada valor
+    """
+    valores = np.asarray(valores, dtype=np.float64)
+    gama = (1 + erro_relativo) / (1 - erro_relativo)
+    positivos = valores > 0
+    
+    baldes = np.full(len(valores), BALDE_ZERO, dtype=np.int32)
+    baldes[positivos] = np.ceil(np.log(valores[positivos]) / np.log(gama))
+    return baldes
+
+
+def calcular_valor_balde(baldes: np.ndarray, erro_relativo: float = ERRO_RELATIVO_ESBOCO) -> np.ndarray:
+    """
+    Retorna o valor representativo de cada balde do esboço de quantis.
+    
+    O representante 2 * gama^i / (gama + 1) está a no máximo erro_relativo
+    de qualquer valor do balde i.
+    
+    Args:
+        baldes: Array de índices de balde
+        erro_relativo: Erro relativo usado na construção do esboço
+        
+    Returns:
+        Array com o valor representativo de cada balde
+    """
+    baldes = np.asarray(baldes)
+    gama = (1 + erro_relativo) / (1 - erro_relativo)
+    valores = 2 * np.power(gama, baldes.astype(np.float64)) / (gama + 1)
+    return np.where(baldes == BALDE_ZERO, 0.0, valores)
+
+
+def construir_esbocos_quantis(dataframe: pd.DataFrame,
+                              erro_relativo: float = ERRO_RELATIVO_ESBOCO) -> pd.DataFrame:
+    """
+    Constrói os esboços de quantis de salario_usd para cada célula do cubo.
+    
+    Cada linha guarda quantos salários de uma célula de DIMENSOES_CUBO caem em
+    um balde logarítmico. Os esboços são combináveis: somar as contagens por
+    balde de várias células resulta no esboço da união, o que permite
+    filtrá-los com filtrar_dataframe e consolidá-los no momento da consulta.
+    
+    Args:
+        dataframe: DataFrame processado
+        erro_relativo: Erro relativo máximo dos quantis estimados
+        
+    Returns:
+        DataFrame com as dimensões do cubo, o balde e a contagem
+    """
+    baldes = calcular_baldes_esboco(dataframe['salario_usd'].to_numpy(), erro_relativo)
+    return (
+        dataframe[DIMENSOES_CUBO]
+        .assign(balde=baldes)
+        .groupby(DIMENSOES_CUBO + ['balde'], observed=True, sort=False)
+        .size()
+        .reset_index(name='contagem')
+    )
+
+
+def estimar_quantis_baldes(baldes: np.ndarray, contagens: np.ndarray, quantis: List[float],
+                           erro_relativo: float = ERRO_RELATIVO_ESBOCO) -> np.ndarray:
+    """
+    Estima quantis a partir das contagens de um esboço já consolidado.
+    
+    Args:
+        baldes: Índices de balde em ordem crescente
+        contagens: Contagem de valores em cada balde
+        quantis: Quantis desejados, entre 0 e 1
+        erro_relativo: Erro relativo usado na construção do esboço
+        
+    Returns:
+        Array com o valor estimado de cada quantil
+    """
+    acumulado = np.cumsum(contagens)
+    posicoes = np.asarray(quantis) * (acumulado[-1] - 1)
+    indices = np.searchsorted(acumulado, posicoes, side='right')
+    return calcular_valor_balde(baldes[indices], erro_relativo)
+
+
+def calcular_quantis_esboco(esboco: pd.DataFrame, quantis: List[float],
+                            colunas: Optional[List[str]] = None,
+                            erro_relativo: float = ERRO_RELATIVO_ESBOCO):
+    """
+    Combina os esboços das células selecionadas e estima os quantis.
+    
+    Args:
+        esboco: Esboços (possivelmente filtrados) criados por construir_esbocos_quantis
+        quantis: Quantis desejados, entre 0 e 1
+        colunas: Dimensões para calcular os quantis por grupo (opcional)
+        erro_relativo: Erro relativo usado na construção do esboço
+        
+    Returns:
+        Dicionário {quantil: valor} ou, se colunas for informado, DataFrame
+        com uma linha por grupo e uma coluna por quantil
+    """
+    if not colunas:
+        consolidado = esboco.groupby('balde')['contagem'].sum()
+        valores = estimar_quantis_baldes(
+            consolidado.index.to_numpy(), consolidado.to_numpy(), quantis, erro_relativo
+        )
+        return dict(zip(quantis, valores))
+    
+    consolidado = esboco.groupby(colunas + ['balde'], observed=True)['contagem'].sum().reset_index()
+    linhas = []
+    for grupo, dados_grupo in consolidado.groupby(colunas, observed=True, sort=True):
+        valores = estimar_quantis_baldes(
+            dados_grupo['balde'].to_numpy(), dados_grupo['contagem'].to_numpy(), quantis, erro_relativo
+        )
+        chave = grupo if isinstance(grupo, tuple) else (grupo,)
+        linhas.append(list(chave) + list(valores))
+    
+    return pd.DataFrame(linhas, columns=colunas + list(quantis))
+
+
+def medir_erro_quantis(dataframe: pd.DataFrame, metricas: Dict) -> Dict:
+    """
+    Mede o erro relativo dos quantis estimados em relação a Series.quantile.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        metricas: Métricas calculadas com os quantis aproximados
+        
+    Returns:
+        Dicionário com o erro relativo (em %) de cada quantil
+    """
+    salarios = dataframe['salario_usd']
+    exatos = {
+        'salario_mediano': salarios.quantile(0.5),
+        'percentil_25': salarios.quantile(0.25),
+        'percentil_75': salarios.quantile(0.75)
+    }
+    return {
+        chave: abs(metricas[chave] - exato) / exato * 100 if exato else 0.0
+        for chave, exato in exatos.items()
+    }
+
+
+# ============================================================================
+# FUNÇÕES DE CÁLCULO DE MÉTRICAS
+# ============================================================================
+
+
+def calcular_quantil_ordenado(ordenados: np.ndarray, quantil: float) -> float:
+    """
+    Calcula um quantil por interpolação linear sobre um array já ordenado.
+    
+    Usa a mesma interpolação de Series.quantile (método 'linear').
+    
+    Args:
+        ordenados: Array numérico ordenado e não vazio
+        quantil: Quantil desejado, entre 0 e 1
+        
+    Returns:
+        Valor do quantil
+    """
+    posicao = quantil * (len(ordenados) - 1)
+    inferior = int(np.floor(posicao))
+    superior = min(inferior + 1, len(ordenados) - 1)
+    fracao = posicao - inferior
+    
+    valor_inferior = ordenados[inferior]
+    diferenca = ordenados[superior] - valor_inferior
+    if fracao < 0.5:
+        return valor_inferior + diferenca * fracao
+    return ordenados[superior] - diferenca * (1 - fracao)
+
+
+def calcular_metricas(dataframe: pd.DataFrame, dataframe_completo: pd.DataFrame,
+                      cubo: Optional[pd.DataFrame] = None,
+                      esboco: Optional[pd.DataFrame] = None) -> Dict:
+    """
+    Calcula as métricas principais do dashboard com análises estatísticas robustas.
+    
+    Todas as estatísticas de posição (mínimo, máximo, mediana e percentis)
+    saem de uma única ordenação dos salários; as médias por ano e a contagem
+    de cargos saem de uma única redução agrupada (np.bincount) cada. Se o
+    cubo for informado, média, desvio padrão e variação anual vêm dele; se o
+    esboço de quantis for informado, mediana e percentis são aproximados a
+    partir dele, sem ordenar os salários.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        dataframe_completo: DataFrame completo para comparações
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        esboco: Esboços de quantis já filtrados com os mesmos critérios (opcional)
+        
+    Returns:
+        Dicionário com as métricas calculadas
+    """
+    if dataframe.empty:
+        return dict(METRICAS_VAZIAS)
+    
+    salarios = dataframe['salario_usd'].to_numpy(dtype=np.float64)
+    total_registros = len(salarios)
+    
+    if esboco is not None:
+        # Quantis aproximados pelos esboços; mínimo e máximo continuam exatos
+        quantis = calcular_quantis_esboco(esboco, [0.25, 0.5, 0.75])
+        salario_minimo, salario_maximo = salarios.min(), salarios.max()
+        percentil_25, salario_mediano, percentil_75 = quantis[0.25], quantis[0.5], quantis[0.75]
+    else:
+        # Estatísticas de posição a partir de uma única ordenação
+        ordenados = np.sort(salarios)
+        salario_minimo, salario_maximo = ordenados[0], ordenados[-1]
+        meio = total_registros // 2
+        if total_registros % 2:
+            salario_mediano = ordenados[meio]
+        else:
+            salario_mediano = (ordenados[meio - 1] + ordenados[meio]) / 2
+        percentil_25 = calcular_quantil_ordenado(ordenados, 0.25)
+        percentil_75 = calcular_quantil_ordenado(ordenados, 0.75)
+    
+    if cubo is not None:
+        estatisticas_cubo = calcular_estatisticas_cubo(cubo)
+        salario_medio = estatisticas_cubo['salario_medio']
+        desvio_padrao = estatisticas_cubo['desvio_padrao']
+        variacao = estatisticas_cubo['variacao_ano_anterior']
+    else:
+        # Média e desvio padrão amostral (mesma fórmula de duas passagens do pandas)
+        salario_medio = salarios.sum() / total_registros
+        if total_registros > 1:
+            desvio_padrao = np.sqrt(((salario_medio - salarios) ** 2).sum() / (total_registros - 1))
+        else:
+            desvio_padrao = np.nan
+        
+        # Médias por ano em uma única redução agrupada
+        anos = dataframe['ano'].to_numpy()
+        ano_minimo = anos.min()
+        contagem_por_ano = np.bincount(anos - ano_minimo)
+        soma_por_ano = np.bincount(anos - ano_minimo, weights=salarios)
+        anos_presentes = np.flatnonzero(contagem_por_ano)
+        
+        variacao = 0
+        if len(anos_presentes) >= 2:
+            atual, anterior = anos_presentes[-1], anos_presentes[-2]
+            variacao = calcular_diferenca_percentual(
+                soma_por_ano[atual] / contagem_por_ano[atual],
+                soma_por_ano[anterior] / contagem_por_ano[anterior]
+            )
+    
+    # Frequência de cargos a partir dos códigos inteiros
+    cargos = dataframe['cargo']
+    if isinstance(cargos.dtype, pd.CategoricalDtype):
+        codigos, valores_cargo = cargos.cat.codes.to_numpy(), cargos.cat.categories
+    else:
+        codigos, valores_cargo = pd.factorize(cargos, sort=True)
+    contagem_por_cargo = np.bincount(codigos[codigos >= 0], minlength=len(valores_cargo))
+    
+    return {
+        'salario_medio': salario_medio,
+        'salario_mediano': salario_mediano,
+        'salario_minimo': salario_minimo,
+        'salario_maximo': salario_maximo,
+        'desvio_padrao': desvio_padrao,
+        'percentil_25': percentil_25,
+        'percentil_75': percentil_75,
+        'total_registros': total_registros,
+        'cargo_mais_frequente': valores_cargo[contagem_por_cargo.argmax()] if contagem_por_cargo.any() else "",
+        'variacao_ano_anterior': variacao,
+        'numero_cargos_unicos': int(np.count_nonzero(contagem_por_cargo))
+    }
+
+
+# ============================================================================
+# FUNÇÕES DE ARMAZENAMENTO SQL
+# ============================================================================
+# No modo SQL os dados processados ficam em um banco SQLite em disco, sem
+# servidor, junto com o cubo e os esboços de quantis calculados na carga. Os
+# filtros viram uma cláusula WHERE parametrizada e as agregações (cubo,
+# esboços, extremos, histograma e páginas da tabela) rodam no banco: apenas
+# resultados pequenos chegam ao Python.
+
+
+def obter_caminho_banco_sql(chave: str) -> Path:
+    """
+    Retorna o caminho do banco SQLite correspondente a uma chave.
+    
+    Args:
+        chave: Chave calculada por calcular_chave_cache
+        
+    Returns:
+        Caminho do arquivo SQLite no diretório de cache
+    """
+    return DIRETORIO_CACHE / f"{PREFIXO_BANCO_SQL}{chave}.sqlite"
+
+
+def gravar_tabela_agregada_sql(conexao: sqlite3.Connection, nome: str,
+                               agregado: pd.DataFrame, chave: List[str]) -> None:
+    """
+    Grava um agregado (cubo ou esboços) como tabela ordenada pela chave primária.
+    
+    As colunas fora da chave que não são somadas são descartadas, e as
+    linhas são combinadas pela chave com combinar_momentos. A tabela é
+    WITHOUT ROWID, de modo que as linhas ficam gravadas na ordem da chave.
+    
+    Args:
+        conexao: Conexão com o banco em construção
+        nome: Nome da tabela
+        agregado: Agregado com as colunas da chave e as colunas de contagem e somas
+        chave: Colunas da chave primária, na ordem de gravação
+    """
+    valores = [coluna for coluna in ('contagem', 'soma', 'm2') if coluna in agregado.columns]
+    tabela = combinar_momentos(agregado[chave + valores], chave, ordenar=True)
+    
+    definicoes = []
+    for coluna in chave + valores:
+        if pd.api.types.is_integer_dtype(tabela[coluna].dtype):
+            tipo = 'INTEGER'
+        elif pd.api.types.is_float_dtype(tabela[coluna].dtype):
+            tipo = 'REAL'
+        else:
+            tipo = 'TEXT'
+            tabela[coluna] = tabela[coluna].astype(object)
+        definicoes.append(f'"{coluna}" {tipo}')
+    
+    chave_primaria = ', '.join(f'"{coluna}"' for coluna in chave)
+    conexao.execute(f"CREATE TABLE {nome} ({', '.join(definicoes)}, PRIMARY KEY ({chave_primaria})) WITHOUT ROWID")
+    tabela.to_sql(nome, conexao, if_exists='append', index=False)
+
+
+def criar_banco_sql(url: str, caminho_destino: Path, tamanho_bloco: int = TAMANHO_BLOCO_SQL) -> int:
+    """
+    Carrega a fonte em um banco SQLite, bloco a bloco.
+    
+    Cada bloco é traduzido e limpo isoladamente, anexado à tabela de dados
+    (com o balde do esboço de quantis de cada salário) e somado ao cubo e aos
+    esboços acumulados, gravados em suas tabelas ao final. Em seguida são
+    criados os índices de COLUNAS_INDICE_SQL e as estatísticas do planejador. O pico de memória depende do tamanho do bloco e do número de
+    células do cubo, não do tamanho do arquivo, e a escrita é atômica
+    (arquivo temporário + rename).
+    
+    Args:
+        url: Caminho local do arquivo de origem (ver resolver_fonte)
+        caminho_destino: Caminho do banco a ser gravado
+        tamanho_bloco: Número de linhas lidas por bloco
+        
+    Returns:
+        Número de linhas gravadas
+    """
+    caminho_destino = Path(caminho_destino)
+    caminho_destino.parent.mkdir(parents=True, exist_ok=True)
+    caminho_temporario = caminho_destino.with_suffix('.tmp')
+    caminho_temporario.unlink(missing_ok=True)
+    acumulador = criar_acumulador_agregados(tamanho_bloco)
+    total_linhas = 0
+    
+    try:
+        with closing(sqlite3.connect(caminho_temporario)) as conexao:
+            # O arquivo só é publicado completo, então o diário de transações é dispensável
+            conexao.execute("PRAGMA journal_mode = OFF")
+            conexao.execute("PRAGMA synchronous = OFF")
+            
+            for bloco in ler_fonte_em_blocos(url, tamanho_bloco):
+                bloco = transformar_dados(bloco, usar_categorias=False)
+                # Sem esquema fixo no SQLite: cada bloco mantém salários inteiros em int64
+                bloco['salario_usd'] = bloco['salario_usd'].astype(escolher_tipo_salario(bloco['salario_usd']))
+                bloco['balde'] = calcular_baldes_esboco(bloco['salario_usd'].to_numpy())
+                bloco.to_sql(TABELA_SQL, conexao, if_exists='append', index=False)
+                acumular_agregados(acumulador, bloco.drop(columns='balde'))
+                total_linhas += len(bloco)
+            
+            agregados = finalizar_agregados(acumulador)
+            if agregados['cubo'] is None:
+                raise ValueError("A fonte de dados não possui linhas válidas")
+            gravar_tabela_agregada_sql(conexao, TABELA_CUBO_SQL, agregados['cubo'], CHAVE_CUBO_SQL)
+            gravar_tabela_agregada_sql(conexao, TABELA_ESBOCOS_SQL, agregados['esbocos'], CHAVE_ESBOCOS_SQL)
+            
+            for coluna in COLUNAS_INDICE_SQL:
+                conexao.execute(f'CREATE INDEX "indice_{coluna}" ON {TABELA_SQL} ("{coluna}")')
+            conexao.execute("ANALYZE")
+            conexao.commit()
+        
+        os.replace(caminho_temporario, caminho_destino)
+    finally:
+        caminho_temporario.unlink(missing_ok=True)
+    
+    return total_linhas
+
+
+def obter_banco_sql(url: str, tamanho_bloco: int = TAMANHO_BLOCO_INGESTAO) -> Path:
+    """
+    Retorna o banco SQLite da fonte, criando-o se necessário.
+    
+    O banco é identificado pela mesma chave do cache em disco (hash da fonte,
+    traduções e versão do pipeline); bancos de versões anteriores são removidos.
+    
+    Args:
+        url: URL ou caminho local do arquivo de origem
+        tamanho_bloco: Linhas por bloco na carga (0 usa TAMANHO_BLOCO_SQL)
+        
+    Returns:
+        Caminho do banco SQLite
+    """
+    caminho_fonte = resolver_fonte(url)
+    chave = calcular_chave_cache(calcular_hash_fonte(caminho_fonte), {'armazenamento': 'sql'})
+    caminho = obter_caminho_banco_sql(chave)
+    
+    if not caminho.exists():
+        criar_banco_sql(caminho_fonte, caminho, tamanho_bloco or TAMANHO_BLOCO_SQL)
+        for arquivo_antigo in DIRETORIO_CACHE.glob(f"{PREFIXO_BANCO_SQL}*.sqlite"):
+            if arquivo_antigo != caminho:
+                arquivo_antigo.unlink(missing_ok=True)
+    
+    return caminho
+
+
+class CombinadorMomentosSQL:
+    """
+    Função de agregação SQL combinar_m2(contagem, soma, m2) do banco.
+    
+    Combina as células de cada grupo uma a uma pela fórmula paralela de
+    Chan, como combinar_momentos, e devolve o m2 do grupo.
+    """
+    
+    def __init__(self):
+        self.contagem = 0
+        self.media = 0.0
+        self.m2 = 0.0
+    
+    def step(self, contagem, soma, m2):
+        if not contagem:
+            return
+        total = self.contagem + contagem
+        delta = soma / contagem - self.media
+        self.media += delta * contagem / total
+        self.m2 += m2 + delta * delta * self.contagem * contagem / total
+        self.contagem = total
+    
+    def finalize(self):
+        return self.m2
+
+
+def executar_consulta_sql(caminho: Path, consulta: str, parametros: Optional[List] = None) -> pd.DataFrame:
+    """
+    Executa uma consulta no banco SQLite, aberto somente para leitura.
+    
+    Cada consulta usa a sua própria conexão, de modo que sessões em threads
+    diferentes não compartilham estado do SQLite. A conexão registra a
+    agregação combinar_m2 (CombinadorMomentosSQL).
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        consulta: Consulta SQL, com marcadores ? para os parâmetros
+        parametros: Valores dos marcadores (opcional)
+        
+    Returns:
+        DataFrame com o resultado da consulta
+    """
+    uri = f"{Path(caminho).resolve().as_uri()}?mode=ro"
+    with closing(sqlite3.connect(uri, uri=True)) as conexao:
+        conexao.create_aggregate('combinar_m2', 3, CombinadorMomentosSQL)
+        return pd.read_sql_query(consulta, conexao, params=parametros or [])
+
+
+@functools.lru_cache(maxsize=None)
+def listar_colunas_sql(caminho: Path) -> List[str]:
+    """
+    Lista as colunas de dados da tabela do banco, na ordem do DataFrame processado.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        
+    Returns:
+        Nomes das colunas, sem a coluna interna do balde
+    """
+    colunas = executar_consulta_sql(caminho, f"SELECT name FROM pragma_table_info('{TABELA_SQL}')")
+    return [coluna for coluna in colunas['name'] if coluna != 'balde']
+
+
+def converter_parametro_sql(valor):
+    """
+    Converte escalares do NumPy nos tipos nativos aceitos pelo sqlite3.
+    
+    Args:
+        valor: Valor selecionado em um filtro
+        
+    Returns:
+        Valor nativo do Python
+    """
+    return valor.item() if isinstance(valor, np.generic) else valor
+
+
+def listar_opcoes_filtro(dataframe: pd.DataFrame) -> Dict[str, List]:
+    """
+    Lista os valores distintos de cada coluna de filtro.
+    
+    Args:
+        dataframe: DataFrame ou cubo completo
+        
+    Returns:
+        Dicionário coluna -> valores, na ordem de obter_opcoes_filtro
+    """
+    return {coluna: obter_opcoes_filtro(dataframe[coluna]) for coluna in COLUNAS_FILTRO.values()}
+
+
+def compilar_filtros_sql(filtros: Optional[Dict], opcoes: Optional[Dict[str, List]] = None) -> Tuple[str, List]:
+    """
+    Compila a seleção de filtros em uma cláusula WHERE parametrizada.
+    
+    Segue a semântica de consultar_indice_filtros: valores combinados com OU
+    dentro de cada dimensão e com E entre dimensões, filtro de cargos apenas
+    se houver algum cargo selecionado e dimensões com todos os valores
+    selecionados ignoradas (quando as opções são informadas). Os valores vão
+    sempre como parâmetros; os nomes de coluna vêm de COLUNAS_FILTRO.
+    
+    Args:
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+            (None não filtra nada)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        
+    Returns:
+        Tupla (cláusula WHERE, possivelmente vazia, e lista de parâmetros)
+    """
+    if filtros is None:
+        return '', []
+    
+    condicoes = []
+    parametros = []
+    for chave, coluna in COLUNAS_FILTRO.items():
+        selecionados = filtros.get(chave)
+        if chave == 'cargos' and not selecionados:
+            continue
+        
+        selecionados = list(dict.fromkeys(selecionados or []))
+        if opcoes is not None and coluna in opcoes and set(selecionados).issuperset(opcoes[coluna]):
+            continue
+        if not selecionados:
+            condicoes.append('0')
+            continue
+        
+        condicoes.append(f'"{coluna}" IN ({", ".join("?" * len(selecionados))})')
+        parametros.extend(converter_parametro_sql(valor) for valor in selecionados)
+    
+    if not condicoes:
+        return '', []
+    return f"WHERE {' AND '.join(condicoes)}", parametros
+
+
+def consultar_cubo_sql(caminho: Path, filtros: Optional[Dict] = None,
+                       opcoes: Optional[Dict[str, List]] = None,
+                       colunas: List[str] = DIMENSOES_CUBO_SQL) -> pd.DataFrame:
+    """
+    Calcula no banco o cubo de salários das linhas que atendem aos filtros.
+    
+    As células da tabela do cubo gravada na carga são somadas no banco
+    apenas pelas colunas informadas (roll-up), sem reler as linhas; o m2 é
+    combinado pela agregação combinar_m2. O resultado tem as colunas de
+    construir_cubo restritas a essas dimensões e pode ser usado no lugar do
+    cubo filtrado em calcular_metricas_agregadas, agrupar_e_calcular_media e
+    nos gráficos que agrupam por elas.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        colunas: Dimensões mantidas no resultado
+        
+    Returns:
+        DataFrame com uma linha por combinação ocupada das dimensões
+    """
+    clausula, parametros = compilar_filtros_sql(filtros, opcoes)
+    # Na ordem da chave primária, para que o agrupamento siga a ordem gravada
+    dimensoes = ', '.join(f'"{coluna}"' for coluna in sorted(colunas, key=CHAVE_CUBO_SQL.index))
+    cubo = executar_consulta_sql(
+        caminho,
+        f"SELECT {dimensoes}, SUM(contagem) AS contagem, SUM(soma) AS soma, "
+        f"combinar_m2(contagem, soma, m2) AS m2 FROM {TABELA_CUBO_SQL} {clausula} GROUP BY {dimensoes}",
+        parametros
+    )
+    return converter_para_categorias(cubo)
+
+
+def consultar_esbocos_sql(caminho: Path, filtros: Optional[Dict] = None,
+                          opcoes: Optional[Dict[str, List]] = None,
+                          colunas: List[str] = DIMENSOES_ESBOCO_SQL) -> pd.DataFrame:
+    """
+    Calcula no banco os esboços de quantis das linhas que atendem aos filtros.
+    
+    Os esboços de cada célula, gravados na carga, são somados no banco
+    apenas pelas colunas informadas, o que basta para calcular_quantis_esboco
+    e calcular_estatisticas_boxplot_esboco nessas dimensões e mantém o
+    resultado pequeno.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        colunas: Dimensões mantidas nos esboços
+        
+    Returns:
+        DataFrame com as colunas informadas, o balde e a contagem
+    """
+    clausula, parametros = compilar_filtros_sql(filtros, opcoes)
+    grupos = ', '.join(f'"{coluna}"' for coluna in sorted(colunas + ['balde'], key=CHAVE_ESBOCOS_SQL.index))
+    esboco = executar_consulta_sql(
+        caminho,
+        f"SELECT {grupos}, SUM(contagem) AS contagem FROM {TABELA_ESBOCOS_SQL} {clausula} GROUP BY {grupos}",
+        parametros
+    )
+    return converter_para_categorias(esboco)
+
+
+def consultar_extremos_sql(caminho: Path, filtros: Optional[Dict], esboco: pd.DataFrame,
+                           opcoes: Optional[Dict[str, List]] = None) -> Tuple[float, float]:
+    """
+    Calcula no banco o menor e o maior salário das linhas que atendem aos filtros.
+    
+    O esboço da mesma seleção indica os baldes extremos; pelo índice do
+    balde, apenas as linhas desses dois baldes são lidas, e os valores
+    retornados são exatos.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        esboco: Esboços da mesma seleção, de consultar_esbocos_sql
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        
+    Returns:
+        Tupla (mínimo, máximo); NaN se nenhuma linha atender aos filtros
+    """
+    baldes = esboco.loc[esboco['contagem'] > 0, 'balde']
+    if baldes.empty:
+        return np.nan, np.nan
+    
+    clausula, parametros = compilar_filtros_sql(filtros, opcoes)
+    condicao = f"{clausula} AND balde = ?" if clausula else "WHERE balde = ?"
+    extremos = executar_consulta_sql(
+        caminho,
+        f"SELECT (SELECT MIN(salario_usd) FROM {TABELA_SQL} INDEXED BY indice_balde {condicao}) AS minimo, "
+        f"(SELECT MAX(salario_usd) FROM {TABELA_SQL} INDEXED BY indice_balde {condicao}) AS maximo",
+        parametros + [int(baldes.min())] + parametros + [int(baldes.max())]
+    )
+    return float(extremos['minimo'].iloc[0]), float(extremos['maximo'].iloc[0])
+
+
+def calcular_histograma_sql(caminho: Path, filtros: Optional[Dict], minimo: float, maximo: float,
+                            opcoes: Optional[Dict[str, List]] = None,
+                            numero_bins: int = NUMERO_BINS_HISTOGRAMA) -> pd.DataFrame:
+    """
+    Calcula no banco o histograma de salários, com os mesmos bins de calcular_histograma.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        minimo: Menor salário da seleção (ver consultar_extremos_sql)
+        maximo: Maior salário da seleção
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        numero_bins: Número máximo de bins
+        
+    Returns:
+        DataFrame com inicio, fim, centro e contagem de cada bin
+    """
+    if not np.isfinite(minimo) or not np.isfinite(maximo):
+        return pd.DataFrame(columns=['inicio', 'fim', 'centro', 'contagem'])
+    
+    inicio, largura = calcular_inicio_e_largura_bins(minimo, maximo, numero_bins)
+    clausula, parametros = compilar_filtros_sql(filtros, opcoes)
+    por_bin = executar_consulta_sql(
+        caminho,
+        f"SELECT CAST((salario_usd - ?) / ? AS INTEGER) AS bin, COUNT(*) AS contagem "
+        f"FROM {TABELA_SQL} {clausula} GROUP BY bin",
+        [inicio, largura] + parametros
+    )
+    
+    contagens = np.zeros(int(por_bin['bin'].max()) + 1, dtype=np.int64)
+    contagens[por_bin['bin'].to_numpy()] = por_bin['contagem'].to_numpy()
+    return montar_histograma(inicio, largura, contagens)
+
+
+def montar_condicoes_tabela_sql(filtros: Optional[Dict], busca: str = '',
+                                opcoes: Optional[Dict[str, List]] = None) -> Tuple[str, List]:
+    """
+    Compila os filtros e a busca por cargo da tabela em uma cláusula WHERE.
+    
+    A busca segue buscar_cargo: o texto pode aparecer em qualquer posição do
+    cargo, sem diferenciar maiúsculas (apenas letras ASCII, como no LIKE do SQLite).
+    
+    Args:
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        busca: Texto buscado no cargo (opcional)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        
+    Returns:
+        Tupla (cláusula WHERE, possivelmente vazia, e lista de parâmetros)
+    """
+    clausula, parametros = compilar_filtros_sql(filtros, opcoes)
+    if not busca:
+        return clausula, parametros
+    
+    padrao = '%' + re.sub(r'([\\%_])', r'\\\1', busca) + '%'
+    condicao = "\"cargo\" LIKE ? ESCAPE '\\'"
+    clausula = f"{clausula} AND {condicao}" if clausula else f"WHERE {condicao}"
+    return clausula, parametros + [padrao]
+
+
+def contar_linhas_sql(caminho: Path, filtros: Optional[Dict], busca: str = '',
+                      opcoes: Optional[Dict[str, List]] = None) -> int:
+    """
+    Conta no banco as linhas da tabela detalhada.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        busca: Texto buscado no cargo (opcional)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        
+    Returns:
+        Número de linhas
+    """
+    clausula, parametros = montar_condicoes_tabela_sql(filtros, busca, opcoes)
+    total = executar_consulta_sql(caminho, f"SELECT COUNT(*) AS total FROM {TABELA_SQL} {clausula}", parametros)
+    return int(total['total'].iloc[0])
+
+
+def consultar_pagina_sql(caminho: Path, filtros: Optional[Dict], colunas: List[str],
+                         pagina: int, tamanho_pagina: int,
+                         coluna_ordenacao: Optional[str] = None, decrescente: bool = False,
+                         busca: str = '', opcoes: Optional[Dict[str, List]] = None) -> pd.DataFrame:
+    """
+    Consulta no banco uma página da tabela detalhada, apenas com as colunas escolhidas.
+    
+    A ordenação é desempatada pela ordem original das linhas, como a
+    ordenação estável de calcular_permutacao_ordenacao; as colunas
+    categóricas são ordenadas pelo texto.
+    
+    Args:
+        caminho: Caminho do banco criado por obter_banco_sql
+        filtros: Seleção de filtros (None consulta todas as linhas)
+        colunas: Colunas exibidas
+        pagina: Número da página, a partir de 1
+        tamanho_pagina: Linhas por página
+        coluna_ordenacao: Coluna de ordenação (None mantém a ordem original)
+        decrescente: Se True, ordena do maior para o menor
+        busca: Texto buscado no cargo (opcional)
+        opcoes: Valores distintos de cada coluna, de listar_opcoes_filtro (opcional)
+        
+    Returns:
+        DataFrame com no máximo tamanho_pagina linhas
+    """
+    colunas_tabela = set(listar_colunas_sql(caminho))
+    if not set(colunas) <= colunas_tabela or (coluna_ordenacao and coluna_ordenacao not in colunas_tabela):
+        raise ValueError("Coluna inexistente na tabela de dados")
+    
+    clausula, parametros = montar_condicoes_tabela_sql(filtros, busca, opcoes)
+    ordenacao = 'rowid'
+    if coluna_ordenacao:
+        ordenacao = f'"{coluna_ordenacao}" {"DESC" if decrescente else "ASC"}, rowid'
+    selecao = ', '.join(f'"{coluna}"' for coluna in colunas)
+    return executar_consulta_sql(
+        caminho,
+        f"SELECT {selecao} FROM {TABELA_SQL} {clausula} ORDER BY {ordenacao} LIMIT ? OFFSET ?",
+        parametros + [tamanho_pagina, (pagina - 1) * tamanho_pagina]
+    )
+
+
+def calcular_metricas_agregadas(cubo: pd.DataFrame, esboco: pd.DataFrame,
+                                minimo: float, maximo: float) -> Dict:
+    """
+    Calcula as métricas do dashboard apenas a partir de agregados.
+    
+    Equivale a calcular_metricas com cubo e esboço, sem as linhas: média,
+    desvio padrão, variação anual e frequência de cargos vêm do cubo, e
+    mediana e percentis do esboço de quantis.
+    
+    Args:
+        cubo: Cubo já filtrado (por exemplo, de consultar_cubo_sql)
+        esboco: Esboços de quantis já filtrados (por exemplo, de consultar_esbocos_sql)
+        minimo: Menor salário da seleção
+        maximo: Maior salário da seleção
+        
+    Returns:
+        Dicionário com as métricas calculadas
+    """
+    if cubo.empty:
+        return dict(METRICAS_VAZIAS)
+    
+    estatisticas_cubo = calcular_estatisticas_cubo(cubo)
+    quantis = calcular_quantis_esboco(esboco, [0.25, 0.5, 0.75])
+    por_cargo = agregar_cubo(cubo, ['cargo'])
+    
+    return {
+        'salario_medio': estatisticas_cubo['salario_medio'],
+        'salario_mediano': quantis[0.5],
+        'salario_minimo': minimo,
+        'salario_maximo': maximo,
+        'desvio_padrao': estatisticas_cubo['desvio_padrao'],
+        'percentil_25': quantis[0.25],
+        'percentil_75': quantis[0.75],
+        'total_registros': estatisticas_cubo['total_registros'],
+        'cargo_mais_frequente': por_cargo['cargo'].iloc[por_cargo['contagem'].to_numpy().argmax()],
+        'variacao_ano_anterior': estatisticas_cubo['variacao_ano_anterior'],
+        'numero_cargos_unicos': len(por_cargo)
+    }
+
+
+def montar_estatisticas_descritivas(metricas: Dict) -> pd.Series:
+    """
+    Monta as estatísticas descritivas dos salários a partir das métricas.
+    
+    Tem o mesmo formato de Series.describe, para quando as linhas não estão
+    em memória (modo SQL); os quartis são os das métricas.
+    
+    Args:
+        metricas: Métricas de calcular_metricas ou calcular_metricas_agregadas
+        
+    Returns:
+        Series com count, mean, std, min, 25%, 50%, 75% e max
+    """
+    return pd.Series({
+        'count': float(metricas['total_registros']),
+        'mean': metricas['salario_medio'],
+        'std': metricas['desvio_padrao'],
+        'min': metricas['salario_minimo'],
+        '25%': metricas['percentil_25'],
+        '50%': metricas['salario_mediano'],
+        '75%': metricas['percentil_75'],
+        'max': metricas['salario_maximo']
+    }, name='salario_usd')
+
+
+# ============================================================================
+# FUNÇÕES AUXILIARES REUTILIZÁVEIS
+# ============================================================================
+
+
+def validar_dataframe(dataframe: pd.DataFrame) -> bool:
+    """
+    Valida se o DataFrame não está vazio.
+    
+    Args:
+        dataframe: DataFrame a ser validado
+        
+    Returns:
+        True se o DataFrame não estiver vazio, False caso contrário
+    """
+    return not dataframe.empty
+
+
+def aplicar_layout_padrao(grafico, xaxis_title: str = None, yaxis_title: str = None, 
+                          showlegend: bool = True, **kwargs) -> None:
+    """
+    Aplica layout padrão aos gráficos Plotly.
+    
+    Args:
+        grafico: Objeto do gráfico Plotly
+        xaxis_title: Título do eixo X (opcional)
+        yaxis_title: Título do eixo Y (opcional)
+        showlegend: Se deve mostrar a legenda
+        **kwargs: Argumentos adicionais para update_layout
+    """
+    layout_config = {
+        'title_x': 0.1,
+        'showlegend': showlegend
+    }
+    
+    if xaxis_title:
+        layout_config['xaxis_title'] = xaxis_title
+    if yaxis_title:
+        layout_config['yaxis_title'] = yaxis_title
+    
+    layout_config.update(kwargs)
+    grafico.update_layout(**layout_config)
+
+
+def formatar_moeda(valor: float) -> str:
+    """
+    Formata um valor numérico como moeda em USD.
+    
+    Args:
+        valor: Valor numérico a ser formatado
+        
+    Returns:
+        String formatada como moeda
+    """
+    return f"${valor:,.0f}"
+
+
+def calcular_diferenca_percentual(valor_atual: float, valor_anterior: float) -> float:
+    """
+    Calcula a diferença percentual entre dois valores.
+    
+    Args:
+        valor_atual: Valor atual
+        valor_anterior: Valor anterior
+        
+    Returns:
+        Diferença percentual (0 se valor_anterior for 0)
+    """
+    if valor_anterior == 0:
+        return 0.0
+    return ((valor_atual - valor_anterior) / valor_anterior) * 100
+
+
+def agrupar_e_calcular_media(dataframe: pd.DataFrame, coluna_agrupamento: str, 
+                            coluna_calculo: str = 'salario_usd',
+                            cubo: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Agrupa dados e calcula média de forma padronizada.
+    
+    Sem o cubo, a soma e a contagem por grupo vêm do backend de cálculo
+    configurado.
+    
+    Args:
+        dataframe: DataFrame com os dados
+        coluna_agrupamento: Coluna para agrupar
+        coluna_calculo: Coluna para calcular a média
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        
+    Returns:
+        DataFrame agrupado com média calculada
+    """
+    if cubo is not None and coluna_calculo == 'salario_usd' and coluna_agrupamento in DIMENSOES_CUBO:
+        agregado = agregar_cubo(cubo, [coluna_agrupamento])
+        return agregado[[coluna_agrupamento, 'media']].rename(columns={'media': coluna_calculo})
+    
+    agregado = (
+        obter_backend()['agregar_grupos'](dataframe, [coluna_agrupamento], coluna_calculo)
+        .sort_values(coluna_agrupamento)
+        .reset_index(drop=True)
+    )
+    agregado[coluna_calculo] = agregado['soma'] / agregado['contagem']
+    return agregado[[coluna_agrupamento, coluna_calculo]]
+
+
+def tornar_somente_leitura(objeto):
+    """
+    Marca como somente leitura todos os arrays do NumPy de uma estrutura.
+    
+    Percorre dicionários, listas e tuplas. Uma escrita posterior em qualquer
+    dos arrays levanta ValueError, o que protege estruturas compartilhadas
+    entre sessões, como o índice de filtros.
+    
+    Args:
+        objeto: Array ou estrutura com arrays
+        
+    Returns:
+        O próprio objeto
+    """
+    if isinstance(objeto, np.ndarray):
+        objeto.flags.writeable = False
+    elif isinstance(objeto, dict):
+        for valor in objeto.values():
+            tornar_somente_leitura(valor)
+    elif isinstance(objeto, (list, tuple)):
+        for valor in objeto:
+            tornar_somente_leitura(valor)
+    return objeto
+
+
+# ============================================================================
+# FUNÇÕES DE INSTRUMENTAÇÃO
+# ============================================================================
+
+# Medições da execução (rerun) em andamento; cada sessão do Streamlit roda em
+# sua própria thread, então o contexto não é compartilhado entre sessões
+EXECUCAO_ATUAL = contextvars.ContextVar('execucao_atual', default=None)
+
+# O tracemalloc é global ao processo: ele fica ativo enquanto houver alguma
+# execução rastreando memória, e o seu pico é compartilhado por todas as
+# etapas abertas (de todas as sessões e threads), guardadas na lista abaixo
+TRAVA_RASTREAMENTO = threading.Lock()
+TRAVA_LOG_DESEMPENHO = threading.Lock()
+execucoes_rastreando_memoria = 0
+etapas_rastreando_memoria = []
+
+
+def iniciar_medicoes(rastrear_memoria: bool = False) -> None:
+    """
+    Inicia a coleta das medições de uma execução do dashboard.
+    
+    Args:
+        rastrear_memoria: Se deve medir o pico de memória de cada etapa com
+            tracemalloc (mais preciso, porém deixa a execução mais lenta)
+    """
+    global execucoes_rastreando_memoria
+    
+    if rastrear_memoria:
+        with TRAVA_RASTREAMENTO:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            execucoes_rastreando_memoria += 1
+    
+    EXECUCAO_ATUAL.set({
+        'id': uuid.uuid4().hex,
+        'data': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+        'inicio': time.perf_counter(),
+        'rastrear_memoria': rastrear_memoria,
+        'etapas': [],
+        'abertas': []
+    })
+
+
+@contextmanager
+def medir_etapa(nome: str):
+    """
+    Mede o tempo e o pico de memória de um trecho da execução atual.
+    
+    Sem uma execução iniciada por iniciar_medicoes, não mede nada. Etapas
+    podem ser aninhadas: o pico de uma etapa inclui o das etapas internas.
+    
+    O pico de memória é do processo: como o tracemalloc é global, ele inclui
+    as alocações feitas no mesmo intervalo por outras sessões e pelas
+    threads dos gráficos. Antes de cada tracemalloc.reset_peak, o pico
+    corrente é repassado a todas as etapas abertas no processo, de modo que
+    uma etapa nunca perde o pico medido enquanto estava aberta.
+    
+    Args:
+        nome: Nome da etapa no painel e no log
+    """
+    execucao = EXECUCAO_ATUAL.get()
+    if execucao is None:
+        yield
+        return
+    
+    abertas = execucao['abertas']
+    etapa = {'etapa': nome, 'nivel': len(abertas)}
+    
+    if execucao['rastrear_memoria']:
+        with TRAVA_RASTREAMENTO:
+            memoria_atual, pico = tracemalloc.get_traced_memory()
+            # Preservar o pico das etapas abertas (desta e de outras execuções) antes de zerá-lo
+            for aberta in etapas_rastreando_memoria:
+                aberta['pico_bytes'] = max(aberta['pico_bytes'], pico)
+            tracemalloc.reset_peak()
+            etapa['memoria_inicial'] = memoria_atual
+            etapa['pico_bytes'] = memoria_atual
+            etapas_rastreando_memoria.append(etapa)
+    
+    abertas.append(etapa)
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        fim = time.perf_counter()
+        abertas.pop()
+        
+        medicao = {
+            'etapa': nome,
+            'nivel': etapa['nivel'],
+            'inicio_ms': (inicio - execucao['inicio']) * 1000,
+            'tempo_ms': (fim - inicio) * 1000,
+            'pico_memoria_mb': None
+        }
+        if execucao['rastrear_memoria']:
+            with TRAVA_RASTREAMENTO:
+                _, pico = tracemalloc.get_traced_memory()
+                pico = max(pico, etapa['pico_bytes'])
+                # Remover pela identidade: etapas de outras threads podem ser iguais
+                etapas_rastreando_memoria[:] = [
+                    aberta for aberta in etapas_rastreando_memoria if aberta is not etapa
+                ]
+                for aberta in etapas_rastreando_memoria:
+                    aberta['pico_bytes'] = max(aberta['pico_bytes'], pico)
+            medicao['pico_memoria_mb'] = (pico - etapa['memoria_inicial']) / (1024 * 1024)
+        
+        execucao['etapas'].append(medicao)
+
+
+def executar_medindo(funcao, *args, **kwargs):
+    """
+    Executa uma função como uma etapa medida, com o nome da própria função.
+    
+    Args:
+        funcao: Função a executar
+        *args: Argumentos posicionais da função
+        **kwargs: Argumentos nomeados da função
+        
+    Returns:
+        O retorno da função
+    """
+    with medir_etapa(funcao.__name__):
+        return funcao(*args, **kwargs)
+
+
+def copiar_contexto_medicoes() -> contextvars.Context:
+    """
+    Copia o contexto atual para executar uma etapa medida em outra thread.
+    
+    A cópia compartilha a lista de etapas da execução atual, mas tem sua
+    própria pilha de etapas abertas, para que etapas de threads diferentes
+    não se aninhem umas nas outras.
+    
+    Returns:
+        Contexto a usar com Context.run na thread de destino
+    """
+    contexto = contextvars.copy_context()
+    execucao = contexto.get(EXECUCAO_ATUAL)
+    if execucao is not None:
+        contexto.run(EXECUCAO_ATUAL.set, {**execucao, 'abertas': list(execucao['abertas'])})
+    return contexto
+
+
+def registrar_log_desempenho(registro: Dict, caminho: Optional[str] = None) -> None:
+    """
+    Acrescenta as medições de uma execução ao log em formato JSON Lines.
+    
+    Args:
+        registro: Medições retornadas por finalizar_medicoes
+        caminho: Arquivo de log (padrão: ARQUIVO_LOG_DESEMPENHO)
+    """
+    caminho = caminho or ARQUIVO_LOG_DESEMPENHO
+    if not caminho:
+        return
+    
+    linha = json.dumps(registro, ensure_ascii=False) + '\n'
+    try:
+        with TRAVA_LOG_DESEMPENHO, open(caminho, 'a', encoding='utf-8') as arquivo:
+            arquivo.write(linha)
+    except OSError:
+        # Falha no log não deve impedir o funcionamento do dashboard
+        pass
+
+
+def finalizar_medicoes(contexto: Optional[Dict] = None) -> Optional[Dict]:
+    """
+    Encerra a coleta da execução atual e grava as medições no log.
+    
+    Args:
+        contexto: Informações extras da execução (por exemplo, número de linhas)
+        
+    Returns:
+        Dicionário com o id, a data, o tempo total e as etapas em ordem de
+        início, ou None se não houver execução iniciada
+    """
+    global execucoes_rastreando_memoria
+    
+    execucao = EXECUCAO_ATUAL.get()
+    if execucao is None:
+        return None
+    EXECUCAO_ATUAL.set(None)
+    
+    if execucao['rastrear_memoria']:
+        with TRAVA_RASTREAMENTO:
+            execucoes_rastreando_memoria -= 1
+            if execucoes_rastreando_memoria <= 0 and tracemalloc.is_tracing():
+                execucoes_rastreando_memoria = 0
+                tracemalloc.stop()
+    
+    registro = {
+        'id': execucao['id'],
+        'data': execucao['data'],
+        'total_ms': (time.perf_counter() - execucao['inicio']) * 1000,
+        'rastreou_memoria': execucao['rastrear_memoria'],
+        **(contexto or {}),
+        'etapas': sorted(execucao['etapas'], key=lambda etapa: etapa['inicio_ms'])
+    }
+    registrar_log_desempenho(registro)
+    return registro
+
+
+# ============================================================================
+# FUNÇÕES DE CACHE DE GRÁFICOS
+# ============================================================================
+
+
+def criar_cache_lru(limite_entradas: int, limite_bytes: int, ttl: float) -> Dict:
+    """
+    Cria um cache LRU limitado por número de entradas, tamanho e tempo de vida.
+    
+    Args:
+        limite_entradas: Número máximo de entradas
+        limite_bytes: Soma máxima dos tamanhos informados na inserção
+        ttl: Tempo de vida de cada entrada em segundos (0 desativa)
+        
+    Returns:
+        Dicionário com as entradas, a trava e os contadores do cache
+    """
+    return {
+        'entradas': OrderedDict(),
+        'trava': threading.Lock(),
+        'limite_entradas': limite_entradas,
+        'limite_bytes': limite_bytes,
+        'ttl': ttl,
+        'bytes': 0,
+        'acertos': 0,
+        'falhas': 0,
+        'expirados': 0,
+        'removidos': 0
+    }
+
+
+def consultar_cache_lru(cache: Dict, chave: str):
+    """
+    Consulta uma entrada do cache, marcando-a como usada recentemente.
+    
+    Args:
+        cache: Cache criado por criar_cache_lru
+        chave: Chave da entrada
+        
+    Returns:
+        Valor armazenado ou None se ausente ou expirado
+    """
+    with cache['trava']:
+        entrada = cache['entradas'].get(chave)
+        if entrada is None:
+            cache['falhas'] += 1
+            return None
+        
+        valor, tamanho, validade = entrada
+        if validade is not None and time.monotonic() > validade:
+            del cache['entradas'][chave]
+            cache['bytes'] -= tamanho
+            cache['expirados'] += 1
+            cache['falhas'] += 1
+            return None
+        
+        cache['entradas'].move_to_end(chave)
+        cache['acertos'] += 1
+        return valor
+
+
+def inserir_cache_lru(cache: Dict, chave: str, valor, tamanho: int) -> None:
+    """
+    Insere uma entrada no cache, removendo as menos usadas se os limites forem excedidos.
+    
+    Args:
+        cache: Cache criado por criar_cache_lru
+        chave: Chave da entrada
+        valor: Valor a armazenar (não deve ser modificado depois de inserido)
+        tamanho: Tamanho aproximado do valor em bytes
+    """
+    if tamanho > cache['limite_bytes']:
+        return
+    
+    validade = time.monotonic() + cache['ttl'] if cache['ttl'] else None
+    with cache['trava']:
+        entradas = cache['entradas']
+        anterior = entradas.pop(chave, None)
+        if anterior is not None:
+            cache['bytes'] -= anterior[1]
+        
+        entradas[chave] = (valor, tamanho, validade)
+        cache['bytes'] += tamanho
+        
+        while len(entradas) > cache['limite_entradas'] or cache['bytes'] > cache['limite_bytes']:
+            _, (_, tamanho_removido, _) = entradas.popitem(last=False)
+            cache['bytes'] -= tamanho_removido
+            cache['removidos'] += 1
+
+
+def obter_estatisticas_cache_lru(cache: Dict) -> Dict:
+    """
+    Retorna os contadores e a ocupação do cache.
+    
+    Args:
+        cache: Cache criado por criar_cache_lru
+        
+    Returns:
+        Dicionário com entradas, tamanho em MB, acertos, falhas, expirados e removidos
+    """
+    with cache['trava']:
+        return {
+            'entradas': len(cache['entradas']),
+            'tamanho_mb': cache['bytes'] / (1024 * 1024),
+            'acertos': cache['acertos'],
+            'falhas': cache['falhas'],
+            'expirados': cache['expirados'],
+            'removidos': cache['removidos']
+        }
+
+
+def calcular_impressao_filtros(filtros: Dict, versao: str, **opcoes) -> str:
+    """
+    Calcula uma impressão digital canônica de uma seleção de filtros.
+    
+    A ordem em que os valores foram selecionados não altera a impressão, de
+    modo que a mesma seleção feita por sessões diferentes gera a mesma chave.
+    
+    Args:
+        filtros: Dicionário no formato retornado por criar_barra_lateral_filtros
+        versao: Versão dos dados, obtida com obter_versao_dados
+        **opcoes: Outras opções que alteram os gráficos (por exemplo, quantis aproximados)
+        
+    Returns:
+        Hash SHA-256 em hexadecimal
+    """
+    canonico = {
+        'versao': versao,
+        'filtros': {chave: sorted(str(valor) for valor in (valores or [])) for chave, valores in filtros.items()},
+        'opcoes': opcoes
+    }
+    return hashlib.sha256(json.dumps(canonico, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def estimar_tamanho_resultado(resultado) -> int:
+    """
+    Estima a memória ocupada por um resultado guardado na sessão.
+    
+    Args:
+        resultado: Array, DataFrame, Series ou valor simples
+        
+    Returns:
+        Tamanho aproximado em bytes
+    """
+    if isinstance(resultado, np.ndarray):
+        return resultado.nbytes
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return int(np.sum(resultado.memory_usage(index=True, deep=False)))
+    return 64
+
+
+def estimar_tamanho_grafico(grafico) -> int:
+    """
+    Estima a memória ocupada pelos dados de um gráfico Plotly.
+    
+    Soma o tamanho dos arrays e listas dos traços, sem serializar a figura.
+    
+    Args:
+        grafico: Figura Plotly
+        
+    Returns:
+        Tamanho aproximado em bytes
+    """
+    def medir(valor) -> int:
+        if isinstance(valor, np.ndarray):
+            return valor.nbytes
+        if isinstance(valor, dict):
+            return sum(medir(item) for item in valor.values())
+        if isinstance(valor, (list, tuple)):
+            return 8 * len(valor) + sum(medir(item) for item in valor if isinstance(item, (dict, list, tuple)))
+        if isinstance(valor, str):
+            return len(valor)
+        return 8
+    
+    return sum(medir(traco.to_plotly_json()) for traco in grafico.data) + 4096
+
+
+# ============================================================================
+# FUNÇÕES DE PAGINAÇÃO DA TABELA
+# ============================================================================
+
+
+def calcular_permutacao_ordenacao(dataframe: pd.DataFrame, coluna: str,
+                                  decrescente: bool = False) -> np.ndarray:
+    """
+    Calcula as posições das linhas do DataFrame ordenadas por uma coluna.
+    
+    Colunas categóricas são ordenadas pela ordem das categorias. A ordenação
+    é estável e valores ausentes ficam no final nos dois sentidos. As
+    posições usam int32 sempre que cabem, com metade da memória de int64,
+    pois a permutação fica guardada na sessão.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        coluna: Coluna de ordenação
+        decrescente: Se True, ordena do maior para o menor
+        
+    Returns:
+        Array com as posições das linhas na ordem desejada
+    """
+    serie = dataframe[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos = serie.cat.codes.to_numpy()
+    elif pd.api.types.is_numeric_dtype(serie.dtype):
+        codigos = None
+        chaves = serie.to_numpy(dtype='float64', na_value=np.nan)
+    else:
+        codigos = pd.factorize(serie, sort=True)[0]
+    
+    if codigos is not None:
+        chaves = np.where(codigos < 0, np.nan, codigos.astype('float64'))
+    if decrescente:
+        chaves = -chaves
+    ordem = np.argsort(chaves, kind='stable')
+    if len(ordem) <= np.iinfo(np.int32).max:
+        ordem = ordem.astype(np.int32)
+    return ordem
+
+
+def buscar_cargo(dataframe: pd.DataFrame, texto: str) -> np.ndarray:
+    """
+    Identifica as linhas cujo cargo contém o texto, sem diferenciar maiúsculas.
+    
+    Para a coluna categórica, a busca é feita apenas nas categorias e o
+    resultado é expandido para as linhas pelos códigos.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        texto: Texto buscado
+        
+    Returns:
+        Máscara booleana com uma posição por linha
+    """
+    serie = dataframe['cargo']
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        encontrados = serie.cat.categories.str.contains(texto, case=False, regex=False)
+        # O código -1 (valor ausente) aponta para o False acrescentado no final
+        return np.append(np.asarray(encontrados, dtype=bool), False)[serie.cat.codes.to_numpy()]
+    return serie.str.contains(texto, case=False, regex=False, na=False).to_numpy(dtype=bool)
+
+
+def selecionar_pagina(dataframe: pd.DataFrame, posicoes: np.ndarray, pagina: int,
+                      tamanho_pagina: int, colunas: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Extrai uma página da tabela, apenas com as colunas escolhidas.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        posicoes: Posições das linhas na ordem de exibição
+        pagina: Número da página, a partir de 1
+        tamanho_pagina: Linhas por página
+        colunas: Colunas exibidas (se None, todas)
+        
+    Returns:
+        DataFrame com no máximo tamanho_pagina linhas
+    """
+    inicio = (pagina - 1) * tamanho_pagina
+    linhas = posicoes[inicio:inicio + tamanho_pagina]
+    if colunas is None:
+        return dataframe.iloc[linhas]
+    return dataframe.iloc[linhas, dataframe.columns.get_indexer(colunas)]
+
+
+# ============================================================================
+# FUNÇÕES DE VISUALIZAÇÃO
+# ============================================================================
+
+
+def carregar_plotly() -> None:
+    """
+    Importa plotly.express e plotly.graph_objects na primeira construção de gráfico.
+    
+    Mantém a importação do núcleo leve para quem usa apenas o processamento e
+    as métricas (scripts em lote, testes e processos de trabalho).
+    """
+    global px, go
+    if go is None:
+        px = importlib.import_module('plotly.express')
+        go = importlib.import_module('plotly.graph_objects')
+
+
+def criar_grafico_top_cargos(dataframe: pd.DataFrame,
+                             cubo: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria gráfico de barras horizontal com os top 10 cargos por salário médio.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe):
+        return None
+    
+    top_cargos = (
+        agrupar_e_calcular_media(dataframe, 'cargo', cubo=cubo)
+        .set_index('cargo')['salario_usd']
+        .nlargest(TOP_CARGOS_LIMITE)
+        .sort_values(ascending=True)
+        .reset_index()
+    )
+    
+    grafico = px.bar(
+        top_cargos,
+        x='salario_usd',
+        y='cargo',
+        orientation='h',
+        title="Top 10 cargos por salário médio",
+        labels={'salario_usd': 'Média salarial anual (USD)', 'cargo': 'Cargo'}
+    )
+    aplicar_layout_padrao(
+        grafico,
+        xaxis_title='Média salarial anual (USD)',
+        yaxis_title='',
+        yaxis={'categoryorder': 'total ascending'}
+    )
+    
+    return grafico
+
+
+def calcular_largura_bin(minimo: float, maximo: float, numero_bins: int) -> float:
+    """
+    Calcula uma largura de bin "redonda" (1, 2 ou 5 vezes uma potência de 10).
+    
+    Assim como o Plotly, usa a menor largura redonda que cobre o intervalo
+    com no máximo numero_bins bins.
+    
+    Args:
+        minimo: Menor valor
+        maximo: Maior valor
+        numero_bins: Número máximo de bins
+        
+    Returns:
+        Largura do bin
+    """
+    largura_bruta = (maximo - minimo) / numero_bins
+    if largura_bruta <= 0:
+        return 1.0
+    
+    escala = 10 ** np.floor(np.log10(largura_bruta))
+    for multiplo in (1, 2, 5, 10):
+        if multiplo * escala >= largura_bruta:
+            return float(multiplo * escala)
+    return float(10 * escala)
+
+
+def calcular_histograma(valores: np.ndarray, numero_bins: int = NUMERO_BINS_HISTOGRAMA) -> pd.DataFrame:
+    """
+    Calcula as contagens de um histograma de largura fixa com NumPy vetorizado.
+    
+    Cada valor é levado ao índice do seu bin por uma divisão inteira e as
+    contagens saem de um único np.bincount, sem ordenar os valores.
+    
+    Args:
+        valores: Valores numéricos
+        numero_bins: Número máximo de bins
+        
+    Returns:
+        DataFrame com inicio, fim, centro e contagem de cada bin
+    """
+    valores = np.asarray(valores, dtype='float64')
+    valores = valores[np.isfinite(valores)]
+    if valores.size == 0:
+        return pd.DataFrame(columns=['inicio', 'fim', 'centro', 'contagem'])
+    
+    inicio, largura = calcular_inicio_e_largura_bins(valores.min(), valores.max(), numero_bins)
+    contagens = np.bincount(((valores - inicio) // largura).astype(np.int64))
+    return montar_histograma(inicio, largura, contagens)
+
+
+def calcular_inicio_e_largura_bins(minimo: float, maximo: float,
+                                   numero_bins: int = NUMERO_BINS_HISTOGRAMA) -> Tuple[float, float]:
+    """
+    Calcula a borda inicial e a largura dos bins de um histograma.
+    
+    Args:
+        minimo: Menor valor
+        maximo: Maior valor
+        numero_bins: Número máximo de bins
+        
+    Returns:
+        Tupla (borda inicial, largura do bin)
+    """
+    largura = calcular_largura_bin(minimo, maximo, numero_bins)
+    return float(np.floor(minimo / largura) * largura), largura
+
+
+def montar_histograma(inicio: float, largura: float, contagens: np.ndarray) -> pd.DataFrame:
+    """
+    Monta a tabela do histograma a partir das contagens de cada bin.
+    
+    Args:
+        inicio: Borda inicial do primeiro bin
+        largura: Largura dos bins
+        contagens: Contagem de valores em cada bin, a partir do primeiro
+        
+    Returns:
+        DataFrame com inicio, fim, centro e contagem de cada bin
+    """
+    bordas = inicio + largura * np.arange(len(contagens) + 1)
+    return pd.DataFrame({
+        'inicio': bordas[:-1],
+        'fim': bordas[1:],
+        'centro': (bordas[:-1] + bordas[1:]) / 2,
+        'contagem': contagens
+    })
+
+
+def criar_grafico_distribuicao_salarios(dataframe: pd.DataFrame,
+                                        histograma: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria histograma da distribuição de salários.
+    
+    Os bins são calculados no servidor por calcular_histograma, e a figura
+    recebe apenas as bordas e contagens: o tamanho do gráfico enviado ao
+    navegador não depende do número de linhas filtradas.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        histograma: Histograma já calculado, como o de calcular_histograma_sql (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe):
+        return None
+    
+    if histograma is None:
+        histograma = calcular_histograma(dataframe['salario_usd'].to_numpy(), NUMERO_BINS_HISTOGRAMA)
+    
+    grafico = px.bar(
+        histograma,
+        x='centro',
+        y='contagem',
+        custom_data=['inicio', 'fim'],
+        title="Distribuição de salários anuais",
+        labels={'centro': 'Faixa salarial (USD)', 'contagem': 'Frequência'}
+    )
+    grafico.update_traces(
+        width=histograma['fim'].iloc[0] - histograma['inicio'].iloc[0],
+        hovertemplate=(
+            "Faixa salarial (USD): %{customdata[0]:,.0f} - %{customdata[1]:,.0f}"
+            "<br>Frequência: %{y:,}<extra></extra>"
+        )
+    )
+    aplicar_layout_padrao(
+        grafico,
+        xaxis_title='Faixa salarial (USD)',
+        yaxis_title='Frequência'
+    )
+    
+    return grafico
+
+
+def criar_grafico_tipos_trabalho(dataframe: pd.DataFrame,
+                                 cubo: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria gráfico de pizza com a proporção dos tipos de trabalho.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe):
+        return None
+    
+    if cubo is not None:
+        remoto_contagem = (
+            agregar_cubo(cubo, ['remota'])
+            .set_index('remota')['contagem']
+            .sort_values(ascending=False)
+        )
+    else:
+        remoto_contagem = dataframe['remota'].value_counts()
+    remoto_contagem = remoto_contagem[remoto_contagem > 0].reset_index()
+    remoto_contagem.columns = ['tipo_trabalho', 'quantidade']
+    
+    grafico = px.pie(
+        remoto_contagem,
+        names='tipo_trabalho',
+        values='quantidade',
+        title='Proporção dos tipos de trabalho',
+        hole=HOLE_PIZZA
+    )
+    grafico.update_traces(textinfo='percent+label')
+    aplicar_layout_padrao(grafico)
+    
+    return grafico
+
+
+def criar_grafico_salario_por_pais(dataframe: pd.DataFrame,
+                                   cubo: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria mapa coroplético com salário médio de Data Scientists por país.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio ou não houver dados
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe):
+        return None
+    
+    if cubo is not None:
+        cubo_data_scientist = cubo[cubo['cargo'] == CARGO_DATA_SCIENTIST]
+        
+        if not validar_dataframe(cubo_data_scientist):
+            return None
+        
+        media_por_pais = agrupar_e_calcular_media(dataframe, 'residencia', cubo=cubo_data_scientist)
+    else:
+        df_data_scientist = dataframe[dataframe['cargo'] == CARGO_DATA_SCIENTIST]
+        
+        if not validar_dataframe(df_data_scientist):
+            return None
+        
+        media_por_pais = agrupar_e_calcular_media(df_data_scientist, 'residencia')
+    
+    grafico = px.choropleth(
+        media_por_pais,
+        locations='residencia',
+        color='salario_usd',
+        color_continuous_scale='rdylgn',
+        title='Salário médio de Cientista de Dados por país',
+        labels={
+            'salario_usd': 'Salário médio (USD)',
+            'residencia': 'País'
+        }
+    )
+    aplicar_layout_padrao(grafico, coloraxis_colorbar_title='Salário médio (USD)')
+    
+    return grafico
+
+
+def calcular_estatisticas_boxplot(dataframe: pd.DataFrame, coluna: str,
+                                  ordem: Optional[List] = None,
+                                  limite_outliers: int = LIMITE_OUTLIERS_BOXPLOT) -> pd.DataFrame:
+    """
+    Calcula quartis, bigodes e uma amostra dos outliers de salario_usd por grupo.
+    
+    As linhas são agrupadas por uma única ordenação estável dos códigos do
+    grupo (sem copiar o DataFrame), e cada grupo tem seus salários ordenados
+    uma vez. Os bigodes vão até o valor mais extremo dentro de 1,5 IQR dos
+    quartis, como no box plot padrão do Plotly; dos outliers, no máximo
+    limite_outliers por grupo são mantidos, espaçados uniformemente e
+    incluindo os extremos.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        coluna: Dimensão usada para agrupar
+        ordem: Ordem dos grupos, se a coluna não for categórica (opcional)
+        limite_outliers: Número máximo de outliers mantidos por grupo
+        
+    Returns:
+        DataFrame com q1, mediana, q3, limite_inferior, limite_superior,
+        total_outliers e outliers (array) por grupo, na ordem dos grupos
+    """
+    serie = dataframe[coluna]
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        grupos = serie.cat.categories
+        codigos = serie.cat.codes.to_numpy()
+    else:
+        grupos = pd.Index(ordem if ordem else sorted(serie.dropna().unique()))
+        codigos = grupos.get_indexer(serie)
+    
+    valores = dataframe['salario_usd'].to_numpy(dtype='float64')
+    validos = (codigos >= 0) & np.isfinite(valores)
+    codigos = codigos[validos]
+    
+    # Ordenação estável por código (radix) agrupa as linhas de cada grupo
+    valores_agrupados = valores[validos][np.argsort(codigos, kind='stable')]
+    limites = np.concatenate(([0], np.cumsum(np.bincount(codigos, minlength=len(grupos)))))
+    
+    linhas = []
+    for codigo, grupo in enumerate(grupos):
+        ordenados = np.sort(valores_agrupados[limites[codigo]:limites[codigo + 1]])
+        if ordenados.size == 0:
+            continue
+        
+        q1, mediana, q3 = (calcular_quantil_ordenado(ordenados, quantil) for quantil in (0.25, 0.5, 0.75))
+        iqr = q3 - q1
+        inicio_bigode = np.searchsorted(ordenados, q1 - 1.5 * iqr, side='left')
+        fim_bigode = np.searchsorted(ordenados, q3 + 1.5 * iqr, side='right')
+        
+        outliers = np.concatenate((ordenados[:inicio_bigode], ordenados[fim_bigode:]))
+        total_outliers = len(outliers)
+        if total_outliers > limite_outliers:
+            outliers = outliers[np.unique(np.linspace(0, total_outliers - 1, limite_outliers).round().astype(np.int64))]
+        
+        linhas.append({
+            coluna: grupo,
+            'q1': q1,
+            'mediana': mediana,
+            'q3': q3,
+            'limite_inferior': ordenados[inicio_bigode],
+            'limite_superior': ordenados[fim_bigode - 1],
+            'total_outliers': total_outliers,
+            'outliers': outliers
+        })
+    
+    return pd.DataFrame(linhas, columns=[
+        coluna, 'q1', 'mediana', 'q3', 'limite_inferior', 'limite_superior', 'total_outliers', 'outliers'
+    ])
+
+
+def criar_boxplot_estatisticas(estatisticas: pd.DataFrame, coluna: str, titulo: str) -> Figure:
+    """
+    Cria box plot a partir de estatísticas já calculadas, sem enviar os dados brutos.
+    
+    Args:
+        estatisticas: DataFrame com a coluna de grupo e as colunas q1, mediana,
+            q3, limite_inferior e limite_superior (e, opcionalmente, outliers)
+        coluna: Nome da coluna de grupo
+        titulo: Título do gráfico
+        
+    Returns:
+        Gráfico Plotly
+    """
+    carregar_plotly()
+    
+    cores = px.colors.qualitative.Set2
+    grafico = go.Figure()
+    
+    for posicao, linha in enumerate(estatisticas.itertuples(index=False)):
+        grupo = getattr(linha, coluna)
+        cor = cores[posicao % len(cores)]
+        grafico.add_trace(go.Box(
+            name=str(grupo),
+            x=[grupo],
+            q1=[linha.q1],
+            median=[linha.mediana],
+            q3=[linha.q3],
+            lowerfence=[linha.limite_inferior],
+            upperfence=[linha.limite_superior],
+            marker_color=cor,
+            boxpoints=False
+        ))
+        
+        outliers = getattr(linha, 'outliers', None)
+        if outliers is not None and len(outliers):
+            grafico.add_trace(go.Scatter(
+                name=str(grupo),
+                x=[grupo] * len(outliers),
+                y=outliers,
+                mode='markers',
+                marker=dict(color=cor, size=4),
+                hovertemplate=(
+                    f"{grupo}: %{{y:,.0f}} "
+                    f"({linha.total_outliers} outliers no total)<extra></extra>"
+                ),
+                showlegend=False
+            ))
+    
+    grafico.update_layout(title=titulo)
+    return grafico
+
+
+def calcular_estatisticas_boxplot_esboco(esboco: pd.DataFrame, coluna: str) -> pd.DataFrame:
+    """
+    Calcula quartis e limites dos bigodes por grupo a partir dos esboços de quantis.
+    
+    Os bigodes vão até o balde mais extremo dentro de 1,5 IQR dos quartis,
+    como no box plot padrão do Plotly.
+    
+    Args:
+        esboco: Esboços de quantis já filtrados
+        coluna: Dimensão usada para agrupar
+        
+    Returns:
+        DataFrame com q1, mediana, q3, limite_inferior e limite_superior por grupo
+    """
+    estatisticas = calcular_quantis_esboco(esboco, [0.25, 0.5, 0.75], [coluna])
+    estatisticas.columns = [coluna, 'q1', 'mediana', 'q3']
+    
+    baldes = esboco.groupby([coluna, 'balde'], observed=True)['contagem'].sum().reset_index()
+    baldes['valor'] = calcular_valor_balde(baldes['balde'].to_numpy())
+    baldes = baldes.merge(estatisticas, on=coluna)
+    
+    iqr = baldes['q3'] - baldes['q1']
+    dentro = baldes[(baldes['valor'] >= baldes['q1'] - 1.5 * iqr) & (baldes['valor'] <= baldes['q3'] + 1.5 * iqr)]
+    limites = dentro.groupby(coluna, observed=True)['valor'].agg(['min', 'max'])
+    
+    estatisticas['limite_inferior'] = estatisticas[coluna].map(limites['min']).to_numpy()
+    estatisticas['limite_superior'] = estatisticas[coluna].map(limites['max']).to_numpy()
+    return estatisticas
+
+
+def criar_grafico_boxplot_senioridade(dataframe: pd.DataFrame,
+                                      esboco: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria box plot comparando salários por nível de senioridade.
+    
+    Quartis, bigodes e uma amostra limitada de outliers são calculados no
+    servidor, de modo que o tamanho do gráfico não depende do número de linhas.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        esboco: Esboços de quantis já filtrados; se informado, os quartis são
+            aproximados e os outliers não são exibidos (opcional)
+            
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    if not validar_dataframe(dataframe):
+        return None
+    
+    if esboco is not None:
+        estatisticas = calcular_estatisticas_boxplot_esboco(esboco, 'senioridade')
+    else:
+        estatisticas = calcular_estatisticas_boxplot(dataframe, 'senioridade', ORDEM_SENIORIDADE)
+    
+    grafico = criar_boxplot_estatisticas(
+        estatisticas,
+        'senioridade',
+        'Distribuição de Salários por Senioridade'
+    )
+    aplicar_layout_padrao(
+        grafico,
+        showlegend=False,
+        xaxis_title='Nível de Senioridade',
+        yaxis_title='Salário anual (USD)'
+    )
+    
+    return grafico
+
+
+def criar_grafico_tendencia_temporal(dataframe: pd.DataFrame,
+                                     cubo: Optional[pd.DataFrame] = None,
+                                     esboco: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria gráfico de linha mostrando a tendência de salários ao longo dos anos.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        esboco: Esboços de quantis já filtrados, para a mediana aproximada (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe) or len(dataframe['ano'].unique()) < 2:
+        return None
+    
+    if cubo is not None:
+        por_ano = agregar_cubo(cubo, ['ano'])
+        if esboco is not None:
+            mediana = calcular_quantis_esboco(esboco, [0.5], ['ano'])[0.5].to_numpy()
+        else:
+            mediana = dataframe.groupby('ano')['salario_usd'].median().to_numpy()
+        tendencia = pd.DataFrame({
+            'ano': por_ano['ano'],
+            'media': por_ano['media'],
+            'mediana': mediana,
+            'contagem': por_ano['contagem']
+        })
+    else:
+        tendencia = (
+            dataframe
+            .groupby('ano')['salario_usd']
+            .agg(['mean', 'median', 'count'])
+            .reset_index()
+        )
+        tendencia.columns = ['ano', 'media', 'mediana', 'contagem']
+        if esboco is not None:
+            tendencia['mediana'] = calcular_quantis_esboco(esboco, [0.5], ['ano'])[0.5].to_numpy()
+    
+    grafico = px.line(
+        tendencia,
+        x='ano',
+        y=['media', 'mediana'],
+        title='Evolução Temporal dos Salários',
+        labels={
+            'ano': 'Ano',
+            'value': 'Salário anual (USD)',
+            'variable': 'Métrica'
+        },
+        markers=True
+    )
+    aplicar_layout_padrao(
+        grafico,
+        xaxis_title='Ano',
+        yaxis_title='Salário anual (USD)',
+        legend=dict(
+            title='Tipo',
+            yanchor="top",
+            y=0.99,
+            xanchor="left",
+            x=0.01
+        )
+    )
+    grafico.update_traces(
+        line=dict(width=3),
+        marker=dict(size=8)
+    )
+    
+    # Renomear legendas
+    grafico.data[0].name = 'Média'
+    grafico.data[1].name = 'Mediana'
+    
+    return grafico
+
+
+def criar_grafico_salario_por_tipo_trabalho(dataframe: pd.DataFrame,
+                                            cubo: Optional[pd.DataFrame] = None) -> Optional[Figure]:
+    """
+    Cria gráfico de barras comparando salários médios por tipo de trabalho.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        cubo: Cubo já filtrado com os mesmos critérios do DataFrame (opcional)
+        
+    Returns:
+        Gráfico Plotly ou None se o DataFrame estiver vazio
+    """
+    carregar_plotly()
+    
+    if not validar_dataframe(dataframe):
+        return None
+    
+    salario_por_tipo = agrupar_e_calcular_media(dataframe, 'remota', cubo=cubo)
+    salario_por_tipo = salario_por_tipo.sort_values('salario_usd', ascending=False)
+    salario_por_tipo.columns = ['tipo_trabalho', 'salario_medio']
+    
+    grafico = px.bar(
+        salario_por_tipo,
+        x='tipo_trabalho',
+        y='salario_medio',
+        title='Salário Médio por Tipo de Trabalho',
+        labels={
+            'salario_medio': 'Salário médio anual (USD)',
+            'tipo_trabalho': 'Tipo de Trabalho'
+        },
+        color='salario_medio',
+        color_continuous_scale='Blues'
+    )
+    aplicar_layout_padrao(
+        grafico,
+        showlegend=False,
+        xaxis_title='Tipo de Trabalho',
+        yaxis_title='Salário médio anual (USD)'
+    )
+    
+    return grafico
+
+
+def gerar_insights(dataframe: pd.DataFrame, metricas: Dict,
+                   cubo: Optional[pd.DataFrame] = None) -> List[str]:
+    """
+    Gera insights automáticos baseados nos dados.
+    
+    Args:
+        dataframe: DataFrame filtrado
+        metricas: Dicionário com métricas calculadas
+        cubo: Cubo já filtrado; se informado, as médias por tipo de trabalho e
+            por senioridade vêm dele (opcional)
+            
+    Returns:
+        Lista de insights em formato de texto
+    """
+    insights = []
+    
+    if dataframe.empty:
+        return ["⚠️ Nenhum dado disponível para gerar insights."]
+    
+    # Insight sobre variação temporal
+    if metricas['variacao_ano_anterior'] != 0:
+        if metricas['variacao_ano_anterior'] > 0:
+            insights.append(
+                f"📈 **Crescimento Positivo**: Os salários aumentaram "
+                f"{metricas['variacao_ano_anterior']:.1f}% em relação ao ano anterior."
+            )
+        else:
+            insights.append(
+                f"📉 **Redução**: Os salários diminuíram "
+                f"{abs(metricas['variacao_ano_anterior']):.1f}% em relação ao ano anterior."
+            )
+    
+    # Insight sobre distribuição
+    coeficiente_variacao = (metricas['desvio_padrao'] / metricas['salario_medio']) * 100 if metricas['salario_medio'] > 0 else 0
+    if coeficiente_variacao > 50:
+        insights.append(
+            f"📊 **Alta Variabilidade**: Os salários apresentam alta dispersão "
+            f"(CV: {coeficiente_variacao:.1f}%), indicando grande diferença entre os valores."
+        )
+    
+    # Insight sobre mediana vs média
+    diferenca_mediana_media = abs(metricas['salario_medio'] - metricas['salario_mediano'])
+    if diferenca_mediana_media > metricas['salario_medio'] * 0.1:
+        if metricas['salario_medio'] > metricas['salario_mediano']:
+            insights.append(
+                "💰 **Distribuição Assimétrica**: A média é significativamente maior que a mediana, "
+                "indicando presença de salários muito altos que elevam a média."
+            )
+    
+    # Insight sobre tipo de trabalho
+    if 'remota' in dataframe.columns:
+        if cubo is not None:
+            media_por_tipo = agregar_cubo(cubo, ['remota']).set_index('remota')['media']
+            salario_remoto = media_por_tipo.get('Remoto', np.nan)
+            salario_presencial = media_por_tipo.get('Presencial', np.nan)
+        else:
+            salario_remoto = dataframe[dataframe['remota'] == 'Remoto']['salario_usd'].mean()
+            salario_presencial = dataframe[dataframe['remota'] == 'Presencial']['salario_usd'].mean()
+        if salario_remoto > 0 and salario_presencial > 0:
+            diferenca = calcular_diferenca_percentual(salario_remoto, salario_presencial)
+            if abs(diferenca) > 5:
+                if diferenca > 0:
+                    insights.append(
+                        f"🏠 **Trabalho Remoto**: Profissionais remotos ganham em média "
+                        f"{diferenca:.1f}% mais que profissionais presenciais."
+                    )
+                else:
+                    insights.append(
+                        f"🏢 **Trabalho Presencial**: Profissionais presenciais ganham em média "
+                        f"{abs(diferenca):.1f}% mais que profissionais remotos."
+                    )
+    
+    # Insight sobre senioridade
+    if 'senioridade' in dataframe.columns:
+        if cubo is not None:
+            salario_por_senioridade = (
+                agregar_cubo(cubo, ['senioridade'])
+                .set_index('senioridade')['media']
+                .sort_values(ascending=False)
+            )
+        else:
+            salario_por_senioridade = dataframe.groupby('senioridade', observed=True)['salario_usd'].mean().sort_values(ascending=False)
+        if len(salario_por_senioridade) > 1:
+            maior = salario_por_senioridade.index[0]
+            menor = salario_por_senioridade.index[-1]
+            diferenca = calcular_diferenca_percentual(
+                salario_por_senioridade[maior],
+                salario_por_senioridade[menor]
+            )
+            insights.append(
+                f"🎯 **Gap de Senioridade**: Profissionais {maior} ganham em média "
+                f"{diferenca:.1f}% mais que profissionais {menor}."
+            )
+    
+    if not insights:
+        insights.append("💡 Analise os gráficos abaixo para obter mais insights sobre os dados.")
+    
+    return insights
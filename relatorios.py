@@ -0,0 +1,315 @@
+"""
+Relatórios em lote do dashboard, sem interface.
+
+Carrega os dados uma única vez e calcula, para cada fatia (ano, senioridade,
+tamanho da empresa), as mesmas métricas e insights exibidos no dashboard
+(filtrar_dataframe, calcular_metricas e gerar_insights). As fatias são
+distribuídas entre processos de um ProcessPoolExecutor; o DataFrame e o
+índice de filtros são entregues aos processos na inicialização e, onde o
+início por fork está disponível, compartilhados sem cópia (somente leitura).
+
+O resultado é gravado em JSON ou Parquet, conforme a extensão do arquivo de
+saída, e a vazão (fatias por segundo) de cada número de processos é impressa
+e gravada em um relatório JSON.
+
+Uso:
+    python relatorios.py
+    python relatorios.py --saida fatias.parquet --trabalhadores 1 2 4
+    python relatorios.py --fonte dados.csv --desempenho desempenho.json
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import nucleo
+
+
+# ============================================================================
+# CONSTANTES
+# ============================================================================
+
+# Dimensões que definem cada fatia do relatório (chave do filtro -> coluna)
+DIMENSOES_FATIA = {
+    'anos': 'ano',
+    'senioridades': 'senioridade',
+    'tamanhos_empresa': 'tamanho_empresa'
+}
+
+ARQUIVO_SAIDA_PADRAO = 'relatorio_fatias.json'
+FORMATOS_SAIDA = {'.json': 'json', '.parquet': 'parquet'}
+
+# Fatias por tarefa enviada a cada processo, por processo
+FATIAS_POR_TAREFA = 4
+
+# Dados compartilhados com os processos, definidos em inicializar_trabalhador
+DADOS_TRABALHADOR = {}
+
+
+# ============================================================================
+# CÁLCULO DAS FATIAS
+# ============================================================================
+
+
+def listar_opcoes_filtros(dataframe: pd.DataFrame) -> Dict[str, List]:
+    """
+    Lista os valores de cada filtro, calculados uma única vez para todas as fatias.
+    
+    Os cargos ficam de fora: nas fatias, a lista vazia já seleciona todos.
+    
+    Args:
+        dataframe: DataFrame processado
+        
+    Returns:
+        Dicionário chave do filtro -> valores distintos da coluna
+    """
+    return {
+        chave: nucleo.obter_opcoes_filtro(dataframe[coluna])
+        for chave, coluna in nucleo.COLUNAS_FILTRO.items()
+        if chave != 'cargos'
+    }
+
+
+def listar_fatias(opcoes: Dict[str, List]) -> List[Dict]:
+    """
+    Lista todas as combinações de valores das dimensões de fatia.
+    
+    Args:
+        opcoes: Valores de cada filtro, de listar_opcoes_filtros
+        
+    Returns:
+        Lista de fatias, cada uma um dicionário coluna -> valor
+    """
+    return [
+        dict(zip(DIMENSOES_FATIA.values(), valores))
+        for valores in itertools.product(*(opcoes[chave] for chave in DIMENSOES_FATIA))
+    ]
+
+
+def montar_filtros_fatia(opcoes: Dict[str, List], fatia: Dict) -> Dict:
+    """
+    Monta a seleção de filtros de uma fatia, no formato de criar_barra_lateral_filtros.
+    
+    As dimensões que não definem a fatia ficam com todos os valores marcados.
+    
+    Args:
+        opcoes: Valores de cada filtro, de listar_opcoes_filtros
+        fatia: Dicionário coluna -> valor
+        
+    Returns:
+        Seleção de filtros
+    """
+    filtros = dict(opcoes)
+    for chave, coluna in DIMENSOES_FATIA.items():
+        filtros[chave] = [fatia[coluna]]
+    filtros['cargos'] = []
+    return filtros
+
+
+def converter_valor_json(valor):
+    """
+    Converte escalares do NumPy e valores ausentes em tipos nativos do Python.
+    
+    Args:
+        valor: Valor calculado
+        
+    Returns:
+        Valor serializável em JSON
+    """
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and not np.isfinite(valor):
+        return None
+    return valor
+
+
+def inicializar_trabalhador(dataframe: pd.DataFrame, indice: Dict, opcoes: Dict[str, List]) -> None:
+    """
+    Guarda no processo o DataFrame, o índice e os valores dos filtros usados por calcular_fatia.
+    
+    Args:
+        dataframe: DataFrame processado
+        indice: Índice de filtros do DataFrame
+        opcoes: Valores de cada filtro, de listar_opcoes_filtros
+    """
+    DADOS_TRABALHADOR['dataframe'] = dataframe
+    DADOS_TRABALHADOR['indice'] = indice
+    DADOS_TRABALHADOR['opcoes'] = opcoes
+
+
+def calcular_fatia(fatia: Dict) -> Dict:
+    """
+    Filtra os dados de uma fatia e calcula suas métricas e insights.
+    
+    Args:
+        fatia: Dicionário coluna -> valor
+        
+    Returns:
+        Dicionário com os valores da fatia, as métricas e os insights
+    """
+    dataframe = DADOS_TRABALHADOR['dataframe']
+    filtros = montar_filtros_fatia(DADOS_TRABALHADOR['opcoes'], fatia)
+    df_filtrado = nucleo.filtrar_dataframe(
+        dataframe,
+        filtros['anos'],
+        filtros['senioridades'],
+        filtros['contratos'],
+        filtros['tamanhos_empresa'],
+        filtros['cargos'],
+        indice=DADOS_TRABALHADOR['indice']
+    )
+    
+    metricas = nucleo.calcular_metricas(df_filtrado, dataframe)
+    insights = nucleo.gerar_insights(df_filtrado, metricas) if nucleo.validar_dataframe(df_filtrado) else []
+    
+    resultado = {coluna: converter_valor_json(valor) for coluna, valor in fatia.items()}
+    resultado.update({nome: converter_valor_json(valor) for nome, valor in metricas.items()})
+    resultado['insights'] = insights
+    return resultado
+
+
+def obter_contexto_processos() -> Optional[multiprocessing.context.BaseContext]:
+    """
+    Escolhe o início por fork quando disponível.
+    
+    Com fork, os processos herdam o DataFrame da memória do processo
+    principal em vez de recebê-lo serializado.
+    
+    Returns:
+        Contexto de multiprocessing ou None para o padrão da plataforma
+    """
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return None
+
+
+def calcular_fatias(dataframe: pd.DataFrame, indice: Dict, opcoes: Dict[str, List],
+                    fatias: List[Dict], trabalhadores: int) -> List[Dict]:
+    """
+    Calcula todas as fatias em um ProcessPoolExecutor.
+    
+    Args:
+        dataframe: DataFrame processado
+        indice: Índice de filtros do DataFrame
+        opcoes: Valores de cada filtro, de listar_opcoes_filtros
+        fatias: Fatias retornadas por listar_fatias
+        trabalhadores: Número de processos
+        
+    Returns:
+        Resultados de calcular_fatia, na ordem das fatias
+    """
+    tamanho_tarefa = max(1, len(fatias) // (trabalhadores * FATIAS_POR_TAREFA))
+    with ProcessPoolExecutor(
+        max_workers=trabalhadores,
+        mp_context=obter_contexto_processos(),
+        initializer=inicializar_trabalhador,
+        initargs=(dataframe, indice, opcoes)
+    ) as executor:
+        return list(executor.map(calcular_fatia, fatias, chunksize=tamanho_tarefa))
+
+
+# ============================================================================
+# SAÍDA
+# ============================================================================
+
+
+def gravar_resultados(resultados: List[Dict], caminho: Path) -> None:
+    """
+    Grava os resultados das fatias em JSON ou Parquet, conforme a extensão.
+    
+    Args:
+        resultados: Resultados de calcular_fatias
+        caminho: Arquivo de saída (.json ou .parquet)
+    """
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    if FORMATOS_SAIDA[caminho.suffix.lower()] == 'parquet':
+        pd.DataFrame(resultados).to_parquet(caminho, index=False)
+    else:
+        caminho.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding='utf-8')
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """
+    Cria o parser dos argumentos da linha de comando.
+    
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        description="Métricas e insights do dashboard para cada fatia (ano, senioridade, tamanho da empresa)."
+    )
+    parser.add_argument('--fonte', default=nucleo.URL_DADOS,
+                        help="Arquivo ou URL dos dados (padrão: fonte do dashboard)")
+    parser.add_argument('--tamanho-bloco', type=int, default=nucleo.TAMANHO_BLOCO_INGESTAO,
+                        help="Linhas por bloco na ingestão (0 usa a ingestão em memória)")
+    parser.add_argument('--trabalhadores', type=int, nargs='+', default=[os.cpu_count() or 1],
+                        help="Números de processos a medir; os resultados vêm da última medição")
+    parser.add_argument('--saida', type=Path, default=Path(ARQUIVO_SAIDA_PADRAO),
+                        help="Arquivo de saída das fatias (.json ou .parquet)")
+    parser.add_argument('--desempenho', type=Path, default=None,
+                        help="Arquivo JSON para gravar a vazão de cada número de processos")
+    return parser
+
+
+def main() -> None:
+    """
+    Carrega os dados, calcula as fatias com cada número de processos e grava os resultados.
+    """
+    parser = criar_parser()
+    argumentos = parser.parse_args()
+    if argumentos.saida.suffix.lower() not in FORMATOS_SAIDA:
+        parser.error("o arquivo de saída deve ter extensão .json ou .parquet")
+    if FORMATOS_SAIDA[argumentos.saida.suffix.lower()] == 'parquet' and nucleo.pq is None:
+        parser.error("a saída em Parquet requer o pacote pyarrow")
+    if min(argumentos.trabalhadores) < 1:
+        parser.error("o número de processos deve ser positivo")
+    
+    inicio = time.perf_counter()
+    dataframe = nucleo.processar_dados(argumentos.fonte, tamanho_bloco=argumentos.tamanho_bloco)
+    indice = nucleo.construir_indice_filtros(dataframe)
+    opcoes = listar_opcoes_filtros(dataframe)
+    fatias = listar_fatias(opcoes)
+    tempo_carga = time.perf_counter() - inicio
+    print(f"{len(dataframe)} linhas carregadas em {tempo_carga:.1f} s; {len(fatias)} fatias", flush=True)
+    
+    medicoes = []
+    resultados = []
+    for trabalhadores in argumentos.trabalhadores:
+        inicio = time.perf_counter()
+        resultados = calcular_fatias(dataframe, indice, opcoes, fatias, trabalhadores)
+        duracao = time.perf_counter() - inicio
+        medicoes.append({
+            'trabalhadores': trabalhadores,
+            'tempo_s': duracao,
+            'fatias_por_segundo': len(fatias) / duracao
+        })
+        print(f"  {trabalhadores:>3} processos {duracao:>8.2f} s {len(fatias) / duracao:>10.1f} fatias/s", flush=True)
+    
+    gravar_resultados(resultados, argumentos.saida)
+    print(f"Fatias gravadas em {argumentos.saida}")
+    
+    if argumentos.desempenho is not None:
+        relatorio = {
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'linhas': len(dataframe),
+            'fatias': len(fatias),
+            'processadores': os.cpu_count(),
+            'tempo_carga_s': tempo_carga,
+            'medicoes': medicoes
+        }
+        argumentos.desempenho.write_text(json.dumps(relatorio, indent=2), encoding='utf-8')
+        print(f"Desempenho gravado em {argumentos.desempenho}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Os módulos do dashboard ficam na raiz do repositório
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import nucleo  # noqa: E402
+
+
+def gerar_fonte(linhas, semente=0, salarios=None):
+    """Gera um DataFrame com o esquema da fonte original (colunas em inglês)."""
+    gerador = np.random.default_rng(semente)
+    return pd.DataFrame({
+        'work_year': gerador.choice([2022, 2023, 2024], linhas),
+        'experience_level': gerador.choice(['EN', 'MI', 'SE', 'EX'], linhas),
+        'employment_type': gerador.choice(['FT', 'PT', 'CT', 'FL'], linhas),
+        'job_title': gerador.choice(['Data Scientist', 'Data Engineer', 'Data Analyst', 'ML Engineer'], linhas),
+        'salary': gerador.integers(20_000, 400_000, linhas),
+        'salary_currency': 'USD',
+        'salary_in_usd': salarios if salarios is not None else gerador.integers(20_000, 400_000, linhas),
+        'employee_residence': gerador.choice(['US', 'BR', 'DE', 'IN'], linhas),
+        'remote_ratio': gerador.choice([0, 50, 100], linhas),
+        'company_location': gerador.choice(['US', 'BR', 'DE', 'IN'], linhas),
+        'company_size': gerador.choice(['S', 'M', 'L'], linhas)
+    })
+
+
+@pytest.fixture
+def diretorio_cache(tmp_path, monkeypatch):
+    """Direciona o cache em disco do núcleo para um diretório temporário."""
+    diretorio = tmp_path / 'cache'
+    monkeypatch.setattr(nucleo, 'DIRETORIO_CACHE', diretorio)
+    return diretorio
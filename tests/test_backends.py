@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import nucleo
+from conftest import gerar_fonte
+
+# Todos os backends além do pandas; os pacotes são dependências dos testes
+# (requirements-test.txt), para que nenhum backend fique sem verificação
+BACKENDS_ALTERNATIVOS = [backend for backend in nucleo.BACKENDS_CALCULO if backend != 'pandas']
+
+# Diferença relativa aceita entre um backend e o pandas (ordem de soma)
+TOLERANCIA_PARIDADE = 1e-9
+
+SELECAO_RESTRITA = {
+    'anos': [2023, 2024],
+    'senioridades': ['Senior'],
+    'contratos': ['Tempo Integral'],
+    'tamanhos_empresa': ['Média', 'Grande'],
+    'cargos': []
+}
+
+DIMENSOES_PARIDADE = ['cargo', 'residencia', 'remota', 'senioridade', 'ano']
+
+
+def filtrar(dataframe, selecao, **opcoes):
+    return nucleo.filtrar_dataframe(
+        dataframe,
+        selecao['anos'],
+        selecao['senioridades'],
+        selecao['contratos'],
+        selecao['tamanhos_empresa'],
+        selecao['cargos'],
+        **opcoes
+    )
+
+
+def calcular_resultados(caminho_csv):
+    """Calcula, com o backend configurado, todos os resultados comparados com o pandas."""
+    brutos = nucleo.ler_fonte(str(caminho_csv))
+    df = nucleo.processar_dados(str(caminho_csv), usar_cache_disco=False)
+    cubo = nucleo.construir_cubo(df)
+    todos = {
+        'anos': list(df['ano'].unique()),
+        'senioridades': list(df['senioridade'].unique()),
+        'contratos': list(df['contrato'].unique()),
+        'tamanhos_empresa': list(df['tamanho_empresa'].unique()),
+        'cargos': []
+    }
+    posicoes = {
+        nome: filtrar(df, selecao, retornar_posicoes=True)
+        for nome, selecao in {'todos': todos, 'restrito': SELECAO_RESTRITA}.items()
+    }
+    df_filtrado = df.iloc[posicoes['restrito']]
+    cubo_filtrado = filtrar(cubo, SELECAO_RESTRITA)
+    
+    return {
+        'brutos': brutos,
+        'cubo': cubo,
+        'posicoes': posicoes,
+        'medias': {
+            dimensao: nucleo.agrupar_e_calcular_media(df_filtrado, dimensao)
+            for dimensao in DIMENSOES_PARIDADE
+        },
+        'metricas': nucleo.calcular_metricas(df_filtrado, df),
+        'metricas_cubo': nucleo.calcular_metricas(df_filtrado, df, cubo_filtrado)
+    }
+
+
+def comparar_agregados(referencia, resultado, colunas):
+    """Compara dois agregados com as mesmas colunas de grupo, em qualquer ordem de linhas."""
+    assert referencia.dtypes.equals(resultado.dtypes)
+    assert len(referencia) == len(resultado)
+    
+    combinados = referencia.merge(resultado, on=colunas, how='outer', suffixes=('_ref', '_backend'), indicator=True)
+    assert (combinados['_merge'] == 'both').all()
+    for coluna in referencia.columns.difference(colunas):
+        np.testing.assert_allclose(
+            combinados[f'{coluna}_backend'].to_numpy(dtype='float64'),
+            combinados[f'{coluna}_ref'].to_numpy(dtype='float64'),
+            rtol=TOLERANCIA_PARIDADE,
+            atol=1e-6,
+            err_msg=coluna
+        )
+
+
+@pytest.fixture(scope='module')
+def referencia_e_resultados(tmp_path_factory):
+    caminho_csv = tmp_path_factory.mktemp('paridade') / 'salaries.csv'
+    gerar_fonte(20_000, semente=4).to_csv(caminho_csv, index=False)
+    
+    backend_original = nucleo.BACKEND_CALCULO
+    try:
+        nucleo.BACKEND_CALCULO = 'pandas'
+        referencia = calcular_resultados(caminho_csv)
+        resultados = {}
+        for backend in BACKENDS_ALTERNATIVOS:
+            nucleo.BACKEND_CALCULO = backend
+            resultados[backend] = calcular_resultados(caminho_csv)
+    finally:
+        nucleo.BACKEND_CALCULO = backend_original
+    return referencia, resultados
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+def test_backend_instalado(backend):
+    # Sem o pacote, obter_backend cairia no pandas e a paridade passaria sem testar nada
+    assert backend in nucleo.listar_backends_disponiveis(), \
+        f"instale as dependências de teste (pip install -r requirements-test.txt): falta o backend {backend}"
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+def test_leitura_igual_ao_pandas(referencia_e_resultados, backend):
+    referencia, resultados = referencia_e_resultados
+    
+    pd.testing.assert_frame_equal(resultados[backend]['brutos'], referencia['brutos'])
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+def test_cubo_igual_ao_pandas(referencia_e_resultados, backend):
+    referencia, resultados = referencia_e_resultados
+    
+    comparar_agregados(referencia['cubo'], resultados[backend]['cubo'], nucleo.DIMENSOES_CUBO)
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+def test_filtragem_igual_ao_pandas(referencia_e_resultados, backend):
+    referencia, resultados = referencia_e_resultados
+    
+    for nome, posicoes in referencia['posicoes'].items():
+        np.testing.assert_array_equal(resultados[backend]['posicoes'][nome], posicoes, err_msg=nome)
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+def test_medias_iguais_ao_pandas(referencia_e_resultados, backend):
+    referencia, resultados = referencia_e_resultados
+    
+    for dimensao, medias in referencia['medias'].items():
+        comparar_agregados(medias, resultados[backend]['medias'][dimensao], [dimensao])
+
+
+@pytest.mark.parametrize('backend', BACKENDS_ALTERNATIVOS)
+@pytest.mark.parametrize('conjunto', ['metricas', 'metricas_cubo'])
+def test_metricas_iguais_ao_pandas(referencia_e_resultados, backend, conjunto):
+    referencia, resultados = referencia_e_resultados
+    
+    for metrica, valor in referencia[conjunto].items():
+        obtido = resultados[backend][conjunto][metrica]
+        if isinstance(valor, (int, float, np.number)):
+            assert obtido == pytest.approx(valor, rel=TOLERANCIA_PARIDADE, nan_ok=True), metrica
+        else:
+            assert obtido == valor, metrica
@@ -0,0 +1,81 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import nucleo
+
+
+def criar_dataframe(salarios, cargos=None):
+    quantidade = len(salarios)
+    return pd.DataFrame({
+        'ano': [2023] * (quantidade - quantidade // 2) + [2024] * (quantidade // 2),
+        'senioridade': ['SE'] * quantidade,
+        'contrato': ['FT'] * quantidade,
+        'tamanho_empresa': ['M'] * quantidade,
+        'cargo': cargos if cargos is not None else ['Data Scientist'] * quantidade,
+        'remota': [0] * quantidade,
+        'residencia': ['US'] * quantidade,
+        'salario_usd': salarios
+    })
+
+
+@pytest.mark.parametrize('backend', nucleo.listar_backends_disponiveis())
+def test_desvio_padrao_sem_cancelamento(backend):
+    dataframe = criar_dataframe([300_000_000, 300_000_001, 300_000_002],
+                                cargos=['Data Scientist', 'Data Scientist', 'Data Engineer'])
+    cubo = nucleo.obter_backend(backend)['agregar_grupos'](dataframe, nucleo.DIMENSOES_CUBO, 'salario_usd')
+    
+    estatisticas = nucleo.calcular_estatisticas_cubo(cubo)
+    
+    assert estatisticas['desvio_padrao'] == pytest.approx(dataframe['salario_usd'].std(), rel=1e-9)
+    assert estatisticas['salario_medio'] == pytest.approx(dataframe['salario_usd'].mean(), rel=1e-12)
+
+
+@pytest.mark.parametrize('backend', nucleo.listar_backends_disponiveis())
+def test_roll_up_igual_ao_pandas(backend):
+    gerador = np.random.default_rng(0)
+    quantidade = 5_000
+    dataframe = criar_dataframe(
+        (gerador.normal(2e8, 50, quantidade)).round().astype('int64'),
+        cargos=gerador.choice(['Data Scientist', 'Data Engineer', 'ML Engineer'], quantidade)
+    )
+    cubo = nucleo.obter_backend(backend)['agregar_grupos'](dataframe, nucleo.DIMENSOES_CUBO, 'salario_usd')
+    
+    por_cargo = nucleo.agregar_cubo(cubo, ['cargo']).set_index('cargo')
+    esperado = dataframe.groupby('cargo')['salario_usd'].agg(['count', 'var'])
+    
+    assert (por_cargo['contagem'] == esperado['count']).all()
+    np.testing.assert_allclose(por_cargo['m2'] / (por_cargo['contagem'] - 1), esperado['var'], rtol=1e-9)
+
+
+def test_consolidar_agregados_combina_m2():
+    dataframe = criar_dataframe([300_000_000, 300_000_001, 300_000_002, 300_000_007])
+    partes = [
+        nucleo.agregar_grupos_pandas(dataframe.iloc[:2], nucleo.DIMENSOES_CUBO, 'salario_usd'),
+        nucleo.agregar_grupos_pandas(dataframe.iloc[2:], nucleo.DIMENSOES_CUBO, 'salario_usd')
+    ]
+    
+    cubo = nucleo.consolidar_agregados(partes + [partes[0].iloc[:0]], nucleo.DIMENSOES_CUBO)
+    
+    assert nucleo.calcular_estatisticas_cubo(cubo)['desvio_padrao'] == pytest.approx(
+        dataframe['salario_usd'].std(), rel=1e-9
+    )
+
+
+def test_cubo_sql_sem_cancelamento(tmp_path):
+    dataframe = criar_dataframe([300_000_000, 300_000_001, 300_000_002, 300_000_005],
+                                cargos=['Data Scientist', 'Data Engineer'] * 2)
+    caminho = tmp_path / 'banco.sqlite'
+    with sqlite3.connect(caminho) as conexao:
+        nucleo.gravar_tabela_agregada_sql(
+            conexao, nucleo.TABELA_CUBO_SQL,
+            nucleo.construir_cubo(dataframe), nucleo.CHAVE_CUBO_SQL
+        )
+    
+    cubo = nucleo.consultar_cubo_sql(caminho, colunas=['ano'])
+    
+    assert nucleo.calcular_estatisticas_cubo(cubo)['desvio_padrao'] == pytest.approx(
+        dataframe['salario_usd'].std(), rel=1e-9
+    )
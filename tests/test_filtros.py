@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import nucleo
+
+
+@pytest.mark.parametrize('fracao', [0.001, 0.04, 0.2, 0.9])
+def test_selecionar_posicoes_bitset(fracao):
+    gerador = np.random.default_rng(0)
+    total_linhas = 100_003
+    aceitas = gerador.random(total_linhas) < 0.6
+    posicoes = np.flatnonzero(gerador.random(total_linhas) < fracao)
+    
+    selecionadas = nucleo.selecionar_posicoes_bitset(posicoes, np.packbits(aceitas))
+    
+    np.testing.assert_array_equal(selecionadas, posicoes[aceitas[posicoes]])
+
+
+def test_consulta_incremental_igual_a_completa():
+    gerador = np.random.default_rng(1)
+    linhas = 50_000
+    dataframe = pd.DataFrame({
+        'ano': gerador.choice([2022, 2023, 2024], linhas),
+        'senioridade': pd.Categorical(gerador.choice(['junior', 'Pleno', 'Senior'], linhas)),
+        'contrato': pd.Categorical(gerador.choice(['Tempo Integral', 'Contrato'], linhas)),
+        'tamanho_empresa': pd.Categorical(gerador.choice(['Pequena', 'Média', 'Grande'], linhas)),
+        'cargo': pd.Categorical(gerador.choice([f'Cargo {i}' for i in range(40)], linhas))
+    })
+    indice = nucleo.construir_indice_filtros(dataframe)
+    estado = nucleo.criar_estado_filtros()
+    todos = {
+        'anos': [2022, 2023, 2024],
+        'senioridades': ['junior', 'Pleno', 'Senior'],
+        'contratos': ['Tempo Integral', 'Contrato'],
+        'tamanhos_empresa': ['Pequena', 'Média', 'Grande'],
+        'cargos': []
+    }
+    # Sequência com estreitamentos de uma e duas dimensões, ampliação e repetição
+    sequencia = [
+        todos,
+        {**todos, 'cargos': ['Cargo 1', 'Cargo 2', 'Cargo 3']},
+        {**todos, 'cargos': ['Cargo 1', 'Cargo 2', 'Cargo 3'], 'tamanhos_empresa': ['Grande']},
+        {**todos, 'cargos': ['Cargo 1', 'Cargo 2'], 'tamanhos_empresa': ['Grande'], 'anos': [2024]},
+        {**todos, 'cargos': ['Cargo 1', 'Cargo 2'], 'tamanhos_empresa': ['Grande'], 'anos': [2024]},
+        {**todos, 'tamanhos_empresa': ['Média', 'Grande']},
+        {**todos, 'tamanhos_empresa': ['Grande']}
+    ]
+    
+    for filtros in sequencia:
+        incremental = nucleo.consultar_indice_filtros_incremental(indice, filtros, estado)
+        completa = nucleo.consultar_indice_filtros(indice, filtros)
+        np.testing.assert_array_equal(incremental, completa)
@@ -0,0 +1,74 @@
+import http.server
+import threading
+import urllib.error
+
+import pytest
+
+import nucleo
+
+
+class ManipuladorFonte(http.server.BaseHTTPRequestHandler):
+    """Serve um CSV fixo com ETag, ou o código de erro configurado no servidor."""
+    
+    def do_GET(self):
+        self.server.requisicoes.append(dict(self.headers))
+        if self.server.codigo_erro:
+            self.send_error(self.server.codigo_erro)
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(self.server.conteudo)))
+        self.end_headers()
+        self.wfile.write(self.server.conteudo)
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    servidor = http.server.ThreadingHTTPServer(('127.0.0.1', 0), ManipuladorFonte)
+    servidor.conteudo = b'a,b\n1,2\n'
+    servidor.codigo_erro = None
+    servidor.requisicoes = []
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def obter_url(servidor):
+    return f'http://127.0.0.1:{servidor.server_address[1]}/salaries.csv'
+
+
+def test_revalidacao_condicional(servidor, diretorio_cache):
+    url = obter_url(servidor)
+    
+    caminho = nucleo.baixar_fonte_http(url)
+    assert caminho.read_bytes() == servidor.conteudo
+    
+    assert nucleo.baixar_fonte_http(url) == caminho
+    assert servidor.requisicoes[-1].get('If-None-Match') == '"v1"'
+    assert caminho.read_bytes() == servidor.conteudo
+
+
+@pytest.mark.parametrize('codigo', [404, 500, 503])
+def test_erro_http_usa_copia_local(servidor, diretorio_cache, codigo):
+    url = obter_url(servidor)
+    caminho = nucleo.baixar_fonte_http(url)
+    
+    servidor.codigo_erro = codigo
+    assert nucleo.baixar_fonte_http(url) == caminho
+    assert caminho.read_bytes() == servidor.conteudo
+
+
+def test_erro_http_sem_copia_local(servidor, diretorio_cache):
+    servidor.codigo_erro = 500
+    
+    with pytest.raises(urllib.error.HTTPError):
+        nucleo.baixar_fonte_http(obter_url(servidor))
@@ -0,0 +1,19 @@
+import inspect
+import typing
+
+import pytest
+
+import nucleo
+
+FUNCOES_GRAFICO = [
+    funcao for nome, funcao in inspect.getmembers(nucleo, inspect.isfunction)
+    if funcao.__module__ == 'nucleo' and (nome.startswith('criar_grafico') or nome.startswith('criar_boxplot'))
+]
+
+
+@pytest.mark.parametrize('funcao', FUNCOES_GRAFICO, ids=lambda funcao: funcao.__name__)
+def test_anotacoes_resolvem_sem_plotly(funcao):
+    # As anotações não podem depender dos módulos do Plotly, que são None até carregar_plotly
+    dicas = typing.get_type_hints(funcao)
+    
+    assert 'return' in dicas
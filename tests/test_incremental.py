@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+import nucleo
+from conftest import gerar_fonte
+
+
+@pytest.fixture
+def fonte_anexada(tmp_path, diretorio_cache):
+    """Processa uma fonte de 5 mil linhas e acrescenta 2 mil linhas ao final."""
+    caminho_fonte = tmp_path / 'salaries.csv'
+    gerar_fonte(5_000, semente=1).to_csv(caminho_fonte, index=False)
+    nucleo.processar_dados(str(caminho_fonte), tamanho_bloco=0)
+    
+    gerar_fonte(2_000, semente=2).to_csv(caminho_fonte, mode='a', header=False, index=False)
+    return caminho_fonte
+
+
+def processar_do_zero(caminho_fonte):
+    return nucleo.transformar_dados(nucleo.carregar_dados(str(caminho_fonte)), usar_categorias=True)
+
+
+def test_anexa_apenas_linhas_novas(fonte_anexada):
+    df = nucleo.processar_dados(str(fonte_anexada), tamanho_bloco=0)
+    
+    assert df.attrs.get('linhas_base') == 5_000
+    pd.testing.assert_frame_equal(df, processar_do_zero(fonte_anexada), check_categorical=False)
+
+
+def test_mapa_de_cargos_alterado_reprocessa_tudo(fonte_anexada, tmp_path, monkeypatch):
+    mapa = tmp_path / 'mapa_cargos.csv'
+    pd.DataFrame({'cargo': ['Data Scientist'], 'traducao': ['Cientista de Dados Sênior']}).to_csv(mapa, index=False)
+    # Equivale a iniciar o processo com DASHBOARD_MAPA_CARGOS apontando para o arquivo
+    monkeypatch.setattr(nucleo.carregar_mapa_cargos, '__defaults__', (str(mapa),))
+    
+    df = nucleo.processar_dados(str(fonte_anexada), tamanho_bloco=0)
+    
+    assert 'linhas_base' not in df.attrs
+    assert 'Cientista de Dados' not in set(df['cargo'])
+    pd.testing.assert_frame_equal(df, processar_do_zero(fonte_anexada), check_categorical=False)
+    
+    # O DataFrame gravado no cache também precisa estar correto
+    pd.testing.assert_frame_equal(
+        nucleo.processar_dados(str(fonte_anexada), tamanho_bloco=0),
+        processar_do_zero(fonte_anexada),
+        check_categorical=False
+    )
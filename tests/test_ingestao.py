@@ -0,0 +1,37 @@
+import numpy as np
+import pyarrow.parquet as pq
+
+import nucleo
+from conftest import gerar_fonte
+
+
+def test_blocos_mantem_salarios_inteiros(tmp_path, diretorio_cache):
+    fonte = gerar_fonte(1_000)
+    caminho_fonte = tmp_path / 'fonte.csv'
+    fonte.to_csv(caminho_fonte, index=False)
+    
+    destino = tmp_path / 'armazenamento.parquet'
+    resultado = nucleo.processar_dados_em_blocos(str(caminho_fonte), destino, tamanho_bloco=300)
+    
+    assert resultado['total_linhas'] == 1_000
+    assert str(pq.read_schema(destino).field('salario_usd').type) == 'int64'
+    completo = nucleo.transformar_dados(nucleo.carregar_dados(str(caminho_fonte)), usar_categorias=False)
+    assert nucleo.carregar_armazenamento(destino)['salario_usd'].dtype == completo['salario_usd'].dtype
+
+
+def test_blocos_refaz_em_float_com_salario_real_tardio(tmp_path, diretorio_cache):
+    salarios = np.arange(100_000, 101_000).astype(object)
+    salarios[-1] = 123_456.75
+    fonte = gerar_fonte(1_000, salarios=salarios)
+    caminho_fonte = tmp_path / 'fonte.csv'
+    fonte.to_csv(caminho_fonte, index=False)
+    
+    destino = tmp_path / 'armazenamento.parquet'
+    resultado = nucleo.processar_dados_em_blocos(str(caminho_fonte), destino, tamanho_bloco=300)
+    
+    assert resultado['total_linhas'] == 1_000
+    assert str(pq.read_schema(destino).field('salario_usd').type) == 'double'
+    salarios_gravados = nucleo.carregar_armazenamento(destino)['salario_usd']
+    assert salarios_gravados.max() == 123_456.75
+    assert salarios_gravados.sum() == float(sum(salarios))
+    assert resultado['cubo']['soma'].sum() == float(sum(salarios))
@@ -0,0 +1,54 @@
+import threading
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import nucleo
+
+
+def test_pico_preservado_com_etapa_concorrente():
+    nucleo.iniciar_medicoes(rastrear_memoria=True)
+    etapa_aberta = threading.Event()
+    liberar = threading.Event()
+    
+    def etapa_concorrente():
+        contexto.run(executar_etapa_concorrente)
+    
+    def executar_etapa_concorrente():
+        with nucleo.medir_etapa('concorrente'):
+            etapa_aberta.set()
+            liberar.wait(5)
+    
+    try:
+        with nucleo.medir_etapa('principal'):
+            bloco = np.ones(20 * 1024 * 1024, dtype=np.uint8)
+            del bloco
+            # Outra thread abre uma etapa (e zera o pico global) depois da alocação
+            contexto = nucleo.copiar_contexto_medicoes()
+            thread = threading.Thread(target=etapa_concorrente)
+            thread.start()
+            assert etapa_aberta.wait(5)
+            liberar.set()
+            thread.join()
+    finally:
+        registro = nucleo.finalizar_medicoes()
+    
+    etapas = {etapa['etapa']: etapa for etapa in registro['etapas']}
+    assert etapas['principal']['pico_memoria_mb'] >= 19
+    assert not nucleo.etapas_rastreando_memoria
+
+
+def test_execucao_interrompida_libera_tracemalloc():
+    nucleo.iniciar_medicoes(rastrear_memoria=True)
+    with pytest.raises(RuntimeError):
+        try:
+            with nucleo.medir_etapa('interrompida'):
+                raise RuntimeError('rerun')
+        finally:
+            nucleo.finalizar_medicoes({'interrompida': True})
+    
+    assert nucleo.finalizar_medicoes() is None
+    assert nucleo.execucoes_rastreando_memoria == 0
+    assert not nucleo.etapas_rastreando_memoria
+    assert not tracemalloc.is_tracing()
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+import nucleo
+
+
+def test_permutacao_ordenacao_int32():
+    dataframe = pd.DataFrame({
+        'salario_usd': [300, 100, np.nan, 200],
+        'cargo': pd.Categorical(['b', 'a', 'c', None], categories=['a', 'b', 'c'])
+    })
+    
+    crescente = nucleo.calcular_permutacao_ordenacao(dataframe, 'salario_usd')
+    decrescente = nucleo.calcular_permutacao_ordenacao(dataframe, 'salario_usd', decrescente=True)
+    por_cargo = nucleo.calcular_permutacao_ordenacao(dataframe, 'cargo')
+    
+    assert crescente.dtype == np.int32
+    assert crescente.tolist() == [1, 3, 0, 2]
+    assert decrescente.tolist() == [0, 3, 1, 2]
+    assert por_cargo.tolist() == [1, 0, 2, 3]
+
+
+def test_estimar_tamanho_resultado():
+    posicoes = np.arange(1_000, dtype=np.int32)
+    
+    assert nucleo.estimar_tamanho_resultado(posicoes) == 4_000
+    assert nucleo.estimar_tamanho_resultado(pd.Series(posicoes)) >= 4_000
+    assert nucleo.estimar_tamanho_resultado(7) > 0
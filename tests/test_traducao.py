@@ -0,0 +1,36 @@
+import pandas as pd
+import pytest
+
+import nucleo
+from conftest import gerar_fonte
+
+
+def test_traduzir_cargos_categoricos():
+    serie = pd.Series(['Data Scientist', 'ML Engineer', 'quantum wrangler', None], dtype='category')
+    
+    traduzidos = nucleo.traduzir_cargos(serie)
+    
+    assert not isinstance(traduzidos.dtype, pd.CategoricalDtype)
+    assert traduzidos.iloc[:3].tolist() == [
+        nucleo.traduzir_cargos_comuns(cargo) for cargo in serie.iloc[:3]
+    ]
+    assert traduzidos.isna().tolist() == [False, False, False, True]
+
+
+@pytest.mark.parametrize('tamanho_bloco', [0, 7_000])
+def test_fonte_parquet_categorica_igual_ao_csv(tmp_path, diretorio_cache, tamanho_bloco):
+    fonte = gerar_fonte(20_000, semente=3)
+    caminho_csv = tmp_path / 'salaries.csv'
+    fonte.to_csv(caminho_csv, index=False)
+    caminho_parquet = tmp_path / 'salaries.parquet'
+    colunas_texto = fonte.select_dtypes(exclude='number').columns
+    fonte.astype({coluna: 'category' for coluna in colunas_texto}).to_parquet(caminho_parquet, index=False)
+    
+    df_csv = nucleo.processar_dados(str(caminho_csv), usar_cache_disco=False)
+    df_parquet = nucleo.processar_dados(str(caminho_parquet), tamanho_bloco=tamanho_bloco)
+    
+    assert len(df_parquet) == len(df_csv) == 20_000
+    pd.testing.assert_frame_equal(
+        df_parquet.reset_index(drop=True), df_csv.reset_index(drop=True),
+        check_categorical=False, check_dtype=False
+    )